@@ -5,6 +5,7 @@ from JobMatrix.serializers import CompanySerializer  # Import from JobMatrix
 from JobMatrix.models import Recruiter, Company, Bookmark, Application, Job, Applicant
 from config import settings
 from JobMatrix.utils import get_full_url
+from JobMatrix.media import MediaPrefetchListSerializer
 
 
 class JobSerializer(serializers.ModelSerializer):
@@ -34,13 +35,18 @@ class JobWithCompanySerializer(serializers.ModelSerializer):
         model = Job
         fields = ['job_id', 'job_title', 'job_description', 'job_location',
                 'job_salary', 'job_date_posted', 'recruiter_id', 'company']
+        list_serializer_class = MediaPrefetchListSerializer
+        media_fields = ['recruiter_id.company_id.company_image']
         read_only_fields = ['job_id', 'job_date_posted']
 
     def get_company(self, obj):
-        # Get the company through the recruiter
-        recruiter = Recruiter.objects.get(recruiter_id=obj.recruiter_id.recruiter_id)
-        company = Company.objects.get(company_id=recruiter.company_id.company_id)
-        return CompanySerializer(company).data
+        # Use the company pre-joined by the view (select_related('recruiter_id__company_id'))
+        # and serialize each company once per request, however many of its jobs are listed
+        company = obj.recruiter_id.company_id
+        company_cache = self.context.setdefault('company_cache', {})
+        if company.company_id not in company_cache:
+            company_cache[company.company_id] = CompanySerializer(company).data
+        return company_cache[company.company_id]
 
 
 class JobApplicantDetailSerializer(serializers.ModelSerializer):
@@ -51,6 +57,8 @@ class JobApplicantDetailSerializer(serializers.ModelSerializer):
         model = Application
         fields = ['application_id', 'application_status', 'application_date_applied',
                   'application_recruiter_comment', 'applicant_details']
+        list_serializer_class = MediaPrefetchListSerializer
+        media_fields = ['applicant_id.applicant_resume', 'applicant_id.applicant_id.user_profile_photo']
 
     def get_applicant_details(self, obj):
         # Access the related applicant model through the foreign key
@@ -98,6 +106,8 @@ class BookmarkSerializer(serializers.ModelSerializer):
         model = Bookmark
         fields = "__all__"
         read_only_fields = ['bookmark_id', 'applicant_id', 'bookmark_date_saved']
+        list_serializer_class = MediaPrefetchListSerializer
+        media_fields = ['job_id.recruiter_id.company_id.company_image']
 
     def get_job_details(self, obj):
         job = obj.job_id
@@ -191,6 +201,8 @@ class UserAppliedJobsSerializer(serializers.ModelSerializer):
             'application_recruiter_comment',
             'job_details'
         ]
+        list_serializer_class = MediaPrefetchListSerializer
+        media_fields = ['job_id.recruiter_id.company_id.company_image']
 
     def get_job_details(self, obj):
         """Format job details using the actual field names from the Job model"""
@@ -320,3 +332,12 @@ class ApplicationUpdateSerializer(serializers.ModelSerializer):
         if value not in valid_statuses:
             raise serializers.ValidationError(f"Status must be one of: {', '.join(valid_statuses)}")
         return value
+
+
+class JobImportSerializer(JobSerializer):
+    """
+    One row of a bulk import (JobMatrix/job_import.py); the recruiter comes from the request.
+    """
+
+    class Meta(JobSerializer.Meta):
+        fields = ['job_title', 'job_description', 'job_location', 'job_salary']
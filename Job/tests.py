@@ -0,0 +1,58 @@
+"""
+Run with: python manage.py test --settings=config.test_settings
+"""
+from datetime import date
+
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase
+from django.urls import reverse
+
+from JobMatrix.models import User, Applicant, Recruiter, Company, Job
+from JobMatrix.query_budgets import clear_caches, client_for
+
+# Queries for any page of jobs-list, however many jobs (and companies) it shows
+JOBS_LIST_QUERIES = 8
+
+
+class CompanyJobsListQueryCountTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        password = make_password("test-password")
+        recruiters = []
+        for c in range(10):
+            company = Company.objects.create(
+                company_name=f"Company {c}", company_industry="Technology",
+                company_description=f"Company {c} builds things.", company_secret_key=password,
+            )
+            user = User.objects.create(
+                user_first_name=f"Rita{c}", user_last_name="Recruiter", user_email=f"recruiter{c}@test.test",
+                user_password=password, user_role="RECRUITER",
+            )
+            recruiters.append(Recruiter.objects.create(
+                recruiter_id=user, company_id=company, recruiter_is_active=True, recruiter_start_date=date(2020, 1, 1),
+            ))
+        for j in range(60):
+            Job.objects.create(
+                job_title="Python Developer", job_description=f"Opening #{j}.", job_location="Remote",
+                job_salary=50000 + j, recruiter_id=recruiters[j % len(recruiters)],
+            )
+        cls.applicant = User.objects.create(
+            user_first_name="Alex", user_last_name="Applicant", user_email="applicant@test.test",
+            user_password=password, user_role="APPLICANT",
+        )
+        Applicant.objects.create(applicant_id=cls.applicant)
+
+    def assert_page_queries(self, page_size):
+        client = client_for(self.applicant)
+        clear_caches()
+        with self.assertNumQueries(JOBS_LIST_QUERIES):
+            response = client.get(reverse("jobs-list"), {"page_size": page_size})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]), page_size)
+
+    def test_small_page(self):
+        self.assert_page_queries(5)
+
+    def test_large_page(self):
+        # Jobs from every company: a query per job or per company would show here
+        self.assert_page_queries(50)
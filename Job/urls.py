@@ -5,7 +5,10 @@ from .views import *
 urlpatterns = [
     path('create/', JobCreateView.as_view(), name='create-job'),
     path('create-jobs/', JobCreateViewMultiple.as_view(), name='create-jobs'),
+    path('import/', JobImportView.as_view(), name='import-jobs'),
     path('jobs-list/', CompanyJobsListView.as_view(), name='jobs-list'),
+    path('feed/', ApplicantFeedView.as_view(), name='applicant-feed'),
+    path('recommended/', RecommendedJobsView.as_view(), name='recommended-jobs'),
     path('<int:job_id>/update/', JobUpdateView.as_view(), name='job-update'),
     path('<int:job_id>/delete/', JobDeleteView.as_view(), name='job-delete'),
 
@@ -12,9 +12,18 @@ from JobMatrix.auth_backend import JWTAuthentication
 from JobMatrix.models import Job, Applicant, Application, User
 from .serializers import *
 from JobMatrix.permissions import IsRecruiter
-from django.db import IntegrityError
+from JobMatrix.search import search_jobs
+from django.db import IntegrityError, transaction
 from django.db.models import Q
-from rest_framework.pagination import PageNumberPagination
+from JobMatrix.pagination import KeysetPagination
+from JobMatrix.application_stats import job_application_counts
+from JobMatrix.candidate_ranking import rank_applications
+from JobMatrix.conditional import (
+    APPLICANT_ACTIVITY, COMPANIES, JOBS, RECRUITER_JOBS, ConditionalGetMixin, version_key,
+)
+from JobMatrix.feed import FEED_ORDERING, feed_queryset
+from JobMatrix.job_import import ImportFormatError, JobImport, detect_format, read_rows
+from JobMatrix.recommendations import RECOMMENDATIONS_MAX, recommend_jobs
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from django.views import generic
@@ -22,7 +31,7 @@ from django.urls import reverse_lazy
 
 
 # ---------------- Jobs ------------------ #
-class JobListPagination(PageNumberPagination):
+class JobListPagination(KeysetPagination):
     page_size = 6  # Default number of items per page
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -195,7 +204,86 @@ class JobCreateViewMultiple(generics.CreateAPIView):
             'data': created_jobs
         }, status=status.HTTP_201_CREATED)
 
-class CompanyJobsListView(generics.ListAPIView):
+class JobImportView(APIView):
+    """
+    Bulk job import from a CSV or NDJSON file, streamed and inserted in chunks.
+
+    Send the file as multipart form data in the `file` field, or as the raw request
+    body with a text/csv or application/x-ndjson Content-Type. `?file_format=csv|ndjson`
+    overrides the detected format. See JobMatrix/job_import.py.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsRecruiter]
+
+    def post(self, request, *args, **kwargs):
+        try:
+            recruiter = Recruiter.objects.get(recruiter_id=request.user.user_id)
+            if not recruiter.recruiter_is_active:
+                return Response({
+                    'status': 'error',
+                    'message': 'Your recruiter profile is not active. Please contact support.'
+                }, status=status.HTTP_403_FORBIDDEN)
+        except Recruiter.DoesNotExist:
+            return Response({
+                'status': 'error',
+                'message': 'No recruiter profile found for this user'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Only touch request.FILES for multipart bodies: parsing a raw CSV body would read it all into memory
+        if request.content_type.startswith('multipart/form-data'):
+            upload = request.FILES.get('file')
+            if upload is None:
+                return Response({
+                    'status': 'error',
+                    'message': 'Upload the jobs in the "file" field'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            stream, file_name, content_type = upload, upload.name, upload.content_type
+        else:
+            stream, file_name, content_type = request.stream, None, request.content_type
+            if stream is None:
+                return Response({
+                    'status': 'error',
+                    'message': 'The request body is empty'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            file_format = detect_format(content_type, file_name, request.query_params.get('file_format'))
+            report = JobImport(recruiter.recruiter_id_id).run(read_rows(stream, file_format))
+        except ImportFormatError as e:
+            return Response({
+                'status': 'error',
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if report['failed'] and report['created']:
+            return Response({
+                'status': 'partial_success',
+                'message': f"{report['created']} jobs imported, {report['failed']} rows failed",
+                'data': report
+            }, status=status.HTTP_207_MULTI_STATUS)
+        if report['failed'] or not report['created']:
+            return Response({
+                'status': 'error',
+                'message': 'No jobs were imported',
+                'data': report
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'status': 'success',
+            'message': f"{report['created']} jobs imported successfully",
+            'data': report
+        }, status=status.HTTP_201_CREATED)
+
+def date_window_validator(request):
+    """
+    ETag part for lists filtered by date_posted, whose window moves with the clock:
+    such responses are revalidated at least once a minute.
+    """
+    if request.query_params.get('date_posted'):
+        return [timezone.now().strftime('%Y-%m-%dT%H:%M')]
+    return []
+
+
+class CompanyJobsListView(ConditionalGetMixin, generics.ListAPIView):
     """
     View for retrieving all jobs with company details and flexible filtering options
     """
@@ -203,6 +291,23 @@ class CompanyJobsListView(generics.ListAPIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     pagination_class = JobListPagination
+    keyset_ordering = ('-job_date_posted', '-job_id')
+
+    def get_version_keys(self):
+        keys = [JOBS, COMPANIES]
+        # Applicants don't see the jobs they bookmarked or applied for
+        if self.request.user.user_role == 'APPLICANT':
+            keys.append(version_key(APPLICANT_ACTIVITY, self.request.user.user_id))
+        return keys
+
+    def get_validator_extras(self):
+        return date_window_validator(self.request)
+
+    def get_keyset_ordering(self):
+        # Search results are ordered by relevance, so they stay on page-number pagination
+        if self.request.query_params.get('q', '').strip():
+            return None
+        return self.keyset_ordering
 
     def get_queryset(self):
         # Get all filter parameters
@@ -212,12 +317,13 @@ class CompanyJobsListView(generics.ListAPIView):
         date_posted = self.request.query_params.get('date_posted')
         locations = self.request.query_params.getlist('location')
         job_titles = self.request.query_params.getlist('job_title')
+        search_query = self.request.query_params.get('q', '').strip()
 
         # Start with all jobs and prefetch related recruiter and company
         queryset = Job.objects.select_related(
             'recruiter_id',
             'recruiter_id__company_id'
-        ).order_by('-job_date_posted')
+        ).order_by('-job_date_posted', '-job_id')
 
         # Apply company filters if provided
         recruiter_ids = self.get_recruiter_ids_from_company_filters(company_ids, company_names)
@@ -281,6 +387,10 @@ class CompanyJobsListView(generics.ListAPIView):
             # If the user is not an applicant, we don't need to filter out any jobs
             pass
 
+        # Full-text search over title, description, location and company name (ranked by relevance)
+        if search_query:
+            queryset = search_jobs(queryset, search_query)
+
         return queryset
 
     def get_recruiter_ids_from_company_filters(self, company_ids, company_names):
@@ -340,6 +450,7 @@ class CompanyJobsListView(generics.ListAPIView):
         date_posted = request.query_params.get('date_posted')
         locations = request.query_params.getlist('location')
         job_titles = request.query_params.getlist('job_title')
+        search_query = request.query_params.get('q', '').strip()
 
         # Get filtered queryset
         queryset = self.get_queryset()
@@ -347,6 +458,9 @@ class CompanyJobsListView(generics.ListAPIView):
         # Build filter description for message
         filter_parts = []
 
+        if search_query:
+            filter_parts.append(f"search '{search_query}'")
+
         if company_ids:
             filter_parts.append(f"company IDs {', '.join(company_ids)}")
 
@@ -379,44 +493,33 @@ class CompanyJobsListView(generics.ListAPIView):
             except Applicant.DoesNotExist:
                 pass
 
-        # Check if queryset is empty
-        if not queryset.exists():
-            return Response({
-                'status': 'success',
-                'message': f'No jobs found for {filter_message}',
-                'data': [],
-                'total_count': 0,
-                'total_pages': 0,
-                'current_page': 1
-            }, status=status.HTTP_200_OK)
-
-        # Apply pagination
+        # Apply pagination (no separate exists() query: an empty first page means no results)
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            paginated_response = self.get_paginated_response(serializer.data)
+            pagination = self.paginator.get_page_metadata()
 
-            # Extract pagination data
-            response_data = paginated_response.data
+            if not page and pagination['previous'] is None:
+                return Response({
+                    'status': 'success',
+                    'message': f'No jobs found for {filter_message}',
+                    'data': [],
+                    'total_count': 0,
+                    'total_pages': 0,
+                    'current_page': 1
+                }, status=status.HTTP_200_OK)
 
-            # Get current page and calculate page size for total pages
-            page_size = self.pagination_class.page_size
-            if self.pagination_class.page_size_query_param in request.query_params:
-                try:
-                    page_size = int(request.query_params.get(self.pagination_class.page_size_query_param))
-                except (ValueError, TypeError):
-                    page_size = self.pagination_class.page_size
+            serializer = self.get_serializer(page, many=True)
 
             # Create our custom response format
             return Response({
                 'status': 'success',
                 'message': f'Jobs retrieved successfully for {filter_message}',
-                'data': response_data['results'],
-                'total_count': response_data['count'],
-                'next': response_data['next'],
-                'previous': response_data['previous'],
-                'current_page': int(request.query_params.get('page', 1)),
-                'total_pages': (response_data['count'] + page_size - 1) // page_size
+                'data': serializer.data,
+                'total_count': pagination['total_count'],
+                'next': pagination['next'],
+                'previous': pagination['previous'],
+                'current_page': pagination['current_page'],
+                'total_pages': pagination['total_pages']
             })
 
         # If pagination is not configured correctly, fall back to regular response
@@ -428,6 +531,99 @@ class CompanyJobsListView(generics.ListAPIView):
             'total_count': len(serializer.data)
         }, status=status.HTTP_200_OK)
 
+class FeedPagination(JobListPagination):
+    def keyset_requested(self, request):
+        # The feed is always read as a range of its index, so pages are always cursors
+        return True
+
+
+class RecommendedJobsView(APIView):
+    """
+    Jobs matching the authenticated applicant's skills, weighted by years of experience
+    (see JobMatrix/recommendations.py). Jobs already applied for or bookmarked are left out.
+    `limit` sets how many come back (default 20, at most 100).
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsApplicant]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 20)), RECOMMENDATIONS_MAX))
+        except (TypeError, ValueError):
+            limit = 20
+
+        applicant_id = request.user.user_id
+        seen = set(Application.objects.filter(applicant_id=applicant_id).values_list('job_id', flat=True))
+        seen.update(Bookmark.objects.filter(applicant_id=applicant_id).values_list('job_id', flat=True))
+        matches = recommend_jobs(applicant_id, exclude_job_ids=seen, limit=limit)
+
+        # A job deleted by another process since the index last saw it is simply missing here
+        jobs = Job.objects.select_related('recruiter_id__company_id').in_bulk([job_id for job_id, _, _ in matches])
+        matches = [match for match in matches if match[0] in jobs]
+        serializer = JobWithCompanySerializer([jobs[job_id] for job_id, _, _ in matches], many=True,
+                                              context={'request': request})
+        data = [
+            {**job, 'match_score': score, 'matched_skills': skills}
+            for job, (_, score, skills) in zip(serializer.data, matches)
+        ]
+        return Response({
+            'status': 'success',
+            'message': 'Recommended jobs retrieved successfully' if data else 'No jobs match your skills yet',
+            'data': data
+        }, status=status.HTTP_200_OK)
+
+class ApplicantFeedView(generics.ListAPIView):
+    """
+    Home feed of the authenticated applicant: jobs matching their profile, best matches
+    first (see JobMatrix/feed.py). Pages are cursors (`next`/`previous`) and are not
+    counted unless include_count=true.
+    Applicants whose feed is empty get the latest jobs they have not applied for or bookmarked.
+    """
+    serializer_class = JobWithCompanySerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsApplicant]
+    pagination_class = FeedPagination
+    keyset_ordering = FEED_ORDERING
+
+    def get_queryset(self):
+        return feed_queryset(self.request.user.user_id)
+
+    def list(self, request, *args, **kwargs):
+        items = self.paginate_queryset(self.get_queryset())
+        pagination = self.paginator.get_page_metadata()
+
+        if not items and self.paginator.cursor_query_param not in request.query_params:
+            return self.latest_jobs(request)
+
+        serializer = self.get_serializer([item.job_id for item in items], many=True)
+        return Response({
+            'status': 'success',
+            'message': 'Feed retrieved successfully',
+            'source': 'feed',
+            'data': serializer.data,
+            **pagination
+        }, status=status.HTTP_200_OK)
+
+    def latest_jobs(self, request):
+        applicant_id = request.user.user_id
+        jobs = Job.objects.select_related('recruiter_id__company_id').exclude(
+            Q(application__applicant_id=applicant_id) | Q(bookmark__applicant_id=applicant_id)
+        ).order_by('-job_date_posted', '-job_id')[:self.paginator.get_page_size(request)]
+
+        serializer = self.get_serializer(list(jobs), many=True)
+        return Response({
+            'status': 'success',
+            'message': 'No matching jobs yet; showing the latest jobs',
+            'source': 'latest',
+            'data': serializer.data,
+            'total_count': None,
+            'next': None,
+            'previous': None,
+            'current_page': None,
+            'total_pages': None
+        }, status=status.HTTP_200_OK)
+
+
 class JobUpdateView(generics.UpdateAPIView):
     serializer_class = JobSerializer
     queryset = Job.objects.all()
@@ -507,7 +703,9 @@ class BookmarkView(generics.ListCreateAPIView):
     def get_queryset(self):
         try:
             applicant = self.request.user.applicant
-            return Bookmark.objects.filter(applicant_id=applicant).order_by('-created_at')
+            return Bookmark.objects.filter(applicant_id=applicant).select_related(
+                'job_id__recruiter_id__company_id'
+            ).order_by('-bookmark_date_saved', '-bookmark_id')
         except (AttributeError, Applicant.DoesNotExist):
             return Bookmark.objects.none()
 
@@ -569,15 +767,33 @@ class BookmarkDetailView(generics.RetrieveDestroyAPIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-class BookmarkListView(generics.ListAPIView):
+class BookmarkListView(ConditionalGetMixin, generics.ListAPIView):
     serializer_class = BookmarkSerializer
     permission_classes = [IsAuthenticated, IsApplicant]
     pagination_class = JobListPagination
+    keyset_ordering = ('-bookmark_date_saved', '-bookmark_id')
+
+    def get_version_keys(self):
+        # The recruiters of the bookmarked jobs rather than JOBS, so jobs posted elsewhere keep the ETag
+        applicant_id = self.request.user.user_id
+        recruiter_ids = (
+            Bookmark.objects.filter(applicant_id=applicant_id).order_by()
+            .values_list('job_id__recruiter_id', flat=True).distinct()
+        )
+        return [
+            version_key(APPLICANT_ACTIVITY, applicant_id), COMPANIES,
+            *[version_key(RECRUITER_JOBS, recruiter_id) for recruiter_id in recruiter_ids],
+        ]
+
+    def get_validator_extras(self):
+        return date_window_validator(self.request)
 
     def get_queryset(self):
         try:
             applicant = self.request.user.user_id
-            queryset = Bookmark.objects.filter(applicant_id=applicant).order_by('-bookmark_date_saved')
+            queryset = Bookmark.objects.filter(applicant_id=applicant).select_related(
+                'job_id__recruiter_id__company_id'
+            ).order_by('-bookmark_date_saved', '-bookmark_id')
 
             # Get all filter parameters
             company_names = self.request.query_params.getlist('company_name')
@@ -659,31 +875,12 @@ class BookmarkListView(generics.ListAPIView):
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
         if isinstance(response.data, dict) and 'results' in response.data:
-            # Get pagination info
-            count = response.data.get('count', 0)
-            next_link = response.data.get('next', None)
-            previous_link = response.data.get('previous', None)
-            page_size = self.paginator.page_size
-            current_page = request.query_params.get(self.paginator.page_query_param, 1)
-            try:
-                current_page = int(current_page)
-            except (ValueError, TypeError):
-                current_page = 1
-
-            total_pages = (count + page_size - 1) // page_size if page_size > 0 else 0
-
             # Create a new response structure
-            new_data = {
-                'total_count': count,
-                'next': next_link,
-                'previous': previous_link,
-                'current_page': current_page,
-                'total_pages': total_pages,
+            response.data = {
+                **self.paginator.get_page_metadata(),
                 'results': response.data.get('results', [])
             }
 
-            response.data = new_data
-
         return response
 
 # ---------------- Application ------------------- #
@@ -704,7 +901,9 @@ class ApplicationView(generics.ListCreateAPIView):
         """Return only the current user's applications"""
         try:
             applicant = self.request.user.applicant
-            return Application.objects.filter(applicant_id=applicant).order_by('-application_date_applied')
+            return Application.objects.filter(applicant_id=applicant).select_related(
+                'job_id'
+            ).order_by('-application_date_applied')
         except (AttributeError, Applicant.DoesNotExist):
             return Application.objects.none()
 
@@ -743,7 +942,9 @@ class ApplicationView(generics.ListCreateAPIView):
         serializer.is_valid(raise_exception=True)
 
         try:
-            self.perform_create(serializer)
+            # The application and its job's counters (JobMatrix/application_stats.py) commit together
+            with transaction.atomic():
+                self.perform_create(serializer)
             return Response({
                 "message": "Job application submitted successfully",
                 "status": "PENDING"
@@ -796,6 +997,7 @@ class UserAppliedJobsView(generics.ListAPIView):
     serializer_class = UserAppliedJobsSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = JobListPagination
+    keyset_ordering = ('-application_date_applied', '-application_id')
 
     def get_queryset(self):
         # Check if admin is requesting another user's applications
@@ -894,7 +1096,7 @@ class UserAppliedJobsView(generics.ListAPIView):
             'job_id',
             'job_id__recruiter_id',
             'job_id__recruiter_id__company_id'
-        ).order_by('-application_date_applied')
+        ).order_by('-application_date_applied', '-application_id')
 
     def list(self, request, *args, **kwargs):
             # Handle permissions explicitly
@@ -926,39 +1128,11 @@ class UserAppliedJobsView(generics.ListAPIView):
 
                 # Customize the pagination response
                 if isinstance(response.data, dict):
-                    # Initialize default values
-                    count = response.data.get('count', 0)
-                    next_link = response.data.get('next', None)
-                    previous_link = response.data.get('previous', None)
-
-                    # Get page size from pagination class
-                    page_size = self.pagination_class().page_size
-
-                    # Get current page from request
-                    current_page = request.query_params.get('page', 1)
-                    try:
-                        current_page = int(current_page)
-                    except (ValueError, TypeError):
-                        current_page = 1
-
-                    # Calculate total pages
-                    total_pages = (count + page_size - 1) // page_size if page_size > 0 else 0
-
-                    # Create the new response format
-                    new_data = {
-                        'total_count': count,
-                        'next': next_link,
-                        'previous': previous_link,
-                        'current_page': current_page,
-                        'total_pages': total_pages,
+                    response.data = {
+                        **self.paginator.get_page_metadata(),
                         'results': response.data.get('results', [])
                     }
 
-                    # Update the response data
-                    response.data = new_data
-
-
-
                 return response
 
             # Handle case when pagination is not used
@@ -979,6 +1153,16 @@ class JobApplicantsListView(generics.ListAPIView):
     serializer_class = JobApplicantDetailSerializer
     permission_classes = [IsAuthenticated, IsRecruiter]
     pagination_class = JobListPagination
+    keyset_ordering = ('-application_date_applied', '-application_id')
+
+    def match_ordering_requested(self):
+        return self.request.query_params.get('ordering') == 'match'
+
+    def get_keyset_ordering(self):
+        # Match order is computed in Python over all the job's applicants, so it stays on page numbers
+        if self.match_ordering_requested():
+            return None
+        return self.keyset_ordering
 
     def get_queryset(self):
         """
@@ -999,44 +1183,27 @@ class JobApplicantsListView(generics.ListAPIView):
         # Optimize query performance by prefetching related data
         queryset = queryset.select_related('applicant_id', 'applicant_id__applicant_id')
 
-        return queryset
+        return queryset.order_by('-application_date_applied', '-application_id')
 
     def list(self, request, *args, **kwargs):
         job_id = self.kwargs.get('job_id')
-        response = super().list(request, *args, **kwargs)
+        if self.match_ordering_requested():
+            response = self.list_by_match(job_id)
+        else:
+            response = super().list(request, *args, **kwargs)
 
         if isinstance(response.data, dict) and 'results' in response.data:
-            queryset = Application.objects.filter(job_id=job_id)
-
-            # Get counts for different application statuses
-            # Using the correct field name 'application_status' instead of 'status'
-            pending_count = queryset.filter(application_status='Pending').count()
-            rejected_count = queryset.filter(application_status='Rejected').count()
-            applied_count = queryset.filter(application_status='Applied').count()
-
-            count = response.data.get('count', 0)
-            next_link = response.data.get('next', None)
-            previous_link = response.data.get('previous', None)
-            page_size = self.paginator.page_size
-            current_page = request.query_params.get(self.paginator.page_query_param, 1)
-            try:
-                current_page = int(current_page)
-            except (ValueError, TypeError):
-                current_page = 1
-
-            total_pages = (count + page_size - 1) // page_size if page_size > 0 else 0
+            # Counts for every status of this job (not just the filtered ones) in one query
+            counts = job_application_counts(job_id)
 
             # Create a new response structure with status counts
             new_data = {
-                'total_count': count,
-                'next': next_link,
-                'previous': previous_link,
-                'current_page': current_page,
-                'total_pages': total_pages,
+                **self.paginator.get_page_metadata(),
                 'status_counts': {
-                    'pending': pending_count,
-                    'rejected': rejected_count,
-                    'applied': applied_count,
+                    'pending': counts['pending_applications'],
+                    'approved': counts['approved_applications'],
+                    'rejected': counts['rejected_applications'],
+                    'applied': counts['total_applications'],
                 },
                 'results': response.data.get('results', [])
             }
@@ -1044,6 +1211,22 @@ class JobApplicantsListView(generics.ListAPIView):
             response.data = new_data
         return response
 
+    def list_by_match(self, job_id):
+        """
+        Applicants best match first (see JobMatrix/candidate_ranking.py), each with its match_score
+        and the job's skills it matched.
+        """
+        ranked = rank_applications(job_id, self.get_queryset())
+        page = self.paginate_queryset(ranked)
+        applications = self.get_queryset().in_bulk([application_id for application_id, _, _ in page])
+        page = [entry for entry in page if entry[0] in applications]
+        serializer = self.get_serializer([applications[application_id] for application_id, _, _ in page], many=True)
+
+        results = []
+        for data, (_, score, matched_skills) in zip(serializer.data, page):
+            results.append({**data, 'match_score': score, 'matched_skills': matched_skills})
+        return self.get_paginated_response(results)
+
 
 # --------------- Recruiter Application ------------------- #
 
@@ -1054,6 +1237,7 @@ class RecruiterApplicationListView(generics.ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated, IsRecruiter]
     pagination_class = JobListPagination
+    keyset_ordering = ('-application_date_applied', '-application_id')
 
     def get_queryset(self):
         user = self.request.user
@@ -1069,38 +1253,22 @@ class RecruiterApplicationListView(generics.ListAPIView):
             # All recruiters have company_id field that references the same Company
             company_jobs = Job.objects.filter(recruiter_id__company_id=company)
 
-            # Get all applications for jobs in this company
-            queryset = Application.objects.filter(job_id__in=company_jobs)
-
-            # Print for debugging - before any filtering
-            print(f"Initial queryset count: {queryset.count()}")
-            print(f"Initial statuses: {list(queryset.values_list('application_status', flat=True).distinct())}")
+            # Get all applications for jobs in this company, with the job joined for job_title
+            queryset = Application.objects.filter(job_id__in=company_jobs).select_related('job_id')
 
             # Apply application status filter only if provided in query parameters
             application_status = self.request.query_params.get('application_status', None)
-            print(f"Requested status filter: {application_status}")
-
-            # IMPORTANT: Force queryset to include ALL statuses if no filter is requested
             if application_status:
-                valid_statuses = ['Pending', 'Approved', 'Rejected']
+                # Stored values are upper case (PENDING/APPROVED/REJECTED); accept any case
+                application_status = application_status.upper()
+                valid_statuses = [value for value, _ in Application.STATUS_CHOICES]
                 if application_status in valid_statuses:
                     queryset = queryset.filter(application_status=application_status)
-                    print(f"Filtered queryset by status: {application_status}")
-            else:
-                # Explicitly make sure we're not filtering by status
-                # This is redundant but ensures we're getting all statuses
-                print("No status filter applied - including ALL applications")
-
-            queryset = queryset.order_by('-id')
 
-            # Final check
-            print(f"Final queryset count: {queryset.count()}")
-            print(f"Final SQL query: {queryset.query}")
-
-            return queryset
+            # Newest first; matches keyset_ordering so cursor pages are stable
+            return queryset.order_by('-application_date_applied', '-application_id')
 
-        except AttributeError as e:
-            print(f"AttributeError: {e}")
+        except AttributeError:
             # User is not a recruiter
             return Application.objects.none()
 
@@ -1125,6 +1293,9 @@ class RecruiterApplicationUpdateAPIView(generics.RetrieveUpdateAPIView):
     def patch(self, request, *args, **kwargs):
         instance = self.get_object()
 
+        # Only PENDING/APPROVED/REJECTED can be stored (each has its own job counter)
+        ApplicationUpdateSerializer(instance, data=request.data, partial=True).is_valid(raise_exception=True)
+
         # Get the values from request.data
         new_status = request.data.get('application_status')
         new_comment = request.data.get('application_recruiter_comment')
@@ -1135,8 +1306,9 @@ class RecruiterApplicationUpdateAPIView(generics.RetrieveUpdateAPIView):
         if new_comment is not None:
             instance.application_recruiter_comment = new_comment
 
-        # Save the instance
-        instance.save()
+        # Save the instance; the job's counters move in the same transaction
+        with transaction.atomic():
+            instance.save()
 
         # Serialize and return the updated instance
         serializer = self.get_serializer(instance)
@@ -1148,39 +1320,30 @@ class JobApplicationStatsView(APIView):
 
     def get(self, request, job_id):
         try:
-            # Get the job
-            job = Job.objects.get(job_id=job_id)
+            # Get the job together with the company that posted it
+            job = Job.objects.select_related('recruiter_id').get(job_id=job_id)
 
             # Verify the recruiter belongs to the company that posted the job
             recruiter = Recruiter.objects.get(recruiter_id=request.user)
-            job_company = job.recruiter_id.company_id
 
-            if recruiter.company_id.company_id != job_company.company_id:
+            if recruiter.company_id_id != job.recruiter_id.company_id_id:
                 return Response({
                     "message": "You don't have permission to view statistics for this job",
                     "error": True
                 }, status=status.HTTP_403_FORBIDDEN)
 
-            # Get application counts
-            application_stats = Application.objects.filter(job_id=job_id)
-
-            # Count total applications
-            total_count = application_stats.count()
-
-            # Count applications by status
-            approved_count = application_stats.filter(application_status="APPROVED").count()
-            rejected_count = application_stats.filter(application_status="REJECTED").count()
-            pending_count = application_stats.filter(application_status="PENDING").count()
+            # Total and per-status application counts in one query
+            counts = job_application_counts(job_id)
 
             return Response({
                 "message": "Application statistics retrieved successfully",
                 "error": False,
                 "data": {
                     "job_id": job_id,
-                    "total_applications": total_count,
-                    "approved_applications": approved_count,
-                    "rejected_applications": rejected_count,
-                    "pending_applications": pending_count
+                    "total_applications": counts["total_applications"],
+                    "approved_applications": counts["approved_applications"],
+                    "rejected_applications": counts["rejected_applications"],
+                    "pending_applications": counts["pending_applications"]
                 }
             }, status=status.HTTP_200_OK)
 
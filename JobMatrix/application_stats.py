@@ -0,0 +1,213 @@
+"""
+Application counts per job.
+
+Every view that reports how many applications a job has (in total and per
+status) gets them here, for one job or a whole page of jobs.
+
+The counts live in JOB_APPLICATION_STATS, one row per job, so reading them is
+a primary-key lookup rather than a scan of APPLICATION. The signal handlers at
+the bottom of this module update the row in the same transaction as the
+application being created, moved to another status or deleted; callers that
+write applications should do so inside transaction.atomic() so both commit
+together. A delete() that removes many applications at once (a queryset
+delete, or a cascade from an applicant or user) recomputes the affected jobs'
+rows once it commits, instead of updating them row by row; applications
+deleted along with their job need nothing, the row goes with the job.
+Writes that bypass signals (bulk_create, QuerySet.update, raw SQL)
+are repaired by rebuild_application_stats()
+(`python manage.py rebuild_application_stats`).
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, QuerySet
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from JobMatrix.models import Application, Job, JobApplicationStats
+
+STATUS_COUNT_FIELDS = {
+    "approved_applications": "APPROVED",
+    "rejected_applications": "REJECTED",
+    "pending_applications": "PENDING",
+}
+
+# Counter column for each application status
+STATUS_COLUMNS = {
+    "PENDING": "stats_pending",
+    "APPROVED": "stats_approved",
+    "REJECTED": "stats_rejected",
+}
+
+
+def empty_counts():
+    return {"total_applications": 0, **{field: 0 for field in STATUS_COUNT_FIELDS}}
+
+
+def stats_counts(stats):
+    """
+    The application_counts() entry for a JobApplicationStats row (or None).
+    """
+    if stats is None:
+        return empty_counts()
+    return {
+        "total_applications": stats.stats_total,
+        "approved_applications": stats.stats_approved,
+        "rejected_applications": stats.stats_rejected,
+        "pending_applications": stats.stats_pending,
+    }
+
+
+def application_counts(job_ids):
+    """
+    {job_id: {"total_applications", "approved_applications", "rejected_applications",
+    "pending_applications"}} for every given job id (zeros for jobs without applications).
+    """
+    job_ids = list(job_ids)
+    counts = {job_id: empty_counts() for job_id in job_ids}
+    if not job_ids:
+        return counts
+    for stats in JobApplicationStats.objects.filter(job_id__in=job_ids):
+        counts[stats.job_id_id] = stats_counts(stats)
+    return counts
+
+
+def job_application_counts(job_id):
+    return application_counts([job_id])[job_id]
+
+
+def count_applications(job_ids=None):
+    """
+    Counts straight from APPLICATION in one conditional-aggregate query, over the
+    (job_id, application_status) index: {job_id: {"stats_total": n, "stats_pending": n, ...}}.
+    Only jobs with applications are included.
+    """
+    queryset = Application.objects.all()
+    if job_ids is not None:
+        queryset = queryset.filter(job_id__in=list(job_ids))
+    rows = (
+        queryset.values("job_id")
+        .annotate(
+            stats_total=Count("application_id"),
+            **{
+                column: Count("application_id", filter=Q(application_status=status))
+                for status, column in STATUS_COLUMNS.items()
+            },
+        )
+        .order_by()
+    )
+    return {row.pop("job_id"): row for row in rows}
+
+
+def rebuild_application_stats():
+    """
+    Recompute every job's counters from APPLICATION. Returns the number of rows written.
+    """
+    counts = count_applications()
+    with transaction.atomic():
+        JobApplicationStats.objects.all().delete()
+        JobApplicationStats.objects.bulk_create(
+            [JobApplicationStats(job_id_id=job_id, **columns) for job_id, columns in counts.items()],
+            batch_size=1000,
+        )
+    return len(counts)
+
+
+def refresh_application_stats(job_ids):
+    """
+    Recompute the counters of the given jobs from APPLICATION.
+    """
+    job_ids = list(job_ids)
+    counts = count_applications(job_ids)
+    with transaction.atomic():
+        JobApplicationStats.objects.filter(job_id__in=job_ids).delete()
+        JobApplicationStats.objects.bulk_create(
+            [JobApplicationStats(job_id_id=job_id, **columns) for job_id, columns in counts.items()]
+        )
+
+
+def adjust_counters(job_id, status, delta):
+    """
+    Add delta to the job's total and to the counter of the given status.
+    """
+    changes = {"stats_total": delta}
+    if status in STATUS_COLUMNS:
+        changes[STATUS_COLUMNS[status]] = delta
+    _apply(job_id, changes)
+
+
+def move_status(job_id, old_status, new_status):
+    changes = {}
+    if old_status in STATUS_COLUMNS:
+        changes[STATUS_COLUMNS[old_status]] = -1
+    if new_status in STATUS_COLUMNS:
+        changes[STATUS_COLUMNS[new_status]] = changes.get(STATUS_COLUMNS[new_status], 0) + 1
+    _apply(job_id, changes)
+
+
+def _apply(job_id, changes):
+    changes = {column: delta for column, delta in changes.items() if delta}
+    if not changes:
+        return
+    updated = JobApplicationStats.objects.filter(job_id=job_id).update(
+        **{column: F(column) + delta for column, delta in changes.items()}
+    )
+    if updated:
+        return
+    if any(delta < 0 for delta in changes.values()):
+        # No row to take a decrement from: the job is being deleted, or the counters
+        # were never built for it (rebuild_application_stats() fills them in)
+        return
+    try:
+        with transaction.atomic():
+            JobApplicationStats.objects.create(job_id_id=job_id, **changes)
+    except IntegrityError:
+        # Another transaction created the row first
+        JobApplicationStats.objects.filter(job_id=job_id).update(
+            **{column: F(column) + delta for column, delta in changes.items()}
+        )
+
+
+@receiver(pre_save, sender=Application)
+def remember_application_state(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    queryset = Application.objects.filter(application_id=instance.application_id)
+    if transaction.get_connection().in_atomic_block:
+        # Lock the row so concurrent status changes are counted once each
+        queryset = queryset.select_for_update()
+    instance._stats_previous = queryset.values_list("job_id", "application_status").first()
+
+
+@receiver(post_save, sender=Application)
+def update_application_stats(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        adjust_counters(instance.job_id_id, instance.application_status, 1)
+        return
+
+    previous = getattr(instance, "_stats_previous", None)
+    if previous is None:
+        return
+    previous_job_id, previous_status = previous
+    if previous_job_id != instance.job_id_id:
+        adjust_counters(previous_job_id, previous_status, -1)
+        adjust_counters(instance.job_id_id, instance.application_status, 1)
+    elif previous_status != instance.application_status:
+        move_status(instance.job_id_id, previous_status, instance.application_status)
+    instance._stats_previous = (instance.job_id_id, instance.application_status)
+
+
+@receiver(post_delete, sender=Application)
+def remove_application_stats(sender, instance, origin=None, **kwargs):
+    if origin is None or origin is instance:
+        adjust_counters(instance.job_id_id, instance.application_status, -1)
+        return
+    if isinstance(origin, Job) or (isinstance(origin, QuerySet) and origin.model is Job):
+        # Deleted along with the job, which takes its row with it
+        return
+    # One of many applications removed by the same delete(): recompute their jobs once
+    job_ids = origin.__dict__.get("_stats_job_ids")
+    if job_ids is None:
+        job_ids = origin.__dict__["_stats_job_ids"] = set()
+        transaction.on_commit(lambda: refresh_application_stats(job_ids))
+    job_ids.add(instance.job_id_id)
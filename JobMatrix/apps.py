@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class JobmatrixConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'JobMatrix'
+
+    def ready(self):
+        # Register the signal handlers that keep derived data in sync
+        from JobMatrix import (  # noqa: F401
+            application_stats, candidate_ranking, company_stats, conditional, dashboard_metrics, experience, feed,
+            principal, recommendations, search,
+        )
+
+        # Check S3 bucket access off the startup path, unless a strict check is asked for
+        from django.conf import settings
+        if settings.S3_STARTUP_CHECK:
+            from JobMatrix.storage_backends import check_bucket
+            check_bucket()
+        elif settings.S3_STARTUP_PROBE:
+            from JobMatrix.storage_backends import start_bucket_probe
+            start_bucket_probe()
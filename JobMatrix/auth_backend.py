@@ -3,7 +3,8 @@ from datetime import datetime, timezone, timedelta
 from django.conf import settings
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from JobMatrix.models import User
+from JobMatrix.principal import AuthenticatedUser, get_principal
+
 
 class JWTAuthentication(BaseAuthentication):
     def authenticate(self, request):
@@ -19,12 +20,16 @@ class JWTAuthentication(BaseAuthentication):
         except jwt.InvalidTokenError:
             raise AuthenticationFailed("Invalid token")
 
-        try:
-            user = User.objects.get(user_id=payload["user_id"]) # Get the user from the database
-        except User.DoesNotExist:
+        principal = get_principal(payload["user_id"]) # Cached identity; the User row is only loaded if needed
+        if principal is None:
             raise AuthenticationFailed("User not found") # Raise an authentication failed exception if the user is not found
 
-        return user, None
+        # Tokens are revoked by bumping user_token_version; tokens issued before
+        # versioning (no "tv" claim) count as version 0, so the first bump revokes them too
+        if payload.get("tv", 0) != principal.token_version:
+            raise AuthenticationFailed("Token has been revoked")
+
+        return AuthenticatedUser(principal), None
 
     @staticmethod
     def generate_jwt(user): # Generate a JWT token for the user
@@ -35,8 +40,10 @@ class JWTAuthentication(BaseAuthentication):
         expiration_days = int(settings.JWT_EXPIRATION_DAYS) # Get the expiration days from the settings
         payload = {
             "user_id": user.user_id,    # User ID
+            "tv": user.user_token_version,  # Token version; bumping it revokes this token
             "exp": now_utc + timedelta(days=expiration_days), # Expiration time
             "iat": now_utc,     # Issued at time
         }
         token = jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
         return token
+
@@ -0,0 +1,89 @@
+"""
+In-process background tasks.
+
+Work that should not hold up the request that triggers it (fanning a new job
+out to applicant feeds, rebuilding a feed after a profile edit) is queued here
+once the surrounding transaction commits, and run by one daemon worker thread
+per process. Each task runs on the worker's own database connection, which is
+closed after the task.
+
+The queue lives in memory: tasks still waiting when the process exits are
+lost, so anything queued here must be derived data with a rebuild command.
+With BACKGROUND_TASKS_ASYNC = False tasks run inline instead (management
+commands, tests, single-threaded debugging).
+"""
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_TASKS_ASYNC = getattr(settings, "BACKGROUND_TASKS_ASYNC", True)
+
+_queue = queue.Queue()
+_pending = set()
+_pending_lock = threading.Lock()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def run_after_commit(func, *args):
+    """
+    Queue func(*args) once the current transaction commits (immediately in autocommit).
+    A call identical to one still waiting in the queue is dropped.
+    """
+    transaction.on_commit(lambda: submit(func, *args))
+
+
+def submit(func, *args):
+    if not BACKGROUND_TASKS_ASYNC:
+        _run(func, args)
+        return
+
+    task = (func, args)
+    with _pending_lock:
+        if task in _pending:
+            return
+        _pending.add(task)
+    _ensure_worker()
+    _queue.put(task)
+
+
+def wait_for_tasks():
+    """
+    Block until every queued task has run.
+    """
+    _queue.join()
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            # Daemon thread: never delays a request, worker shutdown or management command exit
+            _worker = threading.Thread(target=_work, name="jobmatrix-background", daemon=True)
+            _worker.start()
+
+
+def _work():
+    while True:
+        task = _queue.get()
+        with _pending_lock:
+            _pending.discard(task)
+        try:
+            _run(*task)
+        finally:
+            connections.close_all()
+            _queue.task_done()
+
+
+def _run(func, args):
+    try:
+        func(*args)
+    except Exception as e:
+        logger.error(f"Background task {func.__name__}{args} failed: {str(e)}")
@@ -0,0 +1,211 @@
+"""
+Latency benchmarks for the main endpoints.
+
+`python manage.py benchmark_endpoints` runs each Benchmark below through the
+Django test client against the configured database (fill it first with
+`seed_jobmatrix`; the users are picked from whatever is there) and reports,
+per endpoint, p50/p95/p99/mean/max latency, queries per request and
+throughput. Requests are made one after another on warm caches, after a few
+warm-up requests that are not measured, so the numbers describe steady-state
+cost on one worker rather than capacity under load.
+
+Results are written as JSON with sorted keys, so two runs (before and after a
+change, or on two commits) can be diffed directly or compared with
+--compare, which flags endpoints whose p95 latency or query count went up.
+"""
+import json
+import statistics
+import subprocess
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from JobMatrix.models import User, Recruiter, Job, Application, Bookmark
+from JobMatrix.query_budgets import client_for
+
+
+class Benchmark:
+    """
+    One request, made repeatedly as `user` ("applicant", "recruiter", "admin" or None).
+
+    params and data may be callables taking the users dict.
+    """
+
+    def __init__(self, key, url_name, method="get", user=None, params=None, data=None):
+        self.key = key
+        self.url_name = url_name
+        self.method = method
+        self.user = user
+        self.params = params
+        self.data = data
+
+    def request(self, client, users):
+        url = reverse(self.url_name)
+        if self.method == "get":
+            return client.get(url, _resolve(self.params, users) or {})
+        return getattr(client, self.method)(url, _resolve(self.data, users), content_type="application/json")
+
+
+def _resolve(value, users):
+    return value(users) if callable(value) else value
+
+
+BENCHMARKS = [
+    Benchmark("login", "login", method="post", data=lambda users: {
+        "user_email": users["applicant"].user_email, "user_password": users["password"],
+    }),
+    Benchmark("job-search", "jobs-list", user="applicant", params={
+        "q": "engineer", "location": "New York", "min_salary": 50000, "date_posted": "Past month",
+    }),
+    Benchmark("job-list", "jobs-list", user="applicant"),
+    Benchmark("applied-jobs", "user-applied-jobs", user="applicant"),
+    Benchmark("bookmarks", "bookmark-list-create", user="applicant"),
+    Benchmark("recruiter-jobs", "company-jobs-list", user="recruiter"),
+    Benchmark("admin-dashboard", "admin-dashboard-insights", user="admin"),
+    Benchmark("admin-users", "get-all-users-for-admin", user="admin", params={"page_size": 50}),
+]
+
+
+def pick_users(password):
+    """
+    The users the benchmarks run as: the applicant with the most applications, the active
+    recruiter with the most jobs and any admin. Returns None for a role with no user.
+    """
+    applicant_id = (
+        Application.objects.values("applicant_id").annotate(n=Count("application_id"))
+        .order_by("-n").values_list("applicant_id", flat=True).first()
+    )
+    recruiter_id = (
+        Job.objects.filter(recruiter_id__recruiter_is_active=True).values("recruiter_id")
+        .annotate(n=Count("job_id")).order_by("-n").values_list("recruiter_id", flat=True).first()
+    )
+    return {
+        "applicant": User.objects.filter(user_id=applicant_id).first(),
+        "recruiter": User.objects.filter(user_id=recruiter_id).first(),
+        "admin": User.objects.filter(user_role="ADMIN").order_by("user_id").first(),
+        "password": password,
+    }
+
+
+def percentile(sorted_values, q):
+    """
+    Linear interpolation between the closest ranks, like numpy's default.
+    """
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(timings_ms, query_counts, status_code):
+    timings = sorted(timings_ms)
+    total_seconds = sum(timings) / 1000
+    return {
+        "status": status_code,
+        "requests": len(timings),
+        "latency_ms": {
+            "p50": round(percentile(timings, 0.50), 2),
+            "p95": round(percentile(timings, 0.95), 2),
+            "p99": round(percentile(timings, 0.99), 2),
+            "mean": round(statistics.fmean(timings), 2),
+            "max": round(timings[-1], 2),
+        },
+        "queries": {"mean": round(statistics.fmean(query_counts), 1), "max": max(query_counts)},
+        "throughput_rps": round(len(timings) / total_seconds, 1) if total_seconds else None,
+    }
+
+
+def run_benchmark(benchmark, users, requests, warmup):
+    """
+    Time `requests` requests after `warmup` unmeasured ones. Returns the summary dict.
+    """
+    client = client_for(users[benchmark.user] if benchmark.user else None)
+    for _ in range(warmup):
+        benchmark.request(client, users)
+
+    timings, query_counts = [], []
+    status_code = None
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = benchmark.request(client, users)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            timings.append((time.perf_counter() - started) * 1000)
+        query_counts.append(len(queries))
+        status_code = response.status_code
+    return summarize(timings, query_counts, status_code)
+
+
+def dataset_size():
+    return {
+        "users": User.objects.count(),
+        "recruiters": Recruiter.objects.count(),
+        "jobs": Job.objects.count(),
+        "applications": Application.objects.count(),
+        "bookmarks": Bookmark.objects.count(),
+    }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmarks(users, requests=200, warmup=10, keys=None):
+    """
+    Run the benchmarks (all, or the given keys). Yields (benchmark, summary).
+    """
+    for benchmark in BENCHMARKS:
+        if keys and benchmark.key not in keys:
+            continue
+        if benchmark.user and users[benchmark.user] is None:
+            yield benchmark, None
+            continue
+        yield benchmark, run_benchmark(benchmark, users, requests, warmup)
+
+
+def results_document(endpoints, requests, warmup):
+    return {
+        "commit": git_commit(),
+        "created": timezone.now().isoformat(timespec="seconds"),
+        "database": connection.vendor,
+        "dataset": dataset_size(),
+        "requests": requests,
+        "warmup": warmup,
+        "endpoints": endpoints,
+    }
+
+
+def write_results(document, path):
+    with open(path, "w") as handle:
+        json.dump(document, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def compare_results(baseline, current, tolerance):
+    """
+    Endpoints that got worse than the baseline: [(key, reason)]. p95 latency may grow by
+    `tolerance` (a fraction) before it counts; any increase in mean queries counts.
+    """
+    regressions = []
+    for key, result in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(key)
+        if not before or not result:
+            continue
+        old_p95, new_p95 = before["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        if new_p95 > old_p95 * (1 + tolerance):
+            regressions.append((key, f"p95 {old_p95} -> {new_p95} ms"))
+        old_queries, new_queries = before["queries"]["mean"], result["queries"]["mean"]
+        if new_queries > old_queries:
+            regressions.append((key, f"queries {old_queries} -> {new_queries} per request"))
+    return regressions
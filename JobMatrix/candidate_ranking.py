@@ -0,0 +1,202 @@
+"""
+Candidate ranking.
+
+Recruiters can list a job's applicants best match first (`ordering=match` on
+the job applicants list). Each applicant is scored against the job from four
+features of their profile:
+
+    skills      the job's skills the applicant has, each counting
+                experience_weight(years) up to SKILL_YEARS_CAP years, over the
+                number of skills the job asks for
+    experience  months of work experience, overlapping roles counted once (from
+                the experience summary, see JobMatrix/experience.py)
+    degree      highest degree level (associate 1, bachelor 2, master 3, doctorate 4)
+    gpa         best GPA at that level
+
+    score = 100 * (0.6 * skills + 0.2 * min(months / 120, 1) + 0.1 * degree / 4 + 0.1 * gpa / 4)
+
+A job's skills are the terms of the recommendation vocabulary (see
+JobMatrix/recommendations.py) found in its title and description, with every
+skill of its applicants added to the vocabulary.
+
+Reading the profile tables for every applicant of a popular job would make
+each page slow, so skills and education are kept per applicant in
+APPLICANT_FEATURES: recomputed in the background when a skill or education
+row changes (signal handlers at the bottom), and computed on first use for
+applicants without a row. Ranking a job is then one query for its
+applications, one for their features joined with their experience summaries
+and a NumPy pass over the arrays built from them.
+`python manage.py rebuild_candidate_features` recomputes every row.
+"""
+from datetime import date
+
+import numpy as np
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from JobMatrix.background import run_after_commit
+from JobMatrix.experience import DAYS_PER_MONTH, total_days
+from JobMatrix.models import Applicant, ApplicantFeatures, Education, Job, Skill
+from JobMatrix.recommendations import KNOWN_SKILLS, experience_weight, extract_skills, normalize_skill, skill_tokens
+
+BUILD_CHUNK_SIZE = 500
+SKILL_YEARS_CAP = 5
+FULL_EXPERIENCE_MONTHS = 120
+MAX_DEGREE_LEVEL = 4
+MAX_GPA = 4.0
+
+WEIGHTS = {"skills": 0.6, "experience": 0.2, "degree": 0.1, "gpa": 0.1}
+
+# Tokens of EDUCATION.education_degree_type (dots removed, so "B.Sc." is "bsc") -> level
+DEGREE_LEVELS = {
+    **dict.fromkeys(("associate", "associates", "aa", "aas"), 1),
+    **dict.fromkeys(("bachelor", "bachelors", "ba", "bs", "bsc", "btech", "be", "beng", "bba", "bcom", "bfa"), 2),
+    **dict.fromkeys(("master", "masters", "ma", "ms", "msc", "mtech", "meng", "mba", "mfa", "mcom"), 3),
+    **dict.fromkeys(("phd", "doctor", "doctorate", "doctoral", "dphil", "md", "jd", "edd"), 4),
+}
+
+
+def degree_level(degree_type):
+    tokens = skill_tokens((degree_type or "").replace(".", ""))
+    return max((DEGREE_LEVELS.get(token, 0) for token in tokens), default=0)
+
+
+def compute_features(applicant_ids):
+    """
+    {applicant_id: ApplicantFeatures (unsaved)} from the profile rows of the given applicants.
+    """
+    features = {
+        applicant_id: ApplicantFeatures(applicant_id_id=applicant_id, features_skills={})
+        for applicant_id in Applicant.objects.filter(applicant_id__in=applicant_ids).values_list("applicant_id", flat=True)
+    }
+    if not features:
+        return features
+
+    skills = Skill.objects.filter(applicant_id__in=features).values_list("applicant_id", "skill_name", "skill_years_of_experience")
+    for applicant_id, name, years in skills:
+        term = normalize_skill(name)
+        if term:
+            terms = features[applicant_id].features_skills
+            terms[term] = max(terms.get(term, 0), years or 0)
+
+    educations = Education.objects.filter(applicant_id__in=features).values_list("applicant_id", "education_degree_type", "education_gpa")
+    for applicant_id, degree_type, gpa in educations:
+        row = features[applicant_id]
+        level = degree_level(degree_type)
+        if level > row.features_degree_level:
+            row.features_degree_level, row.features_gpa = level, gpa
+        elif level == row.features_degree_level and gpa is not None and (row.features_gpa is None or gpa > row.features_gpa):
+            row.features_gpa = gpa
+    return features
+
+
+def save_features(applicant_ids):
+    """
+    Recompute and store the features of the given applicants; returns them by applicant id.
+    """
+    features = {}
+    applicant_ids = list(applicant_ids)
+    for start in range(0, len(applicant_ids), BUILD_CHUNK_SIZE):
+        chunk = applicant_ids[start:start + BUILD_CHUNK_SIZE]
+        computed = compute_features(chunk)
+        with transaction.atomic():
+            ApplicantFeatures.objects.filter(applicant_id__in=chunk).delete()
+            ApplicantFeatures.objects.bulk_create(computed.values())
+        features.update(computed)
+    return features
+
+
+def refresh_applicant_features(applicant_id):
+    save_features([applicant_id])
+
+
+def rebuild_candidate_features():
+    """
+    Recompute the features of every applicant. Returns the number of applicants.
+    """
+    applicant_ids = list(Applicant.objects.order_by("applicant_id").values_list("applicant_id", flat=True))
+    save_features(applicant_ids)
+    return len(applicant_ids)
+
+
+def _load_features(applications):
+    today = date.today()
+    rows = ApplicantFeatures.objects.filter(
+        applicant_id__in=applications.order_by().values("applicant_id")
+    ).values_list(
+        "applicant_id", "features_skills", "features_degree_level", "features_gpa",
+        "applicant_id__experience_summary__summary_closed_days",
+        "applicant_id__experience_summary__summary_ongoing_since",
+    )
+    return {
+        applicant_id: (skills, total_days(closed_days or 0, ongoing_since, today) / DAYS_PER_MONTH, degree, gpa)
+        for applicant_id, skills, degree, gpa, closed_days, ongoing_since in rows
+    }
+
+
+def rank_applications(job_id, applications):
+    """
+    Rank an Application queryset for the job by match score:
+    [(application_id, score, matched skills)], best first, latest application first among equal scores.
+    """
+    job = Job.objects.filter(job_id=job_id).values_list("job_title", "job_description").first()
+    rows = list(applications.order_by().values_list("application_id", "applicant_id"))
+    if job is None or not rows:
+        return []
+
+    # applicant_id -> (skills, experience months, degree level, gpa)
+    features = _load_features(applications)
+    missing = {applicant_id for _, applicant_id in rows} - features.keys()
+    if missing:
+        save_features(sorted(missing))
+        features = _load_features(applications)
+
+    vocabulary = set(KNOWN_SKILLS)
+    for skills, _, _, _ in features.values():
+        vocabulary.update(skills)
+    job_terms = extract_skills(f"{job[0]}\n{job[1]}", vocabulary)
+
+    # One array per feature, one slot per application; skills as (slot, weight) pairs
+    count = len(rows)
+    months = np.zeros(count)
+    degrees = np.zeros(count)
+    gpas = np.zeros(count)
+    skill_slots, skill_weights = [], []
+    matched = [[] for _ in rows]
+    full_weight = experience_weight(SKILL_YEARS_CAP)
+    for slot, (_, applicant_id) in enumerate(rows):
+        if applicant_id not in features:
+            continue
+        skills, months[slot], degrees[slot], gpa = features[applicant_id]
+        gpas[slot] = gpa or 0
+        for term, years in skills.items():
+            if term in job_terms:
+                matched[slot].append(term)
+                skill_slots.append(slot)
+                skill_weights.append(min(experience_weight(years), full_weight) / full_weight)
+
+    coverage = np.zeros(count)
+    if skill_slots:
+        coverage = np.bincount(skill_slots, weights=skill_weights, minlength=count) / len(job_terms)
+    scores = np.round(100 * (
+        WEIGHTS["skills"] * coverage
+        + WEIGHTS["experience"] * np.minimum(months / FULL_EXPERIENCE_MONTHS, 1)
+        + WEIGHTS["degree"] * degrees / MAX_DEGREE_LEVEL
+        + WEIGHTS["gpa"] * np.minimum(gpas / MAX_GPA, 1)
+    ), 2)
+
+    application_ids = np.array([application_id for application_id, _ in rows], dtype=np.int64)
+    order = np.lexsort((-application_ids, -scores))
+    return [(int(application_ids[slot]), float(scores[slot]), sorted(matched[slot])) for slot in order]
+
+
+# ---------------- Signal handlers ---------------- #
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+def refresh_features_on_profile_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        run_after_commit(refresh_applicant_features, instance.applicant_id_id)
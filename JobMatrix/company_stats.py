@@ -0,0 +1,263 @@
+"""
+Company and recruiter statistics from aggregate queries.
+
+The company screens used to walk every recruiter of every company and run a
+COUNT(*) on JOB for each one. Here the recruiters of any number of companies,
+their USER columns and their job counts come from a single GROUP BY; the
+per-company totals (active/inactive recruiters, jobs) are rolled up from
+those rows, so a page of companies costs the same two queries however many
+recruiters it has.
+
+A company's recruiter stats (RecruiterCompanyDetailView) can also be cached
+for COMPANY_STATS_CACHE_TIMEOUT seconds in the shared cache named by
+COMPANY_STATS_CACHE_ALIAS (e.g. Redis or Memcached). The signal handlers at
+the bottom of this module drop the snapshot when one of the company's jobs,
+recruiters or recruiter users is saved or deleted; a per-process cache would
+only be cleared in the worker that made the change, so without an alias the
+stats are always read from the database.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from JobMatrix.media import resolve_media_urls
+from JobMatrix.models import Company, Recruiter, Job, User
+from JobMatrix.signals import jobs_bulk_created
+
+logger = logging.getLogger(__name__)
+
+COMPANY_STATS_CACHE_TIMEOUT = getattr(settings, "COMPANY_STATS_CACHE_TIMEOUT", 300)
+COMPANY_STATS_CACHE_ALIAS = getattr(settings, "COMPANY_STATS_CACHE_ALIAS", None)
+STATS_CACHE_ENABLED = bool(COMPANY_STATS_CACHE_ALIAS) and COMPANY_STATS_CACHE_TIMEOUT > 0
+
+COMPANY_FIELDS = (
+    "company_id",
+    "company_name",
+    "company_industry",
+    "company_description",
+    "company_image",
+)
+
+RECRUITER_FIELDS = (
+    "company_id",
+    "recruiter_id",
+    "recruiter_is_active",
+    "recruiter_start_date",
+    "recruiter_end_date",
+    "recruiter_id__user_first_name",
+    "recruiter_id__user_last_name",
+    "recruiter_id__user_email",
+    "recruiter_id__user_phone",
+    "recruiter_id__user_profile_photo",
+)
+
+
+def recruiter_rows(company_ids, ordering=("recruiter_id",)):
+    """
+    Recruiters of the given companies joined to USER, each with its job count (one query).
+    """
+    return list(
+        Recruiter.objects.filter(company_id__in=company_ids)
+        .values(*RECRUITER_FIELDS)
+        .annotate(job_count=Count("job"))
+        .order_by(*ordering)
+    )
+
+
+def company_queryset():
+    # Everything the listings show, and nothing else (e.g. not the hashed secret key)
+    return Company.objects.only(*COMPANY_FIELDS)
+
+
+def summarize_recruiters(rows):
+    """
+    Active/inactive recruiter counts and the company's total jobs from recruiter_rows() output.
+    """
+    active = sum(1 for row in rows if row["recruiter_is_active"])
+    return {
+        "active_recruiters_count": active,
+        "inactive_recruiters_count": len(rows) - active,
+        "total_jobs": sum(row["job_count"] for row in rows),
+    }
+
+
+def admin_company_entries(companies):
+    """
+    The admin companies listing for a batch of companies (see company_queryset()):
+    company details, recruiter/job totals and the recruiters split by status.
+    """
+    by_company = {company.company_id: [] for company in companies}
+    for row in recruiter_rows(list(by_company)):
+        by_company[row["company_id"]].append(row)
+
+    urls = resolve_media_urls(
+        [company.company_image.name for company in companies if company.company_image]
+        + [row["recruiter_id__user_profile_photo"] for rows in by_company.values() for row in rows]
+    )
+
+    def media_url(key):
+        return urls.get(key.lstrip("/")) if key else None
+
+    entries = []
+    for company in companies:
+        rows = by_company[company.company_id]
+        active_recruiters = []
+        inactive_recruiters = []
+        for row in rows:
+            recruiter = {
+                "recruiter_id": row["recruiter_id"],
+                "name": f"{row['recruiter_id__user_first_name']} {row['recruiter_id__user_last_name']}",
+                "email": row["recruiter_id__user_email"],
+                "phone": row["recruiter_id__user_phone"],
+                "profile_photo": media_url(row["recruiter_id__user_profile_photo"]),
+                "start_date": row["recruiter_start_date"],
+            }
+            if row["recruiter_is_active"]:
+                recruiter["job_count"] = row["job_count"]
+                active_recruiters.append(recruiter)
+            else:
+                recruiter["end_date"] = row["recruiter_end_date"]
+                recruiter["job_count"] = row["job_count"]
+                inactive_recruiters.append(recruiter)
+
+        entries.append({
+            "company_id": company.company_id,
+            "company_name": company.company_name,
+            "company_industry": company.company_industry,
+            "company_description": company.company_description,
+            "company_image": media_url(company.company_image.name) if company.company_image else None,
+            **summarize_recruiters(rows),
+            "active_recruiters": active_recruiters,
+            "inactive_recruiters": inactive_recruiters,
+        })
+    return entries
+
+
+def iter_admin_company_entries(queryset=None, batch_size=200):
+    """
+    Yields admin_company_entries() for every company, batch_size companies at a time,
+    seeking on company_id so no batch uses OFFSET.
+    """
+    queryset = (queryset if queryset is not None else company_queryset()).order_by("company_id")
+    last_id = None
+    while True:
+        batch = queryset if last_id is None else queryset.filter(company_id__gt=last_id)
+        companies = list(batch[:batch_size])
+        if not companies:
+            return
+        yield from admin_company_entries(companies)
+        if len(companies) < batch_size:
+            return
+        last_id = companies[-1].company_id
+
+
+def _stats_cache_key(company_id):
+    return f"company-stats:{company_id}"
+
+
+def load_company_recruiter_stats(company_id):
+    """
+    {"recruiters": [recruiter_rows() rows], "stats": {...}} for one company, straight from the database.
+    Recruiters are ordered active first, then by jobs posted.
+    """
+    rows = recruiter_rows([company_id], ordering=("-recruiter_is_active", "-job_count", "recruiter_id"))
+    summary = summarize_recruiters(rows)
+    return {
+        "recruiters": rows,
+        "stats": {
+            "total_recruiters": len(rows),
+            "active_recruiters": summary["active_recruiters_count"],
+            "total_jobs": summary["total_jobs"],
+        },
+    }
+
+
+def company_recruiter_stats(company_id):
+    """
+    load_company_recruiter_stats(), served from the shared cache when enabled.
+    """
+    if not STATS_CACHE_ENABLED:
+        return load_company_recruiter_stats(company_id)
+
+    cache = caches[COMPANY_STATS_CACHE_ALIAS]
+    key = _stats_cache_key(company_id)
+    try:
+        snapshot = cache.get(key)
+    except Exception as e:
+        logger.error(f"Error reading company stats cache: {str(e)}")
+        snapshot = None
+    if snapshot is not None:
+        return snapshot
+
+    snapshot = load_company_recruiter_stats(company_id)
+    try:
+        cache.set(key, snapshot, COMPANY_STATS_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.error(f"Error writing company stats cache: {str(e)}")
+    return snapshot
+
+
+def invalidate_company_stats(*company_ids):
+    if not STATS_CACHE_ENABLED:
+        return
+    keys = [_stats_cache_key(company_id) for company_id in company_ids if company_id is not None]
+    try:
+        caches[COMPANY_STATS_CACHE_ALIAS].delete_many(keys)
+    except Exception as e:
+        logger.error(f"Error invalidating company stats cache: {str(e)}")
+
+
+def _recruiter_company_id(recruiter_id):
+    return Recruiter.objects.filter(recruiter_id=recruiter_id).values_list("company_id", flat=True).first()
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_company_stats(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or not STATS_CACHE_ENABLED:
+        return
+    if origin is None:
+        invalidate_company_stats(_recruiter_company_id(instance.recruiter_id_id))
+        return
+    # A delete() removing many jobs: one lookup and one invalidation per recruiter
+    recruiters = origin.__dict__.setdefault("_stats_invalidated_recruiters", set())
+    if instance.recruiter_id_id not in recruiters:
+        recruiters.add(instance.recruiter_id_id)
+        invalidate_company_stats(_recruiter_company_id(instance.recruiter_id_id))
+
+
+@receiver(jobs_bulk_created)
+def invalidate_bulk_created_company_stats(sender, jobs, **kwargs):
+    if not STATS_CACHE_ENABLED:
+        return
+    recruiter_ids = {job.recruiter_id_id for job in jobs}
+    invalidate_company_stats(*Recruiter.objects.filter(recruiter_id__in=recruiter_ids)
+                             .values_list("company_id", flat=True).distinct())
+
+
+@receiver(pre_save, sender=Recruiter)
+def remember_recruiter_company(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or not STATS_CACHE_ENABLED:
+        return
+    instance._stats_previous_company_id = _recruiter_company_id(instance.pk)
+
+
+@receiver(post_save, sender=Recruiter)
+@receiver(post_delete, sender=Recruiter)
+def invalidate_recruiter_company_stats(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # A recruiter moved to another company leaves both snapshots stale
+    invalidate_company_stats(instance.company_id_id, getattr(instance, "_stats_previous_company_id", None))
+
+
+@receiver(post_save, sender=User)
+def invalidate_recruiter_user_company_stats(sender, instance, raw=False, created=False, **kwargs):
+    # Names, email and photo are part of the snapshot
+    if raw or created or not STATS_CACHE_ENABLED or instance.user_role != "RECRUITER":
+        return
+    invalidate_company_stats(_recruiter_company_id(instance.user_id))
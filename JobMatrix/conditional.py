@@ -0,0 +1,261 @@
+"""
+Conditional GET.
+
+Some responses are costly to build but rarely change between two requests
+for them. Those responses carry an ETag made from cheap validators: version
+counters in RESOURCE_VERSION, bumped by the signal handlers at the bottom
+whenever what they cover changes, plus whatever else the body depends on
+(the requesting user and query string, the day for durations that grow, the
+media URL epoch for signed URLs). A request whose If-None-Match holds the
+current ETag gets 304 Not Modified after one query for the versions, before
+anything is loaded or serialized.
+
+The counters are coarse on purpose: JOBS moves on any job or recruiter
+write, COMPANIES on any company write, and one counter per applicant covers
+their applications and bookmarks, another their profile. One counter per
+recruiter covers their jobs, for responses that show a known few of them
+(bookmarks) and so need not change whenever anyone posts a job. A write
+costs one UPDATE; a delete that removes many rows bumps all the counters it
+touches once, in one UPDATE, when it commits.
+
+The job counters are bumped after the write commits rather than in its
+transaction: every job writer (each import chunk included) would otherwise
+wait on the JOBS row lock until the writer before it committed. A client
+revalidating in between gets one more 304 for what it already has.
+
+The bodies depend on who is asking, so they are sent as private (browsers
+keep them, shared caches do not) and revalidated on every use unless the
+view lets a role reuse them for a while (ConditionalGetMixin.cache_max_age).
+"""
+import hashlib
+from datetime import date
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from JobMatrix.media import media_url_epoch
+from JobMatrix.models import (
+    User, Applicant, Recruiter, Company, Job, Application, Bookmark, Skill, Education, WorkExperience,
+    ResourceVersion,
+)
+from JobMatrix.signals import jobs_bulk_created
+
+PRIVATE_REVALIDATE = "private, no-cache"
+
+JOBS = "jobs"
+RECRUITER_JOBS = "recruiter-jobs"  # the jobs of one recruiter
+COMPANIES = "companies"
+APPLICANT_PROFILE = "applicant-profile"
+APPLICANT_ACTIVITY = "applicant-activity"  # applications and bookmarks
+
+
+def version_key(kind, object_id):
+    return f"{kind}:{object_id}"
+
+
+def bump_versions(keys):
+    """
+    Add one to the version of each key, in the current transaction.
+    """
+    keys = set(keys)
+    if not keys:
+        return
+    versions = ResourceVersion.objects.filter(version_key__in=keys)
+    if versions.update(version_number=F("version_number") + 1) == len(keys):
+        return
+    # Some keys were never bumped: create them, then bump again (a second bump of the others does no harm)
+    ResourceVersion.objects.bulk_create([ResourceVersion(version_key=key) for key in keys], ignore_conflicts=True)
+    versions.update(version_number=F("version_number") + 1)
+
+
+def bump_versions_on_commit(keys):
+    """
+    bump_versions(keys) once the current transaction commits (immediately in autocommit).
+    """
+    keys = set(keys)
+    transaction.on_commit(lambda: bump_versions(keys))
+
+
+def bump_versions_once(origin, instance, keys, on_commit=False):
+    """
+    bump_versions(keys) from a post_save or post_delete handler (on commit with
+    on_commit=True). A delete() that removes many rows (origin is the instance or
+    queryset it was called on) bumps the keys of all of them once, together, when
+    the transaction commits.
+    """
+    if origin is None or origin is instance:
+        (bump_versions_on_commit if on_commit else bump_versions)(keys)
+        return
+    pending = origin.__dict__.get("_pending_versions")
+    if pending is None:
+        pending = origin.__dict__["_pending_versions"] = set()
+        transaction.on_commit(lambda: bump_versions(pending))
+    pending.update(keys)
+
+
+def _deleted_by(origin, *models):
+    return origin is None or isinstance(origin, models) or (isinstance(origin, QuerySet) and origin.model in models)
+
+
+def get_versions(keys):
+    """
+    {key: version} for the given keys in one query; keys never bumped are at 0.
+    """
+    keys = list(keys)
+    versions = dict.fromkeys(keys, 0)
+    versions.update(ResourceVersion.objects.filter(version_key__in=keys).values_list("version_key", "version_number"))
+    return versions
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def etag_matches(request, etag):
+    """
+    Whether the request's If-None-Match lists etag (weak comparison).
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    tags = parse_etags(header)
+    if tags == ["*"]:
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == opaque for tag in tags)
+
+
+def set_validators(response, etag, cache_control=PRIVATE_REVALIDATE):
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_control
+    patch_vary_headers(response, ["Authorization"])
+    return response
+
+
+def not_modified(etag, cache_control=PRIVATE_REVALIDATE):
+    return set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, cache_control)
+
+
+def applicant_profile_etag(applicant_id):
+    key = version_key(APPLICANT_PROFILE, applicant_id)
+    version = get_versions([key])[key]
+    # The day changes the durations of ongoing roles; the epoch, the signed photo and resume URLs
+    return make_etag(key, version, date.today().isoformat(), media_url_epoch())
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for a DRF view; list it before the generic view in the bases.
+
+    get_version_keys() names the counters the response depends on, or returns None to
+    leave the request alone (e.g. one that is about to be refused). The ETag covers
+    those versions, get_validator_extras(), the user, the query string and the media URL
+    epoch. cache_max_age maps a user_role to the seconds a browser may reuse a response
+    without asking again; roles not listed always revalidate.
+    """
+    cache_max_age = {}
+
+    def get_version_keys(self):
+        raise NotImplementedError
+
+    def get_validator_extras(self):
+        return []
+
+    def get_cache_control(self):
+        max_age = self.cache_max_age.get(getattr(self.request.user, "user_role", None), 0)
+        return f"private, max-age={max_age}" if max_age else PRIVATE_REVALIDATE
+
+    def get_etag(self):
+        keys = self.get_version_keys()
+        if keys is None:
+            return None
+        versions = get_versions(keys)
+        return make_etag(
+            getattr(self.request.user, "user_id", None),
+            sorted(self.request.query_params.lists()),
+            *[f"{key}={versions[key]}" for key in sorted(versions)],
+            *self.get_validator_extras(),
+            media_url_epoch(),
+        )
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag()
+        if etag is None:
+            return super().get(request, *args, **kwargs)
+        if etag_matches(request, etag):
+            return not_modified(etag, self.get_cache_control())
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            set_validators(response, etag, self.get_cache_control())
+        return response
+
+
+# ---------------- Signal handlers ---------------- #
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def bump_jobs_on_job_change(sender, instance, raw=False, origin=None, **kwargs):
+    if not raw:
+        bump_versions_once(origin, instance, [JOBS, version_key(RECRUITER_JOBS, instance.recruiter_id_id)],
+                           on_commit=True)
+
+
+@receiver(jobs_bulk_created)
+def bump_jobs_on_bulk_create(sender, jobs, **kwargs):
+    bump_versions_on_commit([JOBS, *{version_key(RECRUITER_JOBS, job.recruiter_id_id) for job in jobs}])
+
+
+@receiver(post_save, sender=Recruiter)
+def bump_jobs_on_recruiter_update(sender, instance, created=False, raw=False, **kwargs):
+    # Jobs are listed with their recruiter's company, which may have changed; a new recruiter has no jobs yet
+    if not raw and not created:
+        bump_versions_on_commit([JOBS, version_key(RECRUITER_JOBS, instance.recruiter_id_id)])
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def bump_companies_on_change(sender, instance, raw=False, origin=None, **kwargs):
+    if not raw:
+        bump_versions_once(origin, instance, [COMPANIES])
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+@receiver(post_save, sender=Bookmark)
+@receiver(post_delete, sender=Bookmark)
+def bump_activity_on_change(sender, instance, raw=False, origin=None, **kwargs):
+    # Rows deleted along with their job or applicant are covered by JOBS or the applicant going away
+    if not raw and _deleted_by(origin, Application, Bookmark):
+        bump_versions_once(origin, instance, [version_key(APPLICANT_ACTIVITY, instance.applicant_id_id)])
+
+
+@receiver(post_save, sender=User)
+def bump_profile_on_user_change(sender, instance, raw=False, **kwargs):
+    if not raw and instance.user_role == "APPLICANT":
+        bump_versions([version_key(APPLICANT_PROFILE, instance.user_id)])
+
+
+@receiver(post_save, sender=Applicant)
+@receiver(post_delete, sender=Applicant)
+def bump_profile_on_applicant_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_versions([version_key(APPLICANT_PROFILE, instance.applicant_id_id)])
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=WorkExperience)
+@receiver(post_delete, sender=WorkExperience)
+def bump_profile_on_profile_row_change(sender, instance, raw=False, origin=None, **kwargs):
+    # Rows deleted along with their applicant are covered by the applicant's own bump
+    if not raw and _deleted_by(origin, Skill, Education, WorkExperience):
+        bump_versions_once(origin, instance, [version_key(APPLICANT_PROFILE, instance.applicant_id_id)])
@@ -0,0 +1,388 @@
+"""
+Precomputed admin dashboard metrics.
+
+The dashboard used to run a dozen COUNT(*) queries and an industry GROUP BY
+over JOB / RECRUITER / COMPANY on every load. Those numbers now live in the
+DASHBOARD_METRIC rollup table:
+
+  totals         one row per counter (users, applicants, jobs, ...)
+  industry_jobs  jobs per company industry
+  new_users, new_jobs, new_admins
+                 daily buckets keyed by ISO date, summed for "new this week"
+
+The signal handlers at the bottom of this module keep the rows up to date as
+objects are created and deleted. They apply their changes once the write
+commits, so the few hot rows (totals) are not locked for the length of every
+writer's transaction; a delete() that removes many rows (a cascade, or a
+queryset delete) adds up their changes and applies them together. Writes that bypass signals (bulk_create,
+QuerySet.update, raw SQL) are picked up by reconcile_dashboard_metrics(), which
+rebuilds the table from the source tables. Run it periodically
+(`python manage.py reconcile_dashboard_metrics`); the dashboard also runs it
+once if the table has never been built.
+"""
+import logging
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, QuerySet
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from JobMatrix.models import (
+    User, Admin, Applicant, Recruiter, Company, Job, Application, Bookmark, DashboardMetric
+)
+from JobMatrix.signals import jobs_bulk_created
+
+logger = logging.getLogger(__name__)
+
+TOTALS = "totals"
+INDUSTRY_JOBS = "industry_jobs"
+NEW_USERS = "new_users"
+NEW_JOBS = "new_jobs"
+NEW_ADMINS = "new_admins"
+DAILY_GROUPS = (NEW_USERS, NEW_JOBS, NEW_ADMINS)
+META = "meta"
+RECONCILED_AT = "reconciled_at"
+
+# Daily buckets older than this are dropped on reconciliation
+DAILY_RETENTION_DAYS = getattr(settings, "DASHBOARD_METRICS_RETENTION_DAYS", 31)
+NEW_ITEMS_WINDOW_DAYS = 7
+# How long a process trusts "the table has not been built yet" before asking again
+UNINITIALIZED_RECHECK_SECONDS = getattr(settings, "DASHBOARD_METRICS_RECHECK_SECONDS", 30)
+
+TOTAL_MODELS = {
+    "users": User,
+    "applicants": Applicant,
+    "recruiters": Recruiter,
+    "admins": Admin,
+    "companies": Company,
+    "jobs": Job,
+    "applications": Application,
+    "bookmarks": Bookmark,
+}
+
+TOTAL_NAMES = {model: name for name, model in TOTAL_MODELS.items()}
+
+_initialized = False
+_uninitialized_until = 0.0
+
+
+def metrics_initialized():
+    """
+    True once the table has been built; until then incremental updates are skipped
+    (the first reconciliation computes everything from scratch anyway). A negative
+    answer is trusted for UNINITIALIZED_RECHECK_SECONDS, so writes don't query it each time.
+    """
+    global _initialized, _uninitialized_until
+    if _initialized or time.monotonic() < _uninitialized_until:
+        return _initialized
+    _initialized = DashboardMetric.objects.filter(metric_group=META, metric_key=RECONCILED_AT).exists()
+    if not _initialized:
+        _uninitialized_until = time.monotonic() + UNINITIALIZED_RECHECK_SECONDS
+    return _initialized
+
+
+def reset_initialized():
+    """
+    Forget whether the table has been built (tests, or after emptying the table).
+    """
+    global _initialized, _uninitialized_until
+    _initialized, _uninitialized_until = False, 0.0
+
+
+def day_key(value):
+    return timezone.localdate(value).isoformat()
+
+
+def bump(group, key, delta):
+    updated = DashboardMetric.objects.filter(metric_group=group, metric_key=key).update(
+        metric_value=F("metric_value") + delta
+    )
+    if updated or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            DashboardMetric.objects.create(metric_group=group, metric_key=key, metric_value=delta)
+    except IntegrityError:
+        # Another request created the row first
+        DashboardMetric.objects.filter(metric_group=group, metric_key=key).update(
+            metric_value=F("metric_value") + delta
+        )
+
+
+def reconcile_dashboard_metrics():
+    """
+    Rebuild every metric from the source tables. Returns the number of rows written.
+    """
+    global _initialized
+    since = timezone.localdate() - timedelta(days=DAILY_RETENTION_DAYS - 1)
+
+    rows = {}
+    for name, model in TOTAL_MODELS.items():
+        rows[(TOTALS, name)] = model.objects.count()
+
+    for entry in Job.objects.values("recruiter_id__company_id__company_industry").annotate(count=Count("job_id")):
+        rows[(INDUSTRY_JOBS, entry["recruiter_id__company_id__company_industry"])] = entry["count"]
+
+    daily_sources = (
+        (NEW_USERS, User.objects.all(), "user_created_date"),
+        (NEW_JOBS, Job.objects.all(), "job_date_posted"),
+        (NEW_ADMINS, User.objects.filter(user_role="ADMIN"), "user_created_date"),
+    )
+    for group, queryset, field in daily_sources:
+        buckets = (
+            queryset.annotate(day=TruncDate(field))
+            .filter(day__gte=since)
+            .values("day")
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+        for entry in buckets:
+            rows[(group, entry["day"].isoformat())] = entry["count"]
+
+    rows[(META, RECONCILED_AT)] = int(time.time())
+
+    with transaction.atomic():
+        DashboardMetric.objects.all().delete()
+        DashboardMetric.objects.bulk_create([
+            DashboardMetric(metric_group=group, metric_key=key, metric_value=value)
+            for (group, key), value in rows.items()
+        ])
+    _initialized = True
+    return len(rows)
+
+
+def read_dashboard_metrics():
+    """
+    All dashboard numbers in one indexed read:
+    {"totals": {...}, "industry_jobs": {...}, "new_this_week": {"new_users": n, ...}, "reconciled_at": ts}
+    """
+    since = (timezone.localdate() - timedelta(days=NEW_ITEMS_WINDOW_DAYS - 1)).isoformat()
+    rows = list(
+        DashboardMetric.objects.filter(
+            Q(metric_group__in=[TOTALS, INDUSTRY_JOBS, META])
+            | Q(metric_group__in=DAILY_GROUPS, metric_key__gte=since)
+        ).values_list("metric_group", "metric_key", "metric_value")
+    )
+    if not any(group == META for group, _, _ in rows):
+        # Never built (fresh install): build it now, then read it back
+        reconcile_dashboard_metrics()
+        return read_dashboard_metrics()
+
+    snapshot = {
+        "totals": {name: 0 for name in TOTAL_MODELS},
+        "industry_jobs": {},
+        "new_this_week": {group: 0 for group in DAILY_GROUPS},
+        "reconciled_at": None,
+    }
+    for group, key, value in rows:
+        if group == TOTALS:
+            snapshot["totals"][key] = value
+        elif group == INDUSTRY_JOBS:
+            if value > 0:
+                snapshot["industry_jobs"][key] = value
+        elif group == META:
+            snapshot["reconciled_at"] = value
+        else:
+            snapshot["new_this_week"][group] += value
+    return snapshot
+
+
+def _company_industry(recruiter_id):
+    return Company.objects.filter(recruiters=recruiter_id).values_list("company_industry", flat=True).first()
+
+
+def apply_deltas(deltas):
+    """
+    Apply {(group, key): delta} changes, never failing the caller.
+    """
+    deltas = {group_key: delta for group_key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    try:
+        # All or nothing; a savepoint if the caller is still in a transaction
+        with transaction.atomic():
+            for (group, key), delta in deltas.items():
+                bump(group, key, delta)
+    except Exception as e:
+        # Never fail a write because of dashboard counters; reconciliation repairs them
+        logger.error(f"Error updating dashboard metrics: {str(e)}")
+
+
+def apply_deltas_on_commit(deltas):
+    transaction.on_commit(lambda: apply_deltas(deltas))
+
+
+def _defer(origin, deltas):
+    """
+    Add deltas to the ones applied once, when the delete() that origin started commits.
+    """
+    pending = origin.__dict__.get("_metrics_deltas")
+    if pending is None:
+        pending = origin.__dict__["_metrics_deltas"] = Counter()
+        transaction.on_commit(lambda: apply_deltas(pending))
+    pending.update(deltas)
+
+
+def _created_deltas(sender, instance):
+    deltas = Counter({(TOTALS, TOTAL_NAMES[sender]): 1})
+    if sender is User:
+        deltas[(NEW_USERS, day_key(instance.user_created_date))] += 1
+        if instance.user_role == "ADMIN":
+            deltas[(NEW_ADMINS, day_key(instance.user_created_date))] += 1
+    elif sender is Job:
+        deltas[(NEW_JOBS, day_key(instance.job_date_posted))] += 1
+        industry = _company_industry(instance.recruiter_id_id)
+        if industry is not None:
+            deltas[(INDUSTRY_JOBS, industry)] += 1
+    return deltas
+
+
+def _deleted_deltas(sender, instance):
+    deltas = Counter({(TOTALS, TOTAL_NAMES[sender]): -1})
+    if sender is User:
+        deltas[(NEW_USERS, day_key(instance.user_created_date))] -= 1
+        if instance.user_role == "ADMIN":
+            deltas[(NEW_ADMINS, day_key(instance.user_created_date))] -= 1
+    elif sender is Job:
+        deltas[(NEW_JOBS, day_key(instance.job_date_posted))] -= 1
+        industry = getattr(instance, "_metrics_industry", None)
+        if industry is not None:
+            deltas[(INDUSTRY_JOBS, industry)] -= 1
+    return deltas
+
+
+def _on_created(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    try:
+        if metrics_initialized():
+            apply_deltas_on_commit(_created_deltas(sender, instance))
+    except Exception as e:
+        logger.error(f"Error updating dashboard metrics for {sender.__name__}: {str(e)}")
+
+
+def _on_deleted(sender, instance, origin=None, **kwargs):
+    try:
+        if not metrics_initialized():
+            return
+        if origin is None or origin is instance:
+            apply_deltas_on_commit(_deleted_deltas(sender, instance))
+        else:
+            # One of many rows removed by the same delete(): counted together
+            _defer(origin, _deleted_deltas(sender, instance))
+    except Exception as e:
+        logger.error(f"Error updating dashboard metrics for {sender.__name__}: {str(e)}")
+
+
+for _model in TOTAL_MODELS.values():
+    post_save.connect(_on_created, sender=_model, weak=False,
+                      dispatch_uid=f"dashboard_metrics_created_{_model.__name__}")
+    post_delete.connect(_on_deleted, sender=_model, weak=False,
+                        dispatch_uid=f"dashboard_metrics_deleted_{_model.__name__}")
+
+
+@receiver(pre_delete, sender=Job)
+def remember_job_industry(sender, instance, origin=None, **kwargs):
+    # The recruiter/company may be deleted in the same cascade; look the industry up first,
+    # once for a delete() that removes many jobs
+    try:
+        if not metrics_initialized():
+            return
+        if isinstance(origin, Company):
+            instance._metrics_industry = origin.company_industry
+            return
+        industries = origin.__dict__.get("_metrics_industries") if origin is not None else None
+        if industries is None:
+            industries = {}
+            if isinstance(origin, QuerySet) and origin.model is Job:
+                # Every recruiter of the jobs going away, in one query
+                industries = dict(origin.order_by().distinct()
+                                  .values_list("recruiter_id", "recruiter_id__company_id__company_industry"))
+            if origin is not None:
+                origin.__dict__["_metrics_industries"] = industries
+        if instance.recruiter_id_id not in industries:
+            industries[instance.recruiter_id_id] = _company_industry(instance.recruiter_id_id)
+        instance._metrics_industry = industries[instance.recruiter_id_id]
+    except Exception as e:
+        logger.error(f"Error reading industry for job {instance.job_id}: {str(e)}")
+
+
+@receiver(pre_save, sender=Company)
+def remember_company_industry(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    instance._previous_industry = (
+        Company.objects.filter(company_id=instance.company_id).values_list("company_industry", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Company)
+def move_industry_jobs(sender, instance, created=False, raw=False, **kwargs):
+    previous = getattr(instance, "_previous_industry", None)
+    if raw or created or previous is None or previous == instance.company_industry:
+        return
+    try:
+        if not metrics_initialized():
+            return
+        job_count = Job.objects.filter(recruiter_id__company_id=instance.company_id).count()
+        apply_deltas_on_commit({
+            (INDUSTRY_JOBS, previous): -job_count, (INDUSTRY_JOBS, instance.company_industry): job_count,
+        })
+    except Exception as e:
+        logger.error(f"Error moving industry job counts for company {instance.company_id}: {str(e)}")
+
+
+@receiver(post_init, sender=Recruiter)
+def remember_recruiter_company(sender, instance, **kwargs):
+    # As loaded, without a query; None if the company was deferred
+    instance._metrics_company_id = instance.__dict__.get("company_id_id")
+
+
+@receiver(post_save, sender=Recruiter)
+def move_recruiter_industry_jobs(sender, instance, created=False, raw=False, **kwargs):
+    """
+    A recruiter moving to another company takes their jobs to its industry.
+    """
+    previous, instance._metrics_company_id = instance._metrics_company_id, instance.company_id_id
+    if raw or created or previous is None or previous == instance.company_id_id:
+        return
+    try:
+        if not metrics_initialized():
+            return
+        job_count = Job.objects.filter(recruiter_id=instance.pk).count()
+        if not job_count:
+            return
+        industries = dict(Company.objects.filter(
+            company_id__in=[previous, instance.company_id_id]
+        ).values_list("company_id", "company_industry"))
+        deltas = Counter()
+        if industries.get(previous) is not None:
+            deltas[(INDUSTRY_JOBS, industries[previous])] -= job_count
+        if industries.get(instance.company_id_id) is not None:
+            deltas[(INDUSTRY_JOBS, industries[instance.company_id_id])] += job_count
+        apply_deltas_on_commit(deltas)
+    except Exception as e:
+        logger.error(f"Error moving industry job counts for recruiter {instance.pk}: {str(e)}")
+
+
+@receiver(jobs_bulk_created)
+def count_bulk_created_jobs(sender, jobs, **kwargs):
+    try:
+        if not metrics_initialized():
+            return
+        deltas = Counter({(TOTALS, TOTAL_NAMES[Job]): len(jobs)})
+        for job in jobs:
+            deltas[(NEW_JOBS, day_key(job.job_date_posted))] += 1
+        for recruiter_id, count in Counter(job.recruiter_id_id for job in jobs).items():
+            industry = _company_industry(recruiter_id)
+            if industry is not None:
+                deltas[(INDUSTRY_JOBS, industry)] += count
+        apply_deltas_on_commit(deltas)
+    except Exception as e:
+        logger.error(f"Error updating dashboard metrics for {len(jobs)} imported jobs: {str(e)}")
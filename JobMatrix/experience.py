@@ -0,0 +1,211 @@
+"""
+Work experience summaries.
+
+An applicant's experience totals live in APPLICANT_EXPERIENCE_SUMMARY, one
+row per applicant with work experience, rewritten by the signal handlers at
+the bottom as soon as a WORK_EXPERIENCE row being saved or deleted is
+committed. A row holds:
+
+  * the calendar duration (years, months, days) of each role;
+  * the total, with overlapping roles counted once: the days and calendar
+    duration covered by merged periods that have ended, plus the start of the
+    merged period that is still ongoing (if any), so the total for any later
+    day is one subtraction and never goes stale.
+
+Role durations of ongoing roles do change daily, so a summary with an ongoing
+role is recomputed the first time it is read on a later day.
+
+Readers (the work experience list, candidate ranking) use the row instead of
+recomputing from WORK_EXPERIENCE; an applicant without a row has no
+experience. `python manage.py rebuild_experience_summaries` recomputes every row.
+"""
+import calendar
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from JobMatrix.models import User, Applicant, ApplicantExperienceSummary, WorkExperience
+
+BUILD_CHUNK_SIZE = 500
+DAYS_PER_MONTH = 30.4375  # for totals in months
+
+
+def calendar_duration(start, end):
+    """
+    (years, months, days) from start to end, as on a calendar.
+    """
+    if start > end:
+        return 0, 0, 0
+
+    years = end.year - start.year
+    if (end.month, end.day) < (start.month, start.day):
+        years -= 1
+
+    months = end.month - start.month
+    if months < 0:
+        months += 12
+    if end.day < start.day:
+        months = (months - 1) % 12
+
+    if end.day >= start.day:
+        days = end.day - start.day
+    else:
+        comparison_day = min(start.day, calendar.monthrange(end.year, end.month)[1])
+        days = end.day + (comparison_day - start.day)
+    return years, months, days
+
+
+def merge_periods(periods):
+    """
+    ([(start, end), ...] of the merged periods that have ended, start of the merged period
+    still ongoing or None) for (start, end) periods. An end of None means the period is ongoing.
+    """
+    closed = []
+    current_start = current_end = None
+    for start, end in sorted(periods, key=lambda period: period[0]):
+        if end is not None and end <= start:
+            continue
+        if current_start is not None and (current_end is None or start <= current_end):
+            if current_end is not None:
+                current_end = None if end is None else max(current_end, end)
+            continue
+        if current_start is not None:
+            closed.append((current_start, current_end))
+        current_start, current_end = start, end
+    if current_start is not None and current_end is not None:
+        closed.append((current_start, current_end))
+        current_start = None
+    return closed, current_start
+
+
+def add_durations(durations):
+    """
+    Sum of (years, months, days) durations, carrying 30 days into a month and 12 months into a year.
+    """
+    years = sum(duration[0] for duration in durations)
+    months = sum(duration[1] for duration in durations)
+    days = sum(duration[2] for duration in durations)
+    months += days // 30
+    years += months // 12
+    return years, months % 12, days % 30
+
+
+def total_days(closed_days, ongoing_since, today=None):
+    if ongoing_since is None:
+        return closed_days
+    return closed_days + max(((today or date.today()) - ongoing_since).days, 0)
+
+
+def total_duration(summary, today=None):
+    """
+    The applicant's total experience as (years, months, days), overlapping roles counted once.
+    """
+    durations = [summary.summary_closed_duration]
+    if summary.summary_ongoing_since is not None:
+        durations.append(calendar_duration(summary.summary_ongoing_since, today or date.today()))
+    return add_durations(durations)
+
+
+def format_duration(years, months, days):
+    parts = []
+    if years > 0:
+        parts.append(f"{years} years")
+    if months > 0:
+        parts.append(f"{months} months")
+    if days > 0:
+        parts.append(f"{days} days")
+    return ", ".join(parts) if parts else "0 days"
+
+
+def summarize(applicant_id, roles, today):
+    """
+    An unsaved summary from (work_experience_id, start, end) roles.
+    """
+    closed, ongoing_since = merge_periods([(start, end) for _, start, end in roles])
+    return ApplicantExperienceSummary(
+        applicant_id_id=applicant_id,
+        summary_closed_days=sum((end - start).days for start, end in closed),
+        summary_closed_duration=list(add_durations([calendar_duration(start, end) for start, end in closed])),
+        summary_ongoing_since=ongoing_since,
+        summary_roles={
+            str(work_experience_id): list(calendar_duration(start, end or today))
+            for work_experience_id, start, end in roles
+        },
+        summary_as_of=today,
+    )
+
+
+def refresh_experience_summaries(applicant_ids):
+    """
+    Recompute and store the summaries of the given applicants; returns them by applicant id.
+    """
+    today = date.today()
+    summaries = {}
+    applicant_ids = list(applicant_ids)
+    for start in range(0, len(applicant_ids), BUILD_CHUNK_SIZE):
+        chunk = applicant_ids[start:start + BUILD_CHUNK_SIZE]
+        roles = defaultdict(list)
+        rows = WorkExperience.objects.filter(applicant_id__in=chunk).values_list(
+            "applicant_id", "work_experience_id", "work_experience_start_date", "work_experience_end_date"
+        )
+        for applicant_id, work_experience_id, start_date, end_date in rows:
+            roles[applicant_id].append((work_experience_id, start_date, end_date))
+        computed = {
+            applicant_id: summarize(applicant_id, applicant_roles, today) for applicant_id, applicant_roles in roles.items()
+        }
+        with transaction.atomic():
+            ApplicantExperienceSummary.objects.filter(applicant_id__in=chunk).delete()
+            ApplicantExperienceSummary.objects.bulk_create(computed.values())
+        summaries.update(computed)
+    return summaries
+
+
+def rebuild_experience_summaries():
+    """
+    Recompute the summary of every applicant. Returns the number of applicants with work experience.
+    """
+    applicant_ids = list(Applicant.objects.order_by("applicant_id").values_list("applicant_id", flat=True))
+    return len(refresh_experience_summaries(applicant_ids))
+
+
+def up_to_date(summary):
+    """
+    The summary, or a recomputed one if it has an ongoing role and was computed before today.
+    """
+    if summary is not None and summary.summary_ongoing_since is not None and summary.summary_as_of < date.today():
+        return refresh_experience_summaries([summary.applicant_id_id]).get(summary.applicant_id_id)
+    return summary
+
+
+def experience_summary(applicant_id):
+    """
+    The applicant's up-to-date summary, or None if the applicant has no work experience.
+    """
+    return up_to_date(ApplicantExperienceSummary.objects.filter(applicant_id=applicant_id).first())
+
+
+# ---------------- Signal handlers ---------------- #
+
+@receiver(post_save, sender=WorkExperience)
+@receiver(post_delete, sender=WorkExperience)
+def refresh_summary_on_work_experience_change(sender, instance, raw=False, origin=None, **kwargs):
+    if raw:
+        return
+    if origin is None or origin is instance:
+        applicant_id = instance.applicant_id_id
+        # After commit, so deleting an applicant (which may delete its roles first) does not write a summary for it
+        transaction.on_commit(lambda: refresh_experience_summaries([applicant_id]))
+        return
+    if isinstance(origin, (Applicant, User)) or (isinstance(origin, QuerySet) and origin.model in (Applicant, User)):
+        # Deleted along with the applicant, whose summary goes with it
+        return
+    # One of many roles removed by the same delete(): refresh their applicants once
+    applicant_ids = origin.__dict__.get("_summary_applicant_ids")
+    if applicant_ids is None:
+        applicant_ids = origin.__dict__["_summary_applicant_ids"] = set()
+        transaction.on_commit(lambda: refresh_experience_summaries(applicant_ids))
+    applicant_ids.add(instance.applicant_id_id)
@@ -0,0 +1,331 @@
+"""
+Applicant home feeds.
+
+The landing page used to be the unfiltered job list: every visit sorted all
+of JOB, excluded the applicant's bookmarked and applied jobs and counted the
+rest. Instead each applicant now has a capped feed of matching jobs in
+APPLICANT_FEED_ITEM, and the landing page reads one range of its
+(applicant_id, feed_score, feed_posted) index.
+
+Feeds are written, not read, when things change:
+
+  * a new job is fanned out (in the background, see JobMatrix/background.py)
+    to every applicant whose profile terms it matches, found through the
+    APPLICANT_FEED_TERM term -> applicant index;
+  * editing skills, work experience or the city re-indexes the applicant's
+    terms and rebuilds their feed from the most recent FEED_BACKFILL_JOBS jobs;
+  * applying for or bookmarking a job takes it out of the feed.
+
+A job's score is the sum of the weights of the applicant's terms found in it,
+counting title matches twice. Jobs below FEED_MIN_SCORE are left out, so a
+matching city alone is not enough. Each feed keeps its FEED_SIZE best items.
+
+Feeds are derived data: `python manage.py rebuild_applicant_feeds` rebuilds them.
+"""
+import heapq
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from JobMatrix.background import run_after_commit
+from JobMatrix.models import (
+    User, Applicant, Job, Application, Bookmark, Skill, WorkExperience,
+    ApplicantFeedTerm, ApplicantFeedItem,
+)
+from JobMatrix.search import tokenize
+from JobMatrix.signals import jobs_bulk_created
+
+FEED_SIZE = getattr(settings, "FEED_SIZE", 200)
+FEED_MIN_SCORE = getattr(settings, "FEED_MIN_SCORE", 3)
+FEED_BACKFILL_JOBS = getattr(settings, "FEED_BACKFILL_JOBS", 1000)
+FEED_BATCH_SIZE = 200
+
+FEED_ORDERING = ("-feed_score", "-feed_posted", "-feed_item_id")
+
+# Weight of a profile term by where it comes from
+TERM_WEIGHTS = {
+    "skill": 3,
+    "title": 2,
+    "city": 2,
+}
+TITLE_MATCH_FACTOR = 2
+
+
+def applicant_terms(applicant_ids):
+    """
+    {applicant_id: Counter(term -> weight)} from skills, past job titles and city.
+    """
+    terms = defaultdict(Counter)
+
+    def add(applicant_id, text, source):
+        for term in set(tokenize(text)):
+            terms[applicant_id][term] = max(terms[applicant_id][term], TERM_WEIGHTS[source])
+
+    for applicant_id, name in Skill.objects.filter(applicant_id__in=applicant_ids).values_list("applicant_id", "skill_name"):
+        add(applicant_id, name, "skill")
+    for applicant_id, title in WorkExperience.objects.filter(applicant_id__in=applicant_ids).values_list(
+        "applicant_id", "work_experience_job_title"
+    ):
+        add(applicant_id, title, "title")
+    for applicant_id, city in User.objects.filter(user_id__in=applicant_ids).values_list("user_id", "user_city"):
+        add(applicant_id, city, "city")
+    return terms
+
+
+def index_applicant_terms(applicant_ids):
+    """
+    Replace the APPLICANT_FEED_TERM rows of the given applicants. Returns their terms.
+    """
+    applicant_ids = list(applicant_ids)
+    terms = applicant_terms(applicant_ids)
+    with transaction.atomic():
+        ApplicantFeedTerm.objects.filter(applicant_id__in=applicant_ids).delete()
+        ApplicantFeedTerm.objects.bulk_create(
+            [
+                ApplicantFeedTerm(applicant_id_id=applicant_id, feed_term=term, feed_term_weight=weight)
+                for applicant_id, weights in terms.items()
+                for term, weight in weights.items()
+            ],
+            batch_size=1000,
+        )
+    return terms
+
+
+def job_terms(title, description, location):
+    """
+    (title terms, all terms) of a job.
+    """
+    title_terms = set(tokenize(title))
+    return title_terms, title_terms | set(tokenize(description)) | set(tokenize(location))
+
+
+def score_job(weights, title_terms, all_terms):
+    return sum(
+        weight * (TITLE_MATCH_FACTOR if term in title_terms else 1)
+        for term, weight in weights.items()
+        if term in all_terms
+    )
+
+
+def fan_out_job(job_id):
+    """
+    Add a job to the feed of every applicant it matches. Returns the number of feeds updated.
+    """
+    job = Job.objects.filter(job_id=job_id).values("job_title", "job_description", "job_location", "job_date_posted").first()
+    if job is None:
+        return 0
+    title_terms, all_terms = job_terms(job["job_title"], job["job_description"], job["job_location"])
+    if not all_terms:
+        return 0
+
+    scores = Counter()
+    for applicant_id, term, weight in ApplicantFeedTerm.objects.filter(feed_term__in=all_terms).values_list(
+        "applicant_id", "feed_term", "feed_term_weight"
+    ):
+        scores[applicant_id] += weight * (TITLE_MATCH_FACTOR if term in title_terms else 1)
+
+    items = [
+        ApplicantFeedItem(applicant_id_id=applicant_id, job_id_id=job_id, feed_score=score,
+                          feed_posted=job["job_date_posted"])
+        for applicant_id, score in scores.items()
+        if score >= FEED_MIN_SCORE
+    ]
+    ApplicantFeedItem.objects.bulk_create(items, batch_size=1000, ignore_conflicts=True)
+    trim_feeds([item.applicant_id_id for item in items])
+    return len(items)
+
+
+def fan_out_jobs(job_ids):
+    """
+    fan_out_job for many jobs at once (a bulk import), FEED_BATCH_SIZE jobs at a time and
+    newest first. Each batch reads the matching profile terms once and only adds a job to
+    a full feed if it beats the feed's lowest score, so later (older) batches add little.
+    Returns the number of feed items added.
+    """
+    job_ids = sorted(job_ids, reverse=True)
+    added = 0
+    for start in range(0, len(job_ids), FEED_BATCH_SIZE):
+        rows = Job.objects.filter(job_id__in=job_ids[start:start + FEED_BATCH_SIZE]).values_list(
+            "job_id", "job_title", "job_description", "job_location", "job_date_posted"
+        )
+        posted = {}
+        jobs_by_term = defaultdict(list)
+        for job_id, title, description, location, job_posted in rows:
+            posted[job_id] = job_posted
+            title_terms, all_terms = job_terms(title, description, location)
+            for term in all_terms:
+                jobs_by_term[term].append((job_id, TITLE_MATCH_FACTOR if term in title_terms else 1))
+        if not jobs_by_term:
+            continue
+
+        scores = defaultdict(Counter)
+        for applicant_id, term, weight in ApplicantFeedTerm.objects.filter(feed_term__in=jobs_by_term).values_list(
+            "applicant_id", "feed_term", "feed_term_weight"
+        ):
+            for job_id, factor in jobs_by_term[term]:
+                scores[applicant_id][job_id] += weight * factor
+
+        feeds = {
+            applicant_id: (items, lowest)
+            for applicant_id, items, lowest in ApplicantFeedItem.objects.filter(applicant_id__in=list(scores))
+            .values("applicant_id").annotate(items=Count("feed_item_id"), lowest=Min("feed_score"))
+            .values_list("applicant_id", "items", "lowest")
+        }
+        items = []
+        for applicant_id, job_scores in scores.items():
+            count, lowest = feeds.get(applicant_id, (0, None))
+            room = FEED_SIZE - count
+            best = heapq.nlargest(FEED_SIZE, (
+                (score, posted[job_id], job_id) for job_id, score in job_scores.items() if score >= FEED_MIN_SCORE
+            ))
+            items.extend(
+                ApplicantFeedItem(applicant_id_id=applicant_id, job_id_id=job_id, feed_score=score, feed_posted=job_posted)
+                for rank, (score, job_posted, job_id) in enumerate(best)
+                if rank < room or score > lowest
+            )
+        ApplicantFeedItem.objects.bulk_create(items, batch_size=1000, ignore_conflicts=True)
+        trim_feeds(list({item.applicant_id_id for item in items}))
+        added += len(items)
+    return added
+
+
+def trim_feeds(applicant_ids):
+    """
+    Drop everything past the FEED_SIZE best items of the given applicants' feeds.
+    """
+    for start in range(0, len(applicant_ids), FEED_BATCH_SIZE):
+        overfull = (
+            ApplicantFeedItem.objects.filter(applicant_id__in=applicant_ids[start:start + FEED_BATCH_SIZE])
+            .values("applicant_id")
+            .annotate(items=Count("feed_item_id"))
+            .filter(items__gt=FEED_SIZE)
+            .values_list("applicant_id", flat=True)
+        )
+        for applicant_id in list(overfull):
+            feed = ApplicantFeedItem.objects.filter(applicant_id=applicant_id)
+            keep = list(feed.order_by(*FEED_ORDERING).values_list("feed_item_id", flat=True)[:FEED_SIZE])
+            feed.exclude(feed_item_id__in=keep).delete()
+
+
+def recent_jobs():
+    """
+    The jobs a rebuilt feed is chosen from: [(job_id, posted, title terms, all terms)].
+    """
+    rows = (
+        Job.objects.order_by("-job_date_posted", "-job_id")
+        .values_list("job_id", "job_date_posted", "job_title", "job_description", "job_location")
+        [:FEED_BACKFILL_JOBS]
+    )
+    return [(job_id, posted, *job_terms(title, description, location))
+            for job_id, posted, title, description, location in rows]
+
+
+def rebuild_applicant_feeds(applicant_ids, jobs=None):
+    """
+    Re-index the applicants' terms and rebuild their feeds from recent_jobs().
+    """
+    applicant_ids = list(applicant_ids)
+    if jobs is None:
+        jobs = recent_jobs()
+    terms = index_applicant_terms(applicant_ids)
+
+    seen = defaultdict(set)
+    for model in (Application, Bookmark):
+        for applicant_id, job_id in model.objects.filter(applicant_id__in=applicant_ids).values_list("applicant_id", "job_id"):
+            seen[applicant_id].add(job_id)
+
+    items = []
+    for applicant_id in applicant_ids:
+        weights = terms.get(applicant_id)
+        if not weights:
+            continue
+        candidates = []
+        for job_id, posted, title_terms, all_terms in jobs:
+            if job_id in seen[applicant_id]:
+                continue
+            score = score_job(weights, title_terms, all_terms)
+            if score >= FEED_MIN_SCORE:
+                candidates.append((score, posted, job_id))
+        candidates.sort(reverse=True)
+        items.extend(
+            ApplicantFeedItem(applicant_id_id=applicant_id, job_id_id=job_id, feed_score=score, feed_posted=posted)
+            for score, posted, job_id in candidates[:FEED_SIZE]
+        )
+
+    with transaction.atomic():
+        ApplicantFeedItem.objects.filter(applicant_id__in=applicant_ids).delete()
+        ApplicantFeedItem.objects.bulk_create(items, batch_size=1000)
+    return len(items)
+
+
+def rebuild_applicant_feed(applicant_id):
+    return rebuild_applicant_feeds([applicant_id])
+
+
+def rebuild_all_feeds():
+    """
+    Rebuild every applicant's terms and feed. Returns the number of feeds rebuilt.
+    """
+    jobs = recent_jobs()
+    applicant_ids = list(Applicant.objects.order_by("applicant_id").values_list("applicant_id", flat=True))
+    for start in range(0, len(applicant_ids), FEED_BATCH_SIZE):
+        rebuild_applicant_feeds(applicant_ids[start:start + FEED_BATCH_SIZE], jobs=jobs)
+    return len(applicant_ids)
+
+
+def feed_queryset(applicant_id):
+    """
+    The applicant's feed, best first, with each job's recruiter and company joined.
+    """
+    return (
+        ApplicantFeedItem.objects.filter(applicant_id=applicant_id)
+        .select_related("job_id__recruiter_id__company_id")
+        .order_by(*FEED_ORDERING)
+    )
+
+
+@receiver(post_save, sender=Job)
+def fan_out_new_job(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        run_after_commit(fan_out_job, instance.job_id)
+
+
+@receiver(jobs_bulk_created)
+def fan_out_bulk_created_jobs(sender, jobs, **kwargs):
+    run_after_commit(fan_out_jobs, tuple(job.job_id for job in jobs))
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=WorkExperience)
+@receiver(post_delete, sender=WorkExperience)
+def rebuild_feed_on_profile_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        run_after_commit(rebuild_applicant_feed, instance.applicant_id_id)
+
+
+@receiver(pre_save, sender=User)
+def remember_applicant_city(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or instance.user_role != "APPLICANT":
+        return
+    instance._feed_previous_city = User.objects.filter(user_id=instance.user_id).values_list("user_city", flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def rebuild_feed_on_city_change(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created or not hasattr(instance, "_feed_previous_city"):
+        return
+    if instance._feed_previous_city != instance.user_city:
+        run_after_commit(rebuild_applicant_feed, instance.user_id)
+    del instance._feed_previous_city
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_save, sender=Bookmark)
+def drop_seen_feed_item(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        ApplicantFeedItem.objects.filter(applicant_id=instance.applicant_id_id, job_id=instance.job_id_id).delete()
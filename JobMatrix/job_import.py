@@ -0,0 +1,215 @@
+"""
+Bulk job import.
+
+Recruiters upload postings as CSV (a header row naming the columns below) or
+NDJSON (one JSON object per line). The upload is read as a stream of lines,
+never loaded whole; rows are validated with JobImportSerializer in chunks of
+JOB_IMPORT_CHUNK_SIZE, and each chunk's valid rows go in with one bulk_create
+in their own transaction. A bad row does not stop the import: it is left out
+and reported with its row number, and rows already inserted stay inserted.
+
+bulk_create sends no post_save, so each chunk sends jobs_bulk_created (see
+JobMatrix/signals.py) for the search index, feeds, dashboard metrics and
+company stats.
+"""
+import codecs
+import csv
+import json
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Max
+from rest_framework.exceptions import ValidationError
+
+from JobMatrix.models import Job, Recruiter
+from JobMatrix.signals import jobs_bulk_created
+
+logger = logging.getLogger(__name__)
+
+JOB_IMPORT_CHUNK_SIZE = getattr(settings, "JOB_IMPORT_CHUNK_SIZE", 1000)
+JOB_IMPORT_MAX_ROWS = getattr(settings, "JOB_IMPORT_MAX_ROWS", 50000)
+JOB_IMPORT_MAX_ERRORS = getattr(settings, "JOB_IMPORT_MAX_ERRORS", 1000)  # errors listed in the report
+
+IMPORT_FIELDS = ("job_title", "job_description", "job_location", "job_salary")
+CSV = "csv"
+NDJSON = "ndjson"
+
+FORMATS_BY_CONTENT_TYPE = {
+    "text/csv": CSV,
+    "application/csv": CSV,
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+    "application/x-jsonlines": NDJSON,
+}
+FORMATS_BY_EXTENSION = {
+    ".csv": CSV,
+    ".ndjson": NDJSON,
+    ".jsonl": NDJSON,
+}
+
+
+class ImportFormatError(Exception):
+    """
+    The upload as a whole cannot be read (unknown format, missing CSV columns, not UTF-8).
+    """
+
+
+def detect_format(content_type=None, file_name=None, requested=None):
+    if requested:
+        requested = requested.lower()
+        if requested not in (CSV, NDJSON):
+            raise ImportFormatError(f"Unsupported file_format '{requested}', use csv or ndjson")
+        return requested
+    if file_name:
+        for extension, file_format in FORMATS_BY_EXTENSION.items():
+            if file_name.lower().endswith(extension):
+                return file_format
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in FORMATS_BY_CONTENT_TYPE:
+        return FORMATS_BY_CONTENT_TYPE[content_type]
+    raise ImportFormatError("Upload a .csv or .ndjson file, or send text/csv or application/x-ndjson")
+
+
+def read_rows(stream, file_format):
+    """
+    Yield (row number, row dict or error message) for each row of a binary line stream.
+    """
+    lines = codecs.iterdecode(stream, "utf-8-sig")
+    try:
+        if file_format == CSV:
+            yield from _csv_rows(lines)
+        else:
+            yield from _ndjson_rows(lines)
+    except UnicodeDecodeError:
+        raise ImportFormatError("The file is not UTF-8 encoded")
+    except csv.Error as e:
+        raise ImportFormatError(f"Unreadable CSV: {str(e)}")
+
+
+def _csv_rows(lines):
+    reader = csv.DictReader(lines)
+    header = reader.fieldnames or []
+    missing = [field for field in IMPORT_FIELDS if field not in header]
+    if missing:
+        raise ImportFormatError(f"Missing CSV columns: {', '.join(missing)}")
+    for number, row in enumerate(reader, 1):
+        if None in row:
+            yield number, "More values than columns"
+            continue
+        yield number, {field: row[field] for field in IMPORT_FIELDS}
+
+
+def _ndjson_rows(lines):
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {str(e)}"
+            continue
+        if not isinstance(row, dict):
+            yield number, "Each line must be a JSON object"
+            continue
+        yield number, row
+
+
+def _insert(jobs):
+    """
+    bulk_create the jobs (all of one recruiter) and set their primary keys. Must run in a transaction.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        Job.objects.bulk_create(jobs)
+        return
+    # MySQL returns no keys from a multi-row INSERT; the auto-increment ids it hands
+    # out follow the row order, so read back the recruiter's rows past the old maximum.
+    # Locking the recruiter until commit keeps any other insert of their jobs (another
+    # import, or a single post, whose foreign key check waits on the lock) out of that range
+    Recruiter.objects.select_for_update().filter(recruiter_id=jobs[0].recruiter_id_id).exists()
+    last_id = Job.objects.aggregate(last_id=Max("job_id"))["last_id"] or 0
+    Job.objects.bulk_create(jobs)
+    job_ids = (
+        Job.objects.filter(recruiter_id=jobs[0].recruiter_id_id, job_id__gt=last_id)
+        .order_by("job_id").values_list("job_id", flat=True)[:len(jobs)]
+    )
+    for job, job_id in zip(jobs, job_ids):
+        job.job_id = job_id
+
+
+class JobImport:
+    """
+    One upload being imported for a recruiter. run() returns the report.
+    """
+
+    def __init__(self, recruiter_id, chunk_size=JOB_IMPORT_CHUNK_SIZE, max_rows=JOB_IMPORT_MAX_ROWS):
+        self.recruiter_id = recruiter_id
+        self.chunk_size = chunk_size
+        self.max_rows = max_rows
+        self.rows = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < JOB_IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def run(self, rows):
+        chunk = []
+        for number, row in rows:
+            if number > self.max_rows:
+                self.error(number, f"Only the first {self.max_rows} rows of a file are imported")
+                break
+            self.rows += 1
+            if isinstance(row, str):
+                self.error(number, row)
+                continue
+            chunk.append((number, row))
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+        return self.report()
+
+    def import_chunk(self, chunk):
+        from Job.serializers import JobImportSerializer
+
+        # One serializer validates the whole chunk, so its fields are built once
+        validator = JobImportSerializer()
+        jobs, numbers = [], []
+        for number, row in chunk:
+            try:
+                data = validator.run_validation(row)
+            except ValidationError as e:
+                self.error(number, e.detail)
+                continue
+            jobs.append(Job(recruiter_id_id=self.recruiter_id, **data))
+            numbers.append(number)
+        if not jobs:
+            return
+
+        try:
+            with transaction.atomic():
+                _insert(jobs)
+                jobs_bulk_created.send(sender=Job, jobs=jobs)
+        except DatabaseError as e:
+            logger.error(f"Error importing {len(jobs)} jobs for recruiter {self.recruiter_id}: {str(e)}")
+            for number in numbers:
+                self.error(number, "Could not be saved")
+            return
+        self.created += len(jobs)
+
+    def report(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+            "errors_truncated": self.failed > len(self.errors),
+        }
@@ -0,0 +1,61 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from JobMatrix.auth_backend import JWTAuthentication
+from JobMatrix.models import User
+
+
+class Command(BaseCommand):
+    help = "Measure queries and wall time per page of the admin users list (/jobmatrix/admin/users/all/)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--pages", type=int, default=3, help="Number of pages to request")
+        parser.add_argument("--repeat", type=int, default=5, help="Requests per page")
+        parser.add_argument("--role", choices=["APPLICANT", "RECRUITER", "ADMIN"], help="Filter by user_role")
+        parser.add_argument("--max-queries", type=int,
+                            help="Fail if any page issues more queries than this")
+
+    def handle(self, *args, **options):
+        admin = User.objects.filter(user_role="ADMIN").first()
+        if admin is None:
+            raise CommandError("An ADMIN user is required to call the admin users endpoint")
+
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {JWTAuthentication.generate_jwt(admin)}",
+                        HTTP_HOST="localhost")
+        params = {"page_size": options["page_size"]}
+        if options["role"]:
+            params["user_role"] = options["role"]
+
+        worst_queries = 0
+        for page in range(1, options["pages"] + 1):
+            params["page"] = page
+            timings = []
+            for _ in range(options["repeat"]):
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = client.get("/jobmatrix/admin/users/all/", params)
+                    timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code == 404:
+                    break
+                if response.status_code != 200:
+                    raise CommandError(f"Page {page} returned HTTP {response.status_code}")
+            if response.status_code == 404:
+                self.stdout.write(f"page {page}: past the last page, stopping")
+                break
+
+            rows = len(response.json().get("results", []))
+            worst_queries = max(worst_queries, len(queries))
+            self.stdout.write(
+                f"page {page}: {rows} users, {len(queries)} queries, "
+                f"median {statistics.median(timings):.1f} ms, max {max(timings):.1f} ms"
+            )
+
+        if options["max_queries"] is not None and worst_queries > options["max_queries"]:
+            raise CommandError(f"Query budget exceeded: {worst_queries} > {options['max_queries']}")
+        self.stdout.write(self.style.SUCCESS(f"Worst page: {worst_queries} queries"))
@@ -0,0 +1,76 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from JobMatrix.benchmarks import (
+    BENCHMARKS, compare_results, pick_users, results_document, run_benchmarks, write_results,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure p50/p95/p99 latency, queries per request and throughput of the main endpoints against "
+        "the configured (seeded) database and write the results as JSON (see JobMatrix/benchmarks.py)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per endpoint first")
+        parser.add_argument("--only", action="append", dest="keys", metavar="BENCHMARK",
+                            help="Only run this benchmark (repeatable)")
+        parser.add_argument("--password", default="jobmatrix123",
+                            help="Password of the benchmarked applicant, for the login benchmark")
+        parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON results")
+        parser.add_argument("--compare", metavar="BASELINE_JSON",
+                            help="Fail if any endpoint regressed against these earlier results")
+        parser.add_argument("--tolerance", type=float, default=20,
+                            help="Allowed p95 latency growth over the baseline, in percent")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 2:
+            raise CommandError("--requests must be at least 2")
+        unknown = set(options["keys"] or ()) - {benchmark.key for benchmark in BENCHMARKS}
+        if unknown:
+            raise CommandError(f"Unknown benchmark: {', '.join(sorted(unknown))}")
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"]) as handle:
+                    baseline = json.load(handle)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {options['compare']}: {exc}")
+
+        users = pick_users(options["password"])
+        if users["applicant"] is None:
+            raise CommandError("No applications in the database; seed it first with seed_jobmatrix")
+
+        endpoints = {}
+        for benchmark, result in run_benchmarks(users, options["requests"], options["warmup"], options["keys"]):
+            endpoints[benchmark.key] = result
+            if result is None:
+                self.stdout.write(self.style.WARNING(f"{benchmark.key:16} skipped: no {benchmark.user} user"))
+                continue
+            latency = result["latency_ms"]
+            line = (
+                f"{benchmark.key:16} p50 {latency['p50']:7.1f}  p95 {latency['p95']:7.1f}  "
+                f"p99 {latency['p99']:7.1f} ms  {result['queries']['mean']:5.1f} queries  "
+                f"{result['throughput_rps']:7.1f} req/s"
+            )
+            if result["status"] >= 400:
+                self.stdout.write(self.style.ERROR(f"{line}  HTTP {result['status']}"))
+            else:
+                self.stdout.write(line)
+
+        document = results_document(endpoints, options["requests"], options["warmup"])
+        write_results(document, options["output"])
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if baseline is not None:
+            regressions = compare_results(baseline, document, options["tolerance"] / 100)
+            for key, reason in regressions:
+                self.stdout.write(self.style.ERROR(f"{key}: {reason}"))
+            if regressions:
+                raise CommandError(f"{len(regressions)} regression(s) against {options['compare']}")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Benchmarked {len(endpoints)} endpoints"))
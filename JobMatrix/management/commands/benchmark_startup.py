@@ -0,0 +1,42 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Imports the settings and loads the WSGI application, like a gunicorn worker booting
+BOOT_SCRIPT = "import config.wsgi"
+
+
+class Command(BaseCommand):
+    help = "Measure cold-start time (settings import + WSGI application load) in fresh subprocesses"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--timeout", type=float, default=120, help="Seconds before a boot counts as hung")
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings"))
+        cwd = str(settings.BASE_DIR)
+
+        timings = []
+        for run in range(1, options["runs"] + 1):
+            started = time.perf_counter()
+            try:
+                result = subprocess.run([sys.executable, "-c", BOOT_SCRIPT], cwd=cwd, env=env,
+                                        capture_output=True, text=True, timeout=options["timeout"])
+            except subprocess.TimeoutExpired:
+                raise CommandError(f"Boot {run} did not finish within {options['timeout']}s")
+            elapsed = (time.perf_counter() - started) * 1000
+            if result.returncode != 0:
+                raise CommandError(f"Boot {run} failed:\n{result.stderr}")
+            timings.append(elapsed)
+            self.stdout.write(f"boot {run}: {elapsed:.0f} ms")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"median {statistics.median(timings):.0f} ms, min {min(timings):.0f} ms, max {max(timings):.0f} ms "
+            f"(USE_S3_STORAGE={settings.USE_S3_STORAGE})"
+        ))
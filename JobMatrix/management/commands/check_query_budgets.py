@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from JobMatrix.query_budgets import QUERY_BUDGETS, build_dataset, missing_budgets, run_checks
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every endpoint against a seeded throwaway database and fail if any issues more SQL "
+        "queries than its budget in JobMatrix/query_budgets.py "
+        "(run with --settings=config.test_settings to use SQLite without S3)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", action="append", dest="names", metavar="URL_NAME",
+                            help="Only check this URL name (repeatable)")
+        parser.add_argument("--show-queries", action="store_true",
+                            help="Print the SQL of every check that fails")
+        parser.add_argument("--keepdb", action="store_true",
+                            help="Reuse the test database if it exists (it is re-seeded either way)")
+
+    def handle(self, *args, **options):
+        names = options["names"]
+        unknown = set(names or ()) - {check.name for check in QUERY_BUDGETS}
+        if unknown:
+            raise CommandError(f"No query budget for: {', '.join(sorted(unknown))}")
+
+        # Never seed or write into the configured database itself
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options["keepdb"], serialize=False)
+        try:
+            failures = self.check_budgets(names, options["show_queries"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+
+        if failures:
+            raise CommandError(f"{len(failures)} endpoint(s) failed their query budget: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All endpoints are within their query budgets"))
+
+    def check_budgets(self, names, show_queries):
+        failures = []
+        if not names:
+            for name in missing_budgets():
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"{name}: no query budget"))
+
+        self.stdout.write("Seeding the dataset...")
+        dataset = build_dataset()
+
+        for check, response, queries in run_checks(dataset, names):
+            label = f"{check.method.upper():6} {check.name}"
+            problems = []
+            if response.status_code != check.expect:
+                problems.append(f"HTTP {response.status_code}, expected {check.expect}")
+            if len(queries) > check.budget:
+                problems.append(f"over budget by {len(queries) - check.budget}")
+
+            line = f"{label:45} {len(queries):4} / {check.budget:<4} queries"
+            if not problems:
+                self.stdout.write(line)
+                continue
+            failures.append(check.name)
+            self.stdout.write(self.style.ERROR(f"{line}  {'; '.join(problems)}"))
+            if show_queries:
+                for query in queries:
+                    self.stdout.write(f"    {query['sql']}")
+        return failures
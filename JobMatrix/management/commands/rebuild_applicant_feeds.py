@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from JobMatrix.feed import rebuild_all_feeds, rebuild_applicant_feeds
+
+
+class Command(BaseCommand):
+    help = "Rebuild applicant profile terms and home feeds from the current profiles and recent jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--applicant", type=int, action="append", dest="applicant_ids",
+                            help="Only rebuild this applicant's feed (repeatable)")
+
+    def handle(self, *args, **options):
+        if options["applicant_ids"]:
+            items = rebuild_applicant_feeds(options["applicant_ids"])
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt {len(options['applicant_ids'])} feeds ({items} items)"
+            ))
+            return
+        count = rebuild_all_feeds()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} applicant feeds"))
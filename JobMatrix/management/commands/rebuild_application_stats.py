@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from JobMatrix.application_stats import rebuild_application_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-job application counters from the APPLICATION table"
+
+    def handle(self, *args, **options):
+        count = rebuild_application_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt application counters for {count} jobs"))
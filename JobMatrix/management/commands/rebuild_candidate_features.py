@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from JobMatrix.candidate_ranking import rebuild_candidate_features
+
+
+class Command(BaseCommand):
+    help = "Recompute the candidate ranking features of every applicant from their skills, education and work experience"
+
+    def handle(self, *args, **options):
+        count = rebuild_candidate_features()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt ranking features for {count} applicants"))
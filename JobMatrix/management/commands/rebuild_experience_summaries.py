@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from JobMatrix.experience import rebuild_experience_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the work experience summary of every applicant from the WORK_EXPERIENCE table"
+
+    def handle(self, *args, **options):
+        count = rebuild_experience_summaries()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt experience summaries for {count} applicants"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from JobMatrix.search import reindex_all, uses_fulltext
+
+
+class Command(BaseCommand):
+    help = "Rebuild the job search index from the JOB and COMPANY tables"
+
+    def handle(self, *args, **options):
+        count = reindex_all()
+        backend = "MySQL FULLTEXT" if uses_fulltext() else "inverted term index"
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} jobs ({backend})"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from JobMatrix.dashboard_metrics import reconcile_dashboard_metrics
+
+
+class Command(BaseCommand):
+    help = "Rebuild the admin dashboard metrics (DASHBOARD_METRIC) from the source tables"
+
+    def handle(self, *args, **options):
+        count = reconcile_dashboard_metrics()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} dashboard metrics"))
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from JobMatrix.seeding import SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-insert synthetic companies, recruiters, applicants (with skills, education and work experience), "
+        "jobs, applications and bookmarks for load testing, then rebuild the derived tables "
+        "(see JobMatrix/seeding.py)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--companies", type=int, default=50)
+        parser.add_argument("--recruiters-per-company", type=int, default=3,
+                            help="The first is active, the rest are past recruiters")
+        parser.add_argument("--applicants", type=int, default=2000)
+        parser.add_argument("--jobs", type=int, default=5000)
+        parser.add_argument("--applications", type=int, default=50000)
+        parser.add_argument("--bookmarks", type=int, default=10000)
+        parser.add_argument("--skills-per-applicant", type=int, default=5, help="Average")
+        parser.add_argument("--educations-per-applicant", type=int, default=2, help="Average")
+        parser.add_argument("--experiences-per-applicant", type=int, default=3, help="Average")
+        parser.add_argument("--skew", type=float, default=1.1,
+                            help="Power-law exponent of applications per job (higher concentrates them on fewer jobs)")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per INSERT")
+        parser.add_argument("--seed", type=int, help="Random seed, for a reproducible shape of data")
+        parser.add_argument("--password", default="jobmatrix123", help="Password of every seeded user")
+        parser.add_argument("--skip-feeds", action="store_true",
+                            help="Do not build the new applicants' home feeds (slowest step on large runs)")
+
+    def handle(self, *args, **options):
+        if options["companies"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--companies and --batch-size must be at least 1")
+        if len(options["password"]) < 8:
+            raise CommandError("--password must be at least 8 characters")
+
+        generator = SyntheticDataGenerator(
+            companies=options["companies"],
+            recruiters_per_company=options["recruiters_per_company"],
+            applicants=options["applicants"],
+            jobs=options["jobs"],
+            applications=options["applications"],
+            bookmarks=options["bookmarks"],
+            skills_per_applicant=options["skills_per_applicant"],
+            educations_per_applicant=options["educations_per_applicant"],
+            experiences_per_applicant=options["experiences_per_applicant"],
+            skew=options["skew"],
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+            password=options["password"],
+            rebuild_feeds=not options["skip_feeds"],
+            log=self.stdout.write,
+        )
+        started = time.perf_counter()
+        created = generator.run()
+        elapsed = time.perf_counter() - started
+
+        summary = ", ".join(f"{count} {name}" for name, count in created.items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded {summary} in {elapsed:.1f}s (run tag {generator.tag})"))
@@ -0,0 +1,121 @@
+"""
+Media URL service.
+
+With S3 and AWS_QUERYSTRING_AUTH enabled every media URL is a presigned GET
+valid for AWS_QUERYSTRING_EXPIRE seconds. Signing is cheap but not free, and
+the same photos, resumes and company logos appear on page after page, so each
+signed URL is cached until MEDIA_URL_REFRESH_MARGIN seconds before it expires.
+
+Without S3 (or with querystring auth off) keys map to plain bucket URLs, as
+get_full_url always did.
+
+List serializers that set Meta.media_fields and use MediaPrefetchListSerializer
+resolve every key on the page in one pass before the items are serialized, so
+the per-item get_full_url() calls only read the cache.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models
+from rest_framework import serializers
+
+from JobMatrix.caching import TTLCache
+from JobMatrix.storage_backends import get_s3_client
+
+logger = logging.getLogger(__name__)
+
+MEDIA_URL_REFRESH_MARGIN = getattr(settings, "MEDIA_URL_REFRESH_MARGIN", 3600)
+
+_signed_url_cache = TTLCache(
+    maxsize=getattr(settings, "MEDIA_URL_CACHE_SIZE", 20000),
+    ttl=max(int(getattr(settings, "AWS_QUERYSTRING_EXPIRE", 0) or 0) - MEDIA_URL_REFRESH_MARGIN, 0),
+)
+
+
+def signs_urls():
+    return bool(settings.USE_S3_STORAGE and getattr(settings, "AWS_QUERYSTRING_AUTH", False))
+
+
+def public_url(key):
+    return f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.{settings.AWS_S3_REGION_NAME}.amazonaws.com/{key}"
+
+
+def sign_url(key):
+    return get_s3_client().generate_presigned_url(
+        "get_object",
+        Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": key},
+        ExpiresIn=int(settings.AWS_QUERYSTRING_EXPIRE),
+    )
+
+
+def resolve_media_urls(keys):
+    """
+    Returns {key: url} for the given object keys, signing only the ones not already cached.
+    """
+    keys = {key.lstrip("/") for key in keys if key}
+    if not signs_urls():
+        return {key: public_url(key) for key in keys}
+
+    urls = {}
+    for key in keys:
+        url = _signed_url_cache.get(key)
+        if url is None:
+            try:
+                url = sign_url(key)
+            except Exception as e:
+                logger.error(f"Error signing URL for {key}: {str(e)}")
+                url = public_url(key)
+            else:
+                if _signed_url_cache.ttl > 0:
+                    _signed_url_cache.set(key, url)
+        urls[key] = url
+    return urls
+
+
+def resolve_media_url(key):
+    if not key:
+        return None
+    key = key.lstrip("/")
+    return resolve_media_urls([key])[key]
+
+
+def media_url_epoch():
+    """
+    A number that changes at least as often as a signed URL handed out now can expire,
+    for validators (ETags) of responses that contain media URLs. Always 0 without signing.
+    """
+    if not signs_urls():
+        return 0
+    # A cached URL has at least MEDIA_URL_REFRESH_MARGIN seconds left, a fresh one the full expiry
+    window = MEDIA_URL_REFRESH_MARGIN if _signed_url_cache.ttl > 0 else int(settings.AWS_QUERYSTRING_EXPIRE)
+    return int(time.time() // window) if window > 0 else 0
+
+
+def media_key(instance, path):
+    """
+    Object key of the file at a dotted attribute path (e.g. "applicant_id.applicant_resume"), or None.
+    """
+    value = instance
+    try:
+        for attr in path.split("."):
+            value = getattr(value, attr)
+            if value is None:
+                return None
+    except ObjectDoesNotExist:
+        return None
+    return getattr(value, "name", None) or (str(value) if value else None)
+
+
+class MediaPrefetchListSerializer(serializers.ListSerializer):
+    """
+    Resolves every media key on the page (child Meta.media_fields) in one pass before serializing.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        paths = getattr(self.child.Meta, "media_fields", ())
+        if paths:
+            resolve_media_urls(key for item in items for path in paths if (key := media_key(item, path)))
+        return super().to_representation(items)
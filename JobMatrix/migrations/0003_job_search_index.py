@@ -0,0 +1,60 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def add_fulltext_indexes(apps, schema_editor):
+    # FULLTEXT is MySQL-only; other databases use the JOB_SEARCH_TERM inverted index
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        "ALTER TABLE JOB_SEARCH_DOCUMENT "
+        "ADD FULLTEXT INDEX job_search_title_ft (document_title), "
+        "ADD FULLTEXT INDEX job_search_all_ft (document_title, document_body, document_location, document_company)"
+    )
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        "ALTER TABLE JOB_SEARCH_DOCUMENT DROP INDEX job_search_title_ft, DROP INDEX job_search_all_ft"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobMatrix', '0002_s3_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchDocument',
+            fields=[
+                ('job_id', models.OneToOneField(db_column='job_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='JobMatrix.job')),
+                ('document_title', models.CharField(db_column='document_title', max_length=255)),
+                ('document_body', models.TextField(db_column='document_body')),
+                ('document_location', models.CharField(db_column='document_location', max_length=255)),
+                ('document_company', models.CharField(db_column='document_company', max_length=255)),
+            ],
+            options={
+                'db_table': 'JOB_SEARCH_DOCUMENT',
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSearchTerm',
+            fields=[
+                ('search_term_id', models.AutoField(db_column='search_term_id', primary_key=True, serialize=False)),
+                ('search_term', models.CharField(db_column='search_term', max_length=64)),
+                ('search_term_weight', models.PositiveIntegerField(db_column='search_term_weight', default=1)),
+                ('job_id', models.ForeignKey(db_column='job_id', on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='JobMatrix.job')),
+            ],
+            options={
+                'db_table': 'JOB_SEARCH_TERM',
+                'constraints': [models.UniqueConstraint(fields=('search_term', 'job_id'), name='unique_job_search_term')],
+            },
+        ),
+        migrations.RunPython(add_fulltext_indexes, drop_fulltext_indexes),
+    ]
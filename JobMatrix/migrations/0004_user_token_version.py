@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobMatrix', '0003_job_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='user_token_version',
+            field=models.PositiveIntegerField(db_column='user_token_version', default=0),
+        ),
+    ]
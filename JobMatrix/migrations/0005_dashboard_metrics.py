@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobMatrix', '0004_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardMetric',
+            fields=[
+                ('metric_id', models.AutoField(db_column='metric_id', primary_key=True, serialize=False)),
+                ('metric_group', models.CharField(db_column='metric_group', max_length=50)),
+                ('metric_key', models.CharField(db_column='metric_key', max_length=100)),
+                ('metric_value', models.BigIntegerField(db_column='metric_value', default=0)),
+            ],
+            options={
+                'db_table': 'DASHBOARD_METRIC',
+                'constraints': [models.UniqueConstraint(fields=('metric_group', 'metric_key'), name='unique_dashboard_metric')],
+            },
+        ),
+    ]
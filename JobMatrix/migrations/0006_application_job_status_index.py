@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobMatrix', '0005_dashboard_metrics'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job_id', 'application_status'], name='idx_application_job_status'),
+        ),
+    ]
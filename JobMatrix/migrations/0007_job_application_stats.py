@@ -0,0 +1,49 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def build_application_stats(apps, schema_editor):
+    # Same computation as JobMatrix.application_stats.rebuild_application_stats()
+    Application = apps.get_model('JobMatrix', 'Application')
+    JobApplicationStats = apps.get_model('JobMatrix', 'JobApplicationStats')
+    rows = (
+        Application.objects.values('job_id')
+        .annotate(
+            stats_total=Count('application_id'),
+            stats_pending=Count('application_id', filter=Q(application_status='PENDING')),
+            stats_approved=Count('application_id', filter=Q(application_status='APPROVED')),
+            stats_rejected=Count('application_id', filter=Q(application_status='REJECTED')),
+        )
+        .order_by()
+    )
+    JobApplicationStats.objects.bulk_create(
+        [JobApplicationStats(job_id_id=row.pop('job_id'), **row) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobMatrix', '0006_application_job_status_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobApplicationStats',
+            fields=[
+                ('job_id', models.OneToOneField(db_column='job_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='application_stats', serialize=False, to='JobMatrix.job')),
+                ('stats_total', models.IntegerField(db_column='stats_total', default=0)),
+                ('stats_pending', models.IntegerField(db_column='stats_pending', default=0)),
+                ('stats_approved', models.IntegerField(db_column='stats_approved', default=0)),
+                ('stats_rejected', models.IntegerField(db_column='stats_rejected', default=0)),
+            ],
+            options={
+                'db_table': 'JOB_APPLICATION_STATS',
+            },
+        ),
+        migrations.RunPython(build_application_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobMatrix', '0007_job_application_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicantFeedItem',
+            fields=[
+                ('feed_item_id', models.AutoField(db_column='feed_item_id', primary_key=True, serialize=False)),
+                ('feed_score', models.PositiveIntegerField(db_column='feed_score')),
+                ('feed_posted', models.DateTimeField(db_column='feed_posted')),
+                ('applicant_id', models.ForeignKey(db_column='applicant_id', on_delete=django.db.models.deletion.CASCADE, related_name='feed_items', to='JobMatrix.applicant')),
+                ('job_id', models.ForeignKey(db_column='job_id', on_delete=django.db.models.deletion.CASCADE, related_name='feed_items', to='JobMatrix.job')),
+            ],
+            options={
+                'db_table': 'APPLICANT_FEED_ITEM',
+                'indexes': [models.Index(fields=['applicant_id', '-feed_score', '-feed_posted', '-feed_item_id'], name='idx_feed_applicant_rank')],
+                'constraints': [models.UniqueConstraint(fields=('applicant_id', 'job_id'), name='unique_applicant_feed_job')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ApplicantFeedTerm',
+            fields=[
+                ('feed_term_id', models.AutoField(db_column='feed_term_id', primary_key=True, serialize=False)),
+                ('feed_term', models.CharField(db_column='feed_term', max_length=64)),
+                ('feed_term_weight', models.PositiveIntegerField(db_column='feed_term_weight', default=1)),
+                ('applicant_id', models.ForeignKey(db_column='applicant_id', on_delete=django.db.models.deletion.CASCADE, related_name='feed_terms', to='JobMatrix.applicant')),
+            ],
+            options={
+                'db_table': 'APPLICANT_FEED_TERM',
+                'constraints': [models.UniqueConstraint(fields=('feed_term', 'applicant_id'), name='unique_applicant_feed_term')],
+            },
+        ),
+    ]
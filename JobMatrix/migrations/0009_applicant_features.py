@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobMatrix', '0008_applicant_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicantFeatures',
+            fields=[
+                ('applicant_id', models.OneToOneField(db_column='applicant_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking_features', serialize=False, to='JobMatrix.applicant')),
+                ('features_skills', models.JSONField(db_column='features_skills', default=dict)),
+                ('features_experience_months', models.PositiveIntegerField(db_column='features_experience_months', default=0)),
+                ('features_degree_level', models.PositiveSmallIntegerField(db_column='features_degree_level', default=0)),
+                ('features_gpa', models.DecimalField(blank=True, db_column='features_gpa', decimal_places=2, max_digits=3, null=True)),
+                ('features_updated', models.DateTimeField(auto_now=True, db_column='features_updated')),
+            ],
+            options={
+                'db_table': 'APPLICANT_FEATURES',
+            },
+        ),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:01
+
+import calendar
+from collections import defaultdict
+from datetime import date
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Copies of the JobMatrix.experience helpers as of this migration, so later changes there do not change it
+
+def calendar_duration(start, end):
+    if start > end:
+        return 0, 0, 0
+
+    years = end.year - start.year
+    if (end.month, end.day) < (start.month, start.day):
+        years -= 1
+
+    months = end.month - start.month
+    if months < 0:
+        months += 12
+    if end.day < start.day:
+        months = (months - 1) % 12
+
+    if end.day >= start.day:
+        days = end.day - start.day
+    else:
+        comparison_day = min(start.day, calendar.monthrange(end.year, end.month)[1])
+        days = end.day + (comparison_day - start.day)
+    return years, months, days
+
+
+def merge_periods(periods):
+    closed = []
+    current_start = current_end = None
+    for start, end in sorted(periods, key=lambda period: period[0]):
+        if end is not None and end <= start:
+            continue
+        if current_start is not None and (current_end is None or start <= current_end):
+            if current_end is not None:
+                current_end = None if end is None else max(current_end, end)
+            continue
+        if current_start is not None:
+            closed.append((current_start, current_end))
+        current_start, current_end = start, end
+    if current_start is not None and current_end is not None:
+        closed.append((current_start, current_end))
+        current_start = None
+    return closed, current_start
+
+
+def add_durations(durations):
+    years = sum(duration[0] for duration in durations)
+    months = sum(duration[1] for duration in durations)
+    days = sum(duration[2] for duration in durations)
+    months += days // 30
+    years += months // 12
+    return years, months % 12, days % 30
+
+
+def build_experience_summaries(apps, schema_editor):
+    # Same computation as JobMatrix.experience.rebuild_experience_summaries()
+    WorkExperience = apps.get_model('JobMatrix', 'WorkExperience')
+    ApplicantExperienceSummary = apps.get_model('JobMatrix', 'ApplicantExperienceSummary')
+    today = date.today()
+    roles = defaultdict(list)
+    rows = WorkExperience.objects.values_list(
+        'applicant_id', 'work_experience_id', 'work_experience_start_date', 'work_experience_end_date'
+    )
+    for applicant_id, work_experience_id, start, end in rows.iterator(chunk_size=2000):
+        roles[applicant_id].append((work_experience_id, start, end))
+
+    summaries = []
+    for applicant_id, applicant_roles in roles.items():
+        closed, ongoing_since = merge_periods([(start, end) for _, start, end in applicant_roles])
+        summaries.append(ApplicantExperienceSummary(
+            applicant_id_id=applicant_id,
+            summary_closed_days=sum((end - start).days for start, end in closed),
+            summary_closed_duration=list(add_durations([calendar_duration(start, end) for start, end in closed])),
+            summary_ongoing_since=ongoing_since,
+            summary_roles={str(role_id): list(calendar_duration(start, end or today)) for role_id, start, end in applicant_roles},
+            summary_as_of=today,
+        ))
+    ApplicantExperienceSummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobMatrix', '0009_applicant_features'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicantExperienceSummary',
+            fields=[
+                ('applicant_id', models.OneToOneField(db_column='applicant_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='experience_summary', serialize=False, to='JobMatrix.applicant')),
+                ('summary_closed_days', models.PositiveIntegerField(db_column='summary_closed_days', default=0)),
+                ('summary_closed_duration', models.JSONField(db_column='summary_closed_duration', default=list)),
+                ('summary_ongoing_since', models.DateField(blank=True, db_column='summary_ongoing_since', null=True)),
+                ('summary_roles', models.JSONField(db_column='summary_roles', default=dict)),
+                ('summary_as_of', models.DateField(db_column='summary_as_of')),
+            ],
+            options={
+                'db_table': 'APPLICANT_EXPERIENCE_SUMMARY',
+            },
+        ),
+        migrations.RemoveField(
+            model_name='applicantfeatures',
+            name='features_experience_months',
+        ),
+        migrations.RunPython(build_experience_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobMatrix', '0010_applicant_experience_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceVersion',
+            fields=[
+                ('version_key', models.CharField(db_column='version_key', max_length=100, primary_key=True, serialize=False)),
+                ('version_number', models.PositiveBigIntegerField(db_column='version_number', default=0)),
+            ],
+            options={
+                'db_table': 'RESOURCE_VERSION',
+            },
+        ),
+    ]
@@ -36,6 +36,8 @@ class User(models.Model):
     user_role = models.CharField(max_length=20, choices=ROLE_CHOICES, db_column='user_role')
     user_profile_photo = models.FileField(storage=MediaStorage(), upload_to=user_profile_photo_upload_to, blank=True, null=True, db_column='user_profile_photo', max_length=255)
     user_created_date = models.DateTimeField(auto_now_add=True, db_column='user_created_date')
+    # Bumped to revoke every token issued so far (role/password change, recruiter deactivation)
+    user_token_version = models.PositiveIntegerField(default=0, db_column='user_token_version')
 
     REQUIRED_FIELDS = ["user_first_name", "user_last_name", "user_email", "user_role", "user_password"]
     USERNAME_FIELD = "user_email"
@@ -161,6 +163,10 @@ class Application(models.Model):
 
     class Meta:
         db_table = "APPLICATION"
+        indexes = [
+            # Per-job status counts (JobMatrix/application_stats.py) and status-filtered applicant lists
+            models.Index(fields=["job_id", "application_status"], name="idx_application_job_status")
+        ]
 
 
 # ================================================
@@ -257,7 +263,160 @@ class PasswordResetToken(models.Model):
         return timezone.now() > self.expires_at
 
 
+# ================================================
+# JOB SEARCH INDEX MODELS
+# ================================================
+class JobSearchDocument(models.Model):
+    """Denormalized searchable text for a job (carries the FULLTEXT indexes on MySQL)."""
+    job_id = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name="search_document", db_column="job_id")
+    document_title = models.CharField(max_length=255, db_column='document_title')
+    document_body = models.TextField(db_column='document_body')
+    document_location = models.CharField(max_length=255, db_column='document_location')
+    document_company = models.CharField(max_length=255, db_column='document_company')
+
+    class Meta:
+        db_table = "JOB_SEARCH_DOCUMENT"
+
+
+class JobSearchTerm(models.Model):
+    """Inverted index entry (term -> job) used where FULLTEXT is not available."""
+    search_term_id = models.AutoField(primary_key=True, db_column='search_term_id')
+    search_term = models.CharField(max_length=64, db_column='search_term')
+    job_id = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="search_terms", db_column='job_id')
+    search_term_weight = models.PositiveIntegerField(default=1, db_column='search_term_weight')
+
+    class Meta:
+        db_table = "JOB_SEARCH_TERM"
+        constraints = [
+            models.UniqueConstraint(fields=["search_term", "job_id"], name="unique_job_search_term")
+        ]
+
+
+
+# ================================================
+# DASHBOARD METRICS MODEL
+# ================================================
+class DashboardMetric(models.Model):
+    """
+    Precomputed admin dashboard counter. Totals use metric_key as the counter name,
+    per-industry job counts use the industry, daily "new" counters use the ISO date.
+    """
+    metric_id = models.AutoField(primary_key=True, db_column='metric_id')
+    metric_group = models.CharField(max_length=50, db_column='metric_group')
+    metric_key = models.CharField(max_length=100, db_column='metric_key')
+    metric_value = models.BigIntegerField(default=0, db_column='metric_value')
+
+    class Meta:
+        db_table = "DASHBOARD_METRIC"
+        constraints = [
+            models.UniqueConstraint(fields=["metric_group", "metric_key"], name="unique_dashboard_metric")
+        ]
+
+
+# ================================================
+# JOB APPLICATION STATS MODEL
+# ================================================
+class JobApplicationStats(models.Model):
+    """
+    Denormalized application counters for a job, kept in step with APPLICATION
+    by JobMatrix/application_stats.py. A job without a row has no applications.
+    """
+    job_id = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name="application_stats", db_column="job_id")
+    stats_total = models.IntegerField(default=0, db_column='stats_total')
+    stats_pending = models.IntegerField(default=0, db_column='stats_pending')
+    stats_approved = models.IntegerField(default=0, db_column='stats_approved')
+    stats_rejected = models.IntegerField(default=0, db_column='stats_rejected')
+
+    class Meta:
+        db_table = "JOB_APPLICATION_STATS"
+
+
+# ================================================
+# APPLICANT FEED MODELS
+# ================================================
+class ApplicantFeedTerm(models.Model):
+    """Profile term (skill, past job title, city) -> applicant, used to find who a new job matches."""
+    feed_term_id = models.AutoField(primary_key=True, db_column='feed_term_id')
+    feed_term = models.CharField(max_length=64, db_column='feed_term')
+    applicant_id = models.ForeignKey(Applicant, on_delete=models.CASCADE, related_name="feed_terms", db_column='applicant_id')
+    feed_term_weight = models.PositiveIntegerField(default=1, db_column='feed_term_weight')
+
+    class Meta:
+        db_table = "APPLICANT_FEED_TERM"
+        constraints = [
+            models.UniqueConstraint(fields=["feed_term", "applicant_id"], name="unique_applicant_feed_term")
+        ]
+
+
+class ApplicantFeedItem(models.Model):
+    """A job in an applicant's home feed (capped per applicant, best matches first)."""
+    feed_item_id = models.AutoField(primary_key=True, db_column='feed_item_id')
+    applicant_id = models.ForeignKey(Applicant, on_delete=models.CASCADE, related_name="feed_items", db_column='applicant_id')
+    job_id = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="feed_items", db_column='job_id')
+    feed_score = models.PositiveIntegerField(db_column='feed_score')
+    feed_posted = models.DateTimeField(db_column='feed_posted')
+
+    class Meta:
+        db_table = "APPLICANT_FEED_ITEM"
+        constraints = [
+            models.UniqueConstraint(fields=["applicant_id", "job_id"], name="unique_applicant_feed_job")
+        ]
+        indexes = [
+            # The feed page is one range read of this index
+            models.Index(fields=["applicant_id", "-feed_score", "-feed_posted", "-feed_item_id"], name="idx_feed_applicant_rank")
+        ]
+
+
+# ================================================
+# APPLICANT FEATURES MODEL
+# ================================================
+class ApplicantFeatures(models.Model):
+    """
+    An applicant's profile reduced to what candidate ranking scores, kept in step
+    with SKILL, EDUCATION and WORK_EXPERIENCE by JobMatrix/candidate_ranking.py.
+    """
+    applicant_id = models.OneToOneField(Applicant, on_delete=models.CASCADE, primary_key=True, related_name="ranking_features", db_column="applicant_id")
+    features_skills = models.JSONField(default=dict, db_column='features_skills')  # {normalized skill: years}
+    features_degree_level = models.PositiveSmallIntegerField(default=0, db_column='features_degree_level')
+    features_gpa = models.DecimalField(max_digits=3, decimal_places=2, blank=True, null=True, db_column='features_gpa')
+    features_updated = models.DateTimeField(auto_now=True, db_column='features_updated')
+
+    class Meta:
+        db_table = "APPLICANT_FEATURES"
+
 
+# ================================================
+# APPLICANT EXPERIENCE SUMMARY MODEL
+# ================================================
+class ApplicantExperienceSummary(models.Model):
+    """
+    Work experience totals of an applicant, kept in step with WORK_EXPERIENCE by
+    JobMatrix/experience.py. An applicant without a row has no work experience.
+    """
+    applicant_id = models.OneToOneField(Applicant, on_delete=models.CASCADE, primary_key=True, related_name="experience_summary", db_column="applicant_id")
+    summary_closed_days = models.PositiveIntegerField(default=0, db_column='summary_closed_days')  # merged periods that have ended
+    summary_closed_duration = models.JSONField(default=list, db_column='summary_closed_duration')  # those periods as [years, months, days]
+    summary_ongoing_since = models.DateField(blank=True, null=True, db_column='summary_ongoing_since')  # merged period still ongoing
+    summary_roles = models.JSONField(default=dict, db_column='summary_roles')  # {work_experience_id: [years, months, days]}
+    summary_as_of = models.DateField(db_column='summary_as_of')
+
+    class Meta:
+        db_table = "APPLICANT_EXPERIENCE_SUMMARY"
+
+
+# ================================================
+# RESOURCE VERSION MODEL
+# ================================================
+class ResourceVersion(models.Model):
+    """
+    Change counter of a cacheable resource (e.g. "applicant-profile:42"), bumped by
+    JobMatrix/conditional.py whenever the resource changes and used to build its ETag.
+    """
+    version_key = models.CharField(max_length=100, primary_key=True, db_column='version_key')
+    version_number = models.PositiveBigIntegerField(default=0, db_column='version_number')
+
+    class Meta:
+        db_table = "RESOURCE_VERSION"
 
 # Add at the bottom of the file after all models
 @receiver(post_save, sender=Company)
@@ -0,0 +1,180 @@
+import base64
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    Views declare the ordering that identifies a row, e.g.
+    keyset_ordering = ('-job_date_posted', '-job_id'), or implement
+    get_keyset_ordering() to turn it off for some requests.
+
+    Requests with `pagination=cursor` (first page) or `cursor=<token>` seek past the
+    last row of the previous page instead of using OFFSET, so every page costs the
+    same as the first one. COUNT(*) is skipped in this mode unless the client asks
+    for it with `include_count=true`, in which case a briefly cached count is used.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    count_query_param = 'include_count'
+    count_cache_timeout = 60  # seconds
+
+    use_keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = self.get_keyset_ordering(view)
+        self.use_keyset = bool(ordering) and self.keyset_requested(request)
+        if not self.use_keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        direction, values = self.decode_cursor(request, queryset, ordering)
+
+        self.total_count = None
+        if request.query_params.get(self.count_query_param, '').lower() == 'true':
+            self.total_count = self.get_cached_count(queryset)
+
+        fields = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+        if values is not None:
+            queryset = queryset.filter(self.seek_filter(fields, values, backwards=direction == 'previous'))
+
+        if direction == 'previous':
+            # Walk backwards from the cursor, then flip the rows back into display order
+            order = [name[1:] if name.startswith('-') else f"-{name}" for name in ordering]
+        else:
+            order = list(ordering)
+
+        rows = list(queryset.order_by(*order)[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if direction == 'previous':
+            rows.reverse()
+            self.has_next_page = True
+            self.has_previous_page = has_more
+        else:
+            self.has_next_page = has_more
+            self.has_previous_page = values is not None
+
+        self.field_names = [name for name, _ in fields]
+        self.page_rows = rows
+        return rows
+
+    def get_keyset_ordering(self, view):
+        if view is None:
+            return None
+        if hasattr(view, 'get_keyset_ordering'):
+            return view.get_keyset_ordering()
+        return getattr(view, 'keyset_ordering', None)
+
+    def keyset_requested(self, request):
+        return (request.query_params.get(self.mode_query_param) == 'cursor'
+                or self.cursor_query_param in request.query_params)
+
+    def seek_filter(self, fields, values, backwards=False):
+        """
+        Lexicographic "comes after" condition for (field1, field2, ...) > (v1, v2, ...),
+        honouring each field's sort direction.
+        """
+        condition = Q()
+        for index, (name, descending) in enumerate(fields):
+            lookup = 'lt' if descending != backwards else 'gt'
+            clause = Q(**{f"{name}__{lookup}": values[index]})
+            for previous_index in range(index):
+                clause &= Q(**{fields[previous_index][0]: values[previous_index]})
+            condition |= clause
+        return condition
+
+    def encode_cursor(self, direction, row):
+        values = []
+        for name in self.field_names:
+            value = getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = json.dumps([direction, values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request, queryset, ordering):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return 'next', None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            direction, raw_values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            if direction not in ('next', 'previous') or len(raw_values) != len(ordering):
+                raise ValueError
+            model_fields = [queryset.model._meta.get_field(name.lstrip('-')) for name in ordering]
+            values = [field.to_python(value) for field, value in zip(model_fields, raw_values)]
+        except Exception:
+            raise NotFound("Invalid cursor")
+        return direction, values
+
+    def get_cached_count(self, queryset):
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        key = "keyset-count:" + hashlib.md5(f"{sql}|{params}".encode()).hexdigest()
+        return cache.get_or_set(key, queryset.count, self.count_cache_timeout)
+
+    def get_next_link(self):
+        if not self.use_keyset:
+            return super().get_next_link()
+        if not self.has_next_page or not self.page_rows:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor('next', self.page_rows[-1]))
+
+    def get_previous_link(self):
+        if not self.use_keyset:
+            return super().get_previous_link()
+        if not self.has_previous_page or not self.page_rows:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor('previous', self.page_rows[0]))
+
+    def get_page_metadata(self):
+        """
+        Pagination fields shared by the listing envelopes
+        (total_count, next, previous, current_page, total_pages).
+        """
+        if self.use_keyset:
+            page_size = self.get_page_size(self.request)
+            total_count = self.total_count
+            return {
+                'total_count': total_count,
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'current_page': None,
+                'total_pages': (total_count + page_size - 1) // page_size if total_count is not None else None,
+            }
+
+        count = self.page.paginator.count
+        page_size = self.page.paginator.per_page
+        return {
+            'total_count': count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'current_page': self.page.number,
+            'total_pages': (count + page_size - 1) // page_size if page_size > 0 else 0,
+        }
+
+    def get_paginated_response(self, data):
+        if not self.use_keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'count': self.total_count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
@@ -0,0 +1,285 @@
+"""
+Per-request performance instrumentation.
+
+PerformanceMiddleware measures every request:
+
+  * SQL queries and time spent in them, through a database execute_wrapper;
+  * S3 API calls and time spent in them, through botocore's before-call /
+    after-call events on the S3 clients (the shared client and the storage
+    backend's);
+  * total time in Django.
+
+The numbers are aggregated per URL name into histograms, readable by admins
+at /jobmatrix/admin/perf/. Aggregates are per process and reset on restart,
+or on DELETE to the same endpoint. With DEBUG they also go out as a
+Server-Timing header (visible in the browser's network panel); it is off
+otherwise because it tells any client how long the database took.
+
+Streaming responses get the header with what was measured before the first
+byte; their aggregates include the whole stream.
+
+Set PERF_INSTRUMENTATION = False to turn all of it off, or
+PERF_SERVER_TIMING = True to send the header outside DEBUG.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+PERF_INSTRUMENTATION = getattr(settings, "PERF_INSTRUMENTATION", True)
+PERF_SERVER_TIMING = getattr(settings, "PERF_SERVER_TIMING", settings.DEBUG)
+
+# Histogram bucket upper bounds; values above the last one land in "+Inf"
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_current = ContextVar("jobmatrix_perf_request", default=None)
+
+
+class RequestStats:
+    __slots__ = ("started", "queries", "db_time", "s3_calls", "s3_time")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.s3_calls = 0
+        self.s3_time = 0.0
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f's3;dur={self.s3_time * 1000:.1f};desc="{self.s3_calls} calls"',
+            f"total;dur={self.elapsed() * 1000:.1f}",
+        ])
+
+
+def current_stats():
+    """
+    Stats of the request being handled on this thread, or None.
+    """
+    return _current.get()
+
+
+# ---------------- Database ---------------- #
+
+def _count_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def instrument_connections():
+    # Connection objects are per thread; the wrapper stays installed and is a
+    # no-op outside requests
+    for connection in connections.all():
+        if _count_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(_count_query)
+
+
+# ---------------- S3 ---------------- #
+
+def _before_s3_call(context=None, **kwargs):
+    if context is not None and _current.get() is not None:
+        context["jobmatrix_perf_started"] = time.perf_counter()
+    # Returning anything but None would short-circuit the API call
+
+
+def _after_s3_call(context=None, **kwargs):
+    stats = _current.get()
+    started = context.get("jobmatrix_perf_started") if context is not None else None
+    if stats is None or started is None:
+        return
+    stats.s3_calls += 1
+    stats.s3_time += time.perf_counter() - started
+
+
+def instrument_s3_client(client):
+    """
+    Count and time the API calls made with a boto3 S3 client (idempotent).
+    """
+    if not PERF_INSTRUMENTATION or getattr(client, "_jobmatrix_perf", False):
+        return client
+    events = client.meta.events
+    events.register("before-call.s3", _before_s3_call)
+    events.register("after-call.s3", _after_s3_call)
+    events.register("after-call-error.s3", _after_s3_call)
+    client._jobmatrix_perf = True
+    return client
+
+
+# ---------------- Aggregates ---------------- #
+
+def _bucket_index(bounds, value):
+    for index, bound in enumerate(bounds):
+        if value <= bound:
+            return index
+    return len(bounds)
+
+
+def _bucket_labels(bounds):
+    return [f"<={bound}" for bound in bounds] + ["+Inf"]
+
+
+def histogram_quantile(bounds, counts, maximum, q):
+    """
+    Upper bound of the bucket holding the q-quantile (the observed maximum for the last bucket).
+    """
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    cumulative = 0
+    for index, count in enumerate(counts):
+        cumulative += count
+        if cumulative >= rank:
+            return min(bounds[index], maximum) if index < len(bounds) else maximum
+    return maximum
+
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.query_counts = [0] * (len(QUERY_BUCKETS) + 1)
+        self.queries_total = 0
+        self.queries_max = 0
+        self.db_total = 0.0
+        self.s3_calls_total = 0
+        self.s3_calls_max = 0
+        self.s3_total = 0.0
+
+    def add(self, stats, elapsed_ms, status_code):
+        self.requests += 1
+        if status_code >= 500:
+            self.errors += 1
+        self.latency_counts[_bucket_index(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.latency_total += elapsed_ms
+        self.latency_max = max(self.latency_max, elapsed_ms)
+        self.query_counts[_bucket_index(QUERY_BUCKETS, stats.queries)] += 1
+        self.queries_total += stats.queries
+        self.queries_max = max(self.queries_max, stats.queries)
+        self.db_total += stats.db_time * 1000
+        self.s3_calls_total += stats.s3_calls
+        self.s3_calls_max = max(self.s3_calls_max, stats.s3_calls)
+        self.s3_total += stats.s3_time * 1000
+
+    def snapshot(self):
+        n = self.requests
+
+        def quantiles(bounds, counts, maximum):
+            return {f"p{int(q * 100)}": histogram_quantile(bounds, counts, maximum, q) for q in (0.5, 0.95, 0.99)}
+
+        return {
+            "requests": n,
+            "errors": self.errors,
+            "latency_ms": {
+                "mean": round(self.latency_total / n, 1),
+                "max": round(self.latency_max, 1),
+                **quantiles(LATENCY_BUCKETS_MS, self.latency_counts, round(self.latency_max, 1)),
+                "histogram": dict(zip(_bucket_labels(LATENCY_BUCKETS_MS), self.latency_counts)),
+            },
+            "queries": {
+                "mean": round(self.queries_total / n, 1),
+                "max": self.queries_max,
+                **quantiles(QUERY_BUCKETS, self.query_counts, self.queries_max),
+                "histogram": dict(zip(_bucket_labels(QUERY_BUCKETS), self.query_counts)),
+            },
+            "db_ms": {"mean": round(self.db_total / n, 1)},
+            "s3_calls": {"mean": round(self.s3_calls_total / n, 2), "max": self.s3_calls_max},
+            "s3_ms": {"mean": round(self.s3_total / n, 1)},
+        }
+
+
+class PerfRegistry:
+    """
+    Per-process aggregates keyed by URL name.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+            self.since = time.time()
+
+    def record(self, name, stats, elapsed_ms, status_code):
+        with self._lock:
+            endpoint = self._endpoints.get(name)
+            if endpoint is None:
+                endpoint = self._endpoints[name] = EndpointStats()
+            endpoint.add(stats, elapsed_ms, status_code)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: endpoint.snapshot()
+                for name, endpoint in sorted(self._endpoints.items(), key=lambda item: -item[1].latency_total)
+            }
+
+
+registry = PerfRegistry()
+
+
+# ---------------- Middleware ---------------- #
+
+def _endpoint_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    return match.view_name or match.route
+
+
+class PerformanceMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not PERF_INSTRUMENTATION:
+            return self.get_response(request)
+
+        instrument_connections()
+        stats = RequestStats()
+        _current.set(stats)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            _current.set(None)
+            raise
+
+        if PERF_SERVER_TIMING:
+            response["Server-Timing"] = stats.server_timing()
+
+        if response.streaming:
+            response.streaming_content = self._finish_stream(response.streaming_content, request, stats, response.status_code)
+        else:
+            self._finish(request, stats, response.status_code)
+        return response
+
+    def _finish(self, request, stats, status_code):
+        _current.set(None)
+        registry.record(_endpoint_name(request), stats, stats.elapsed() * 1000, status_code)
+
+    def _finish_stream(self, content, request, stats, status_code):
+        # Keep counting while the body is generated, then record the whole request
+        _current.set(stats)
+        try:
+            yield from content
+        finally:
+            self._finish(request, stats, status_code)
@@ -72,11 +72,10 @@ class IsActiveRecruiter(BasePermission):
             if request.user.user_role != 'RECRUITER':
                 return False
 
-            # Check if recruiter is active
-            return Recruiter.objects.filter(
-                recruiter_id=request.user,
-                recruiter_is_active=True
-            ).exists()
+            # Check if recruiter is active (answered from the cached principal, no query)
+            return request.user.recruiter.recruiter_is_active
+        except Recruiter.DoesNotExist:
+            return False
         except Exception as e:
             print(f"Permission error: {str(e)}")
             return False
@@ -98,7 +97,7 @@ class IsCompanyRecruiter(BasePermission):
         # For listing jobs by company_id, check if the recruiter belongs to that company
         company_id = view.kwargs.get('company_id')
         if company_id:
-            return request.user.recruiter.company_id.company_id == int(company_id)
+            return request.user.recruiter.company_id_id == int(company_id)
 
         return True
 
@@ -0,0 +1,277 @@
+"""
+Cached identity of the authenticated user.
+
+JWTAuthentication used to load the full USER row on every request, and the
+permission classes then hit APPLICANT / RECRUITER again. A Principal holds the
+few columns those checks need and is loaded with a single query, then cached:
+
+  1. in a per-process LRU for a few seconds (PRINCIPAL_LOCAL_CACHE_TTL), and
+  2. optionally in a shared Django cache (PRINCIPAL_CACHE_ALIAS, for
+     PRINCIPAL_CACHE_TTL), so a worker that misses locally can usually skip
+     the database as well.
+
+Saves and deletes of User / Applicant / Recruiter invalidate the shared tier and
+the local tier of the process that made the change, once the change commits (so
+a concurrent request cannot cache the old row again). Other processes only
+forget their local copy when it expires, which is why its TTL is kept short: for
+that long they still accept tokens revoked elsewhere.
+
+Tokens carry only the user id and token version (see JWTAuthentication.generate_jwt);
+role and company always come from the principal.
+Role and password changes, and recruiter deactivation or company moves, bump
+user_token_version, which revokes every token issued before the change.
+
+request.user is an AuthenticatedUser: it answers user_id, user_role and the
+applicant / recruiter relations from the principal, and only loads the real
+User row when any other attribute is touched.
+"""
+import logging
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from django.db.models import F
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils.functional import SimpleLazyObject
+
+from JobMatrix.caching import TTLCache
+from JobMatrix.models import User, Applicant, Recruiter
+
+logger = logging.getLogger(__name__)
+
+Principal = namedtuple("Principal", [
+    "user_id",
+    "user_role",
+    "is_applicant",
+    "is_recruiter",
+    "company_id",
+    "recruiter_is_active",
+    "token_version",
+])
+
+PRINCIPAL_LOCAL_CACHE_TTL = getattr(settings, "PRINCIPAL_LOCAL_CACHE_TTL", 5)
+PRINCIPAL_CACHE_TTL = getattr(settings, "PRINCIPAL_CACHE_TTL", 60)
+PRINCIPAL_CACHE_SIZE = getattr(settings, "PRINCIPAL_CACHE_SIZE", 10000)
+PRINCIPAL_CACHE_ALIAS = getattr(settings, "PRINCIPAL_CACHE_ALIAS", None)
+
+_local_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_LOCAL_CACHE_TTL)
+
+
+def _cache_key(user_id):
+    return f"principal:{user_id}"
+
+
+def _shared_cache():
+    return caches[PRINCIPAL_CACHE_ALIAS] if PRINCIPAL_CACHE_ALIAS else None
+
+
+def load_principal(user_id):
+    """
+    Read a Principal straight from the database (one query), or None if the user does not exist.
+    """
+    row = User.objects.filter(user_id=user_id).values(
+        "user_id",
+        "user_role",
+        "applicant__applicant_id",
+        "recruiter__recruiter_id",
+        "recruiter__company_id",
+        "recruiter__recruiter_is_active",
+        "user_token_version",
+    ).first()
+    if row is None:
+        return None
+    return Principal(
+        user_id=row["user_id"],
+        user_role=row["user_role"],
+        is_applicant=row["applicant__applicant_id"] is not None,
+        is_recruiter=row["recruiter__recruiter_id"] is not None,
+        company_id=row["recruiter__company_id"],
+        recruiter_is_active=bool(row["recruiter__recruiter_is_active"]),
+        token_version=row["user_token_version"],
+    )
+
+
+def get_principal(user_id):
+    key = _cache_key(user_id)
+    principal = _local_cache.get(key)
+    if principal is not None:
+        return principal
+
+    shared = _shared_cache()
+    if shared is not None:
+        try:
+            cached = shared.get(key)
+            principal = Principal(*cached) if cached is not None else None
+        except Exception as e:
+            # Unreachable backend, or an entry written with a different Principal layout
+            logger.error(f"Error reading principal cache: {str(e)}")
+            principal = None
+        if principal is not None:
+            _local_cache.set(key, principal)
+            return principal
+
+    principal = load_principal(user_id)
+    if principal is not None:
+        _local_cache.set(key, principal)
+        if shared is not None:
+            try:
+                shared.set(key, tuple(principal), PRINCIPAL_CACHE_TTL)
+            except Exception as e:
+                logger.error(f"Error writing principal cache: {str(e)}")
+    return principal
+
+
+def revoke_tokens(user_id):
+    """
+    Invalidate every token issued to the user so far.
+    """
+    User.objects.filter(user_id=user_id).update(user_token_version=F("user_token_version") + 1)
+    invalidate_principal(user_id)
+
+
+def invalidate_principal(user_id):
+    """
+    Forget the cached principal once the current transaction commits (immediately in autocommit).
+    """
+    transaction.on_commit(lambda: _forget_principal(user_id))
+
+
+def _forget_principal(user_id):
+    key = _cache_key(user_id)
+    _local_cache.delete(key)
+    shared = _shared_cache()
+    if shared is not None:
+        try:
+            shared.delete(key)
+        except Exception as e:
+            logger.error(f"Error invalidating principal cache: {str(e)}")
+
+
+class AuthenticatedUser(SimpleLazyObject):
+    """
+    Lazy stand-in for the authenticated User, backed by a Principal.
+    """
+
+    def __init__(self, principal):
+        super().__init__(lambda: User.objects.get(user_id=principal.user_id))
+        self.__dict__["principal"] = principal
+
+    @property
+    def __class__(self):
+        return User
+
+    def __bool__(self):
+        return True
+
+    is_authenticated = True
+    is_anonymous = False
+
+    @property
+    def user_id(self):
+        return self.principal.user_id
+
+    pk = user_id
+
+    @property
+    def user_role(self):
+        return self.principal.user_role
+
+    @property
+    def applicant(self):
+        if not self.principal.is_applicant:
+            raise User.applicant.RelatedObjectDoesNotExist("User has no applicant.")
+        if "_applicant" not in self.__dict__:
+            self.__dict__["_applicant"] = self._profile(Applicant, ["applicant_id_id"], [self.user_id])
+        return self.__dict__["_applicant"]
+
+    @property
+    def recruiter(self):
+        if not self.principal.is_recruiter:
+            raise User.recruiter.RelatedObjectDoesNotExist("User has no recruiter.")
+        if "_recruiter" not in self.__dict__:
+            self.__dict__["_recruiter"] = self._profile(
+                Recruiter,
+                ["recruiter_id_id", "company_id_id", "recruiter_is_active"],
+                [self.user_id, self.principal.company_id, self.principal.recruiter_is_active],
+            )
+        return self.__dict__["_recruiter"]
+
+    def _profile(self, model, field_names, values):
+        # A model instance with the remaining columns deferred; they load on first access
+        instance = model.from_db(router.db_for_read(model), field_names, values)
+        model._meta.pk.set_cached_value(instance, self)
+        return instance
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Applicant)
+@receiver(post_delete, sender=Applicant)
+@receiver(post_save, sender=Recruiter)
+@receiver(post_delete, sender=Recruiter)
+def invalidate_saved_principal(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+
+
+def _token_fields(instance):
+    # Only the loaded values: reading a deferred field here would cost a query
+    return instance.__dict__.get("user_role"), instance.__dict__.get("user_password")
+
+
+@receiver(post_init, sender=User)
+@receiver(post_save, sender=User)
+def remember_token_fields(sender, instance, **kwargs):
+    if isinstance(instance.__dict__.get("user_token_version"), F):
+        instance.user_token_version = instance._loaded_token_version
+    instance._loaded_token_fields = _token_fields(instance)
+
+
+@receiver(pre_save, sender=User)
+def bump_token_version(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    A role or password change revokes the user's existing tokens.
+    """
+    if raw or instance._state.adding:
+        return
+    current, loaded = _token_fields(instance), instance._loaded_token_fields
+    if all(value is None or value == before for value, before in zip(current, loaded)):
+        # Keep the stored version, which a revoke_tokens() since the instance was loaded may have bumped
+        if "user_token_version" in instance.__dict__:
+            instance._loaded_token_version = instance.user_token_version
+            instance.user_token_version = F("user_token_version")
+        return
+    # Possibly changed (or deferred when loaded): compare with the row
+    previous = User.objects.filter(user_id=instance.user_id).values(
+        "user_role", "user_password", "user_token_version"
+    ).first()
+    if previous is None:
+        return
+    if (previous["user_role"], previous["user_password"]) == (instance.user_role, instance.user_password):
+        return
+    # From the stored version, which a revoke_tokens() since the instance was loaded may have bumped
+    instance.user_token_version = previous["user_token_version"] + 1
+    if update_fields is not None and "user_token_version" not in update_fields:
+        User.objects.filter(user_id=instance.user_id).update(user_token_version=instance.user_token_version)
+
+
+@receiver(pre_save, sender=Recruiter)
+def revoke_tokens_on_recruiter_change(sender, instance, raw=False, **kwargs):
+    """
+    Deactivating a recruiter or moving them to another company revokes their tokens.
+    """
+    if raw or instance._state.adding:
+        return
+    previous = Recruiter.objects.filter(recruiter_id=instance.pk).values(
+        "recruiter_is_active", "company_id"
+    ).first()
+    if previous and (previous["recruiter_is_active"], previous["company_id"]) != (
+        instance.recruiter_is_active, instance.company_id_id
+    ):
+        revoke_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=Recruiter)
+def revoke_tokens_on_recruiter_delete(sender, instance, **kwargs):
+    revoke_tokens(instance.pk)
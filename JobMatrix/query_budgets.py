@@ -0,0 +1,531 @@
+"""
+SQL query budgets per endpoint.
+
+Every URL name in JobMatrix/urls.py, Job/urls.py and Profile/urls.py has at
+least one Check below: a representative request (as the role that normally
+makes it, one per method where a URL serves both reads and writes) and the
+most queries that request may issue against build_dataset(). Pages in
+the dataset are full, so a serializer that goes back to the database per row
+pushes a list endpoint well past its budget instead of hiding inside it.
+Likewise every delete that cascades has a second check, with the same budget,
+that first adds EXTRA_ROWS more child rows: a signal handler that costs a
+query per deleted row goes over it.
+
+Checks run with every cache cleared, so a budget is the cold-path cost. Write
+requests run in a transaction that is rolled back afterwards; their on-commit
+work (feed fan-out and other background tasks) is not part of the request and
+is not counted.
+
+`python manage.py check_query_budgets` runs every check against a throwaway
+test database and fails on any overrun, any request that does not return the
+expected status, and any URL name without a budget. When a change lowers a
+query count, lower the budget with it.
+"""
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import Client
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from JobMatrix.auth_backend import JWTAuthentication
+from JobMatrix.dashboard_metrics import reconcile_dashboard_metrics, reset_initialized
+from JobMatrix.models import (
+    User, Admin, Applicant, Recruiter, Company, Job, Application, Bookmark, DashboardMetric,
+    Skill, Education, WorkExperience, PasswordResetToken,
+)
+
+URLCONF_MODULES = ("JobMatrix.urls", "Job.urls", "Profile.urls")
+
+DATASET_PASSWORD = "budget-password"
+
+COMPANY_COUNT = 12
+APPLICANT_COUNT = 40
+JOB_COUNT = 90
+
+JOB_TITLES = [
+    "Python Developer", "Data Engineer", "Registered Nurse", "Backend Engineer",
+    "Accountant", "Product Designer", "DevOps Engineer", "Sales Manager",
+]
+JOB_LOCATIONS = ["Austin, TX", "Austin, TX", "Seattle, WA", "Remote", "New York, NY", "Chicago, IL"]
+CITIES = ["Austin", "Seattle", "Chicago", "Denver"]
+SKILLS = ["Python", "Django", "SQL", "AWS", "React", "Excel", "Nursing", "Figma"]
+STATUSES = ["PENDING", "APPROVED", "REJECTED"]
+
+# Child rows the second check of a cascading delete adds
+EXTRA_ROWS = 20
+
+
+# ---------------- Dataset ---------------- #
+
+def build_dataset():
+    """
+    Create the data the checks run against and return the objects they refer to.
+
+    Company 0 posts a third of the jobs and its first job has an application
+    from every applicant; applicant 0 has more applications and bookmarks than
+    fit on a page. Everything goes through save() so the derived tables (search
+    index, counters, feeds, dashboard metrics) are filled the normal way.
+    """
+    password = make_password(DATASET_PASSWORD)
+    # Built up front, as in production, so the writes below and in the checks keep it up to date
+    reconcile_dashboard_metrics()
+
+    admin_user = User.objects.create(
+        user_first_name="Ada", user_last_name="Admin", user_email="admin@budget.test",
+        user_password=password, user_role="ADMIN",
+    )
+    Admin.objects.create(admin_id=admin_user, admin_ssn="000-00-0000")
+
+    companies, recruiters = [], []
+    for c in range(COMPANY_COUNT):
+        company = Company.objects.create(
+            company_name=f"Company {c}",
+            company_industry=["Technology", "Healthcare", "Finance"][c % 3],
+            company_description=f"Company {c} builds things.",
+            company_image=f"companyimages/company{c}.png",
+            company_secret_key=password,
+        )
+        companies.append(company)
+        # One active recruiter per company, the others have moved on
+        for r in range(3 if c == 0 else 2):
+            user = User.objects.create(
+                user_first_name=f"Rita{c}{r}", user_last_name="Recruiter",
+                user_email=f"recruiter{c}-{r}@budget.test", user_password=password,
+                user_role="RECRUITER", user_profile_photo=f"profilephotos/recruiter{c}-{r}.png",
+            )
+            recruiters.append(Recruiter.objects.create(
+                recruiter_id=user, company_id=company, recruiter_is_active=(r == 0),
+                recruiter_start_date=date(2020, 1, 1) + timedelta(days=30 * r),
+                recruiter_end_date=None if r == 0 else date(2023, 1, 1),
+            ))
+
+    applicants = []
+    for a in range(APPLICANT_COUNT):
+        user = User.objects.create(
+            user_first_name=f"Alex{a}", user_last_name="Applicant",
+            user_email=f"applicant{a}@budget.test", user_password=password,
+            user_role="APPLICANT", user_city=CITIES[a % len(CITIES)],
+            user_profile_photo=f"profilephotos/applicant{a}.png",
+        )
+        applicant = Applicant.objects.create(applicant_id=user, applicant_resume=f"resumes/applicant{a}.pdf")
+        applicants.append(applicant)
+        for s in range(3):
+            Skill.objects.create(applicant_id=applicant, skill_name=SKILLS[(a + s) % len(SKILLS)],
+                                 skill_years_of_experience=(a + s) % 8)
+        for e in range(2):
+            Education.objects.create(
+                applicant_id=applicant, education_school_name=f"University {e}",
+                education_degree_type=["Bachelor", "Master"][e], education_major="Computer Science",
+                education_gpa=3.5, education_start_date=date(2008 + 4 * e, 9, 1),
+                education_end_date=date(2012 + 4 * e, 6, 1),
+            )
+        WorkExperience.objects.create(
+            applicant_id=applicant, work_experience_job_title=JOB_TITLES[a % len(JOB_TITLES)],
+            work_experience_company="Initech", work_experience_start_date=date(2014, 1, 1),
+            work_experience_end_date=date(2018, 6, 1),
+        )
+        WorkExperience.objects.create(
+            applicant_id=applicant, work_experience_job_title=f"Senior {JOB_TITLES[a % len(JOB_TITLES)]}",
+            work_experience_company="Globex", work_experience_start_date=date(2018, 7, 1),
+            work_experience_is_currently_working=True,
+        )
+
+    jobs = []
+    company_recruiters = {company.company_id: [r for r in recruiters if r.company_id_id == company.company_id]
+                          for company in companies}
+    for j in range(JOB_COUNT):
+        company = companies[0] if j % 3 == 0 else companies[j % COMPANY_COUNT]
+        posters = company_recruiters[company.company_id]
+        jobs.append(Job.objects.create(
+            job_title=JOB_TITLES[j % len(JOB_TITLES)],
+            job_description=f"{JOB_TITLES[j % len(JOB_TITLES)]} working with {SKILLS[j % len(SKILLS)]} and "
+                            f"{SKILLS[(j + 3) % len(SKILLS)]}. Opening #{j}.",
+            job_location=JOB_LOCATIONS[j % len(JOB_LOCATIONS)],
+            job_salary=40000 + 1500 * j,
+            recruiter_id=posters[j % len(posters)],
+        ))
+
+    company_jobs = [job for job in jobs if job.recruiter_id.company_id_id == companies[0].company_id]
+    for a, applicant in enumerate(applicants):
+        applied = {company_jobs[0].job_id}
+        Application.objects.create(applicant_id=applicant, job_id=company_jobs[0], application_status=STATUSES[a % 3])
+        for k in range(1 + (20 if a == 0 else a % 5)):
+            job = jobs[(a * 7 + k * 3 + 1) % JOB_COUNT]
+            if job.job_id in applied:
+                continue
+            applied.add(job.job_id)
+            Application.objects.create(applicant_id=applicant, job_id=job, application_status=STATUSES[(a + k) % 3])
+        bookmarked = 0
+        for job in reversed(jobs):
+            if bookmarked == (15 if a == 0 else 3):
+                break
+            if job.job_id not in applied:
+                Bookmark.objects.create(applicant_id=applicant, job_id=job)
+                bookmarked += 1
+
+    PasswordResetToken.objects.create(
+        email=applicants[0].applicant_id.user_email, token="123456",
+        expires_at=timezone.now() + timedelta(minutes=15),
+    )
+
+    recruiter = recruiters[0]
+    applicant = applicants[0]
+    return {
+        "admin": admin_user,
+        "recruiter": recruiter.recruiter_id,
+        "applicant": applicant.applicant_id,
+        "company": companies[0],
+        "other_company": companies[-1],
+        "job": company_jobs[0],
+        "own_job": next(job for job in jobs if job.recruiter_id_id == recruiter.recruiter_id_id),
+        "other_job": jobs[1],
+        "application": Application.objects.filter(job_id=company_jobs[0]).order_by("application_id").first(),
+        "own_application": Application.objects.filter(applicant_id=applicant).order_by("application_id").first(),
+        "bookmark": Bookmark.objects.filter(applicant_id=applicant).order_by("bookmark_id").first(),
+        "unseen_job": Job.objects.exclude(application__applicant_id=applicant)
+                                 .exclude(bookmark__applicant_id=applicant).order_by("job_id").first(),
+        "skill": Skill.objects.filter(applicant_id=applicant).order_by("skill_id").first(),
+        "education": Education.objects.filter(applicant_id=applicant).order_by("education_id").first(),
+        "work_experience": WorkExperience.objects.filter(applicant_id=applicant)
+                                                 .order_by("work_experience_id").first(),
+        "other_applicant": applicants[1].applicant_id,
+    }
+
+
+# ---------------- Checks ---------------- #
+
+class Check:
+    """
+    One request to a URL name and the most queries it may issue.
+
+    user names the dataset entry to authenticate as (None for anonymous).
+    kwargs, params, data and headers (GET only) may be callables taking the dataset.
+    revalidate sends the ETag of a first, uncounted response back in If-None-Match (GET only).
+    setup, a callable taking the dataset, runs uncounted in the check's transaction before the request.
+    """
+
+    def __init__(self, name, budget, method="get", user=None, kwargs=None, params=None, data=None,
+                 multipart=False, expect=200, headers=None, revalidate=False, setup=None):
+        self.name = name
+        self.budget = budget
+        self.method = method
+        self.user = user
+        self.kwargs = kwargs
+        self.params = params
+        self.data = data
+        self.multipart = multipart
+        self.expect = expect
+        self.headers = headers
+        self.revalidate = revalidate
+        self.setup = setup
+
+    def url(self, dataset):
+        return reverse(self.name, kwargs=_resolve(self.kwargs, dataset))
+
+    def request(self, client, dataset, headers=None):
+        url = self.url(dataset)
+        if self.method == "get":
+            return client.get(url, _resolve(self.params, dataset) or {}, headers=headers)
+        if self.method == "delete":
+            return client.delete(url)
+        data = _resolve(self.data, dataset)
+        if self.multipart and self.method == "post":
+            return client.post(url, data)
+        if self.multipart:
+            # Only post() encodes form data itself
+            return getattr(client, self.method)(url, encode_multipart(BOUNDARY, data), content_type=MULTIPART_CONTENT)
+        return getattr(client, self.method)(url, data, content_type="application/json")
+
+
+def _empty_dashboard_metrics():
+    DashboardMetric.objects.all().delete()
+    reset_initialized()
+
+
+def _more_applicants(jobs):
+    """
+    EXTRA_ROWS more applicants, each applying to and bookmarking one of the jobs in turn.
+    """
+    for n in range(EXTRA_ROWS):
+        user = User.objects.create(
+            user_first_name=f"Extra{n}", user_last_name="Applicant", user_email=f"extra{n}@budget.test",
+            user_password=DATASET_PASSWORD, user_role="APPLICANT", user_city=CITIES[n % len(CITIES)],
+        )
+        applicant = Applicant.objects.create(applicant_id=user)
+        job = jobs[n % len(jobs)]
+        Application.objects.create(applicant_id=applicant, job_id=job, application_status=STATUSES[n % 3])
+        Bookmark.objects.create(applicant_id=applicant, job_id=job)
+
+
+def _more_company_jobs(company):
+    recruiter = Recruiter.objects.filter(company_id=company, recruiter_is_active=True).first()
+    _more_applicants([
+        Job.objects.create(
+            job_title=JOB_TITLES[n % len(JOB_TITLES)], job_description=f"Extra opening #{n}.",
+            job_location=JOB_LOCATIONS[n % len(JOB_LOCATIONS)], job_salary=50000 + 1000 * n,
+            recruiter_id=recruiter,
+        )
+        for n in range(EXTRA_ROWS)
+    ])
+
+
+def _more_history(user):
+    applicant = Applicant.objects.get(applicant_id=user)
+    jobs = list(Job.objects.exclude(application__applicant_id=applicant).order_by("job_id")[:EXTRA_ROWS])
+    for n, job in enumerate(jobs):
+        Application.objects.create(applicant_id=applicant, job_id=job, application_status=STATUSES[n % 3])
+        Bookmark.objects.create(applicant_id=applicant, job_id=job)
+        Skill.objects.create(applicant_id=applicant, skill_name=f"Extra skill {n}", skill_years_of_experience=n % 8)
+        Education.objects.create(
+            applicant_id=applicant, education_school_name=f"College {n}", education_degree_type="Certificate",
+            education_major="Computer Science", education_gpa=3.0, education_start_date=date(2000 + n, 1, 1),
+            education_end_date=date(2000 + n, 6, 1),
+        )
+        WorkExperience.objects.create(
+            applicant_id=applicant, work_experience_job_title=JOB_TITLES[n % len(JOB_TITLES)],
+            work_experience_company=f"Contract {n}", work_experience_start_date=date(2000 + n, 1, 1),
+            work_experience_end_date=date(2000 + n, 12, 1),
+        )
+
+
+def _resolve(value, dataset):
+    return value(dataset) if callable(value) else value
+
+
+def _pk(key, attribute):
+    return lambda dataset: getattr(dataset[key], attribute)
+
+
+def _upload(name):
+    return SimpleUploadedFile(name, b"budget check", content_type="application/octet-stream")
+
+
+QUERY_BUDGETS = [
+    # ---- JobMatrix/urls.py ---- #
+    Check("login", 2, method="post", data=lambda d: {
+        "user_email": d["recruiter"].user_email, "user_password": DATASET_PASSWORD,
+    }),
+    Check("create-user", 11, method="post", expect=201, data=lambda d: {
+        "user_first_name": "New", "user_last_name": "Recruiter", "user_email": "new-recruiter@budget.test",
+        "user_password": DATASET_PASSWORD, "user_role": "RECRUITER", "create_company": "False",
+        "company_id": d["company"].company_id, "company_secret_key": DATASET_PASSWORD,
+        "recruiter_start_date": "2024-01-01",
+    }),
+    Check("get-users", 7, user="admin", params=lambda d: {"user_email": d["applicant"].user_email}),
+    Check("update-user", 7, method="put", user="applicant", kwargs=lambda d: {"pk": d["applicant"].user_id},
+          data=lambda d: {
+              "user_first_name": "Alex", "user_last_name": "Renamed", "user_email": d["applicant"].user_email,
+              "user_password": DATASET_PASSWORD, "user_role": "APPLICANT", "user_city": "Boston",
+          }),
+    Check("patch-user", 5, method="patch", user="applicant", kwargs=lambda d: {"pk": d["applicant"].user_id},
+          data={"user_city": "Boston"}),
+    Check("update-applicant-resume", 4, method="patch", user="applicant", multipart=True,
+          data=lambda d: {"applicant_resume": _upload("resume.pdf")}),
+    Check("recruiter-details-update", 5, method="patch", user="recruiter", data={"recruiter_is_active": False}),
+    Check("change-password", 6, method="post", user="applicant", data={
+        "current_password": DATASET_PASSWORD, "new_password": "changed-password",
+        "confirm_password": "changed-password",
+    }),
+    Check("company-list", 3, user="applicant"),
+    Check("company-list", 2, user="applicant", revalidate=True, expect=304),
+    Check("company-jobs-list", 9, user="recruiter"),
+    Check("company-update", 8, method="patch", user="recruiter", data={"company_description": "Updated."}),
+    Check("recruiter-company-stats", 3, user="recruiter"),
+    Check("admin-dashboard-insights", 2, user="admin"),
+    # Never built (fresh install): the first load rebuilds the table
+    Check("admin-dashboard-insights", 19, user="admin", setup=lambda d: _empty_dashboard_metrics()),
+    Check("admin-perf", 1, user="admin"),
+    Check("get-all-users-for-admin", 6, user="admin", params={"page_size": 50}),
+    Check("admin-user-delete", 30, method="delete", user="admin",
+          kwargs=lambda d: {"user_id": d["other_applicant"].user_id}),
+    Check("admin-user-delete", 30, method="delete", user="admin", setup=lambda d: _more_history(d["other_applicant"]),
+          kwargs=lambda d: {"user_id": d["other_applicant"].user_id}),
+    Check("admin-companies", 3, user="admin"),
+    Check("admin-company-delete", 36, method="delete", user="admin",
+          kwargs=lambda d: {"company_id": d["other_company"].company_id}),
+    Check("admin-company-delete", 36, method="delete", user="admin",
+          setup=lambda d: _more_company_jobs(d["other_company"]),
+          kwargs=lambda d: {"company_id": d["other_company"].company_id}),
+    Check("admin-job-delete", 16, method="delete", user="admin", kwargs=lambda d: {"job_id": d["other_job"].job_id}),
+    Check("admin-job-delete", 16, method="delete", user="admin", setup=lambda d: _more_applicants([d["other_job"]]),
+          kwargs=lambda d: {"job_id": d["other_job"].job_id}),
+    # An unknown address: the known-address path sends mail through SendGrid
+    Check("password_reset_request", 1, method="post", data={"email": "nobody@budget.test"}),
+    Check("verify_reset_code", 1, method="post", data=lambda d: {
+        "email": d["applicant"].user_email, "code": "123456",
+    }),
+    Check("reset_password", 7, method="post", data=lambda d: {
+        "email": d["applicant"].user_email, "code": "123456", "new_password": "reset-password",
+    }),
+    Check("test-s3", 1, user="admin"),
+    Check("check_broken_files", 1, user="admin"),
+
+    # ---- Job/urls.py ---- #
+    Check("create-job", 11, method="post", user="recruiter", expect=201, data=lambda d: {
+        "recruiter_id": d["recruiter"].user_id, "job_title": "Python Developer",
+        "job_description": "Django and SQL.", "job_location": "Austin, TX", "job_salary": "90000.00",
+    }),
+    Check("create-jobs", 48, method="post", user="recruiter", expect=201, data=[
+        {"job_title": f"Data Engineer {n}", "job_description": "Python and SQL.",
+         "job_location": "Remote", "job_salary": "95000.00"}
+        for n in range(5)
+    ]),
+    Check("import-jobs", 14, method="post", user="recruiter", expect=201, multipart=True, data=lambda d: {
+        "file": SimpleUploadedFile("jobs.csv", b"job_title,job_description,job_location,job_salary\n" + b"".join(
+            b"Data Engineer %d,Python and SQL.,Remote,95000.00\n" % n for n in range(5)
+        ), content_type="text/csv"),
+    }),
+    Check("jobs-list", 9, user="applicant"),
+    Check("jobs-list", 2, user="applicant", revalidate=True, expect=304),
+    Check("applicant-feed", 2, user="applicant"),
+    Check("recommended-jobs", 7, user="applicant"),
+    Check("job-update", 9, method="patch", user="recruiter", kwargs=lambda d: {"job_id": d["own_job"].job_id},
+          data={"job_salary": "123000.00"}),
+    # The job every applicant applied to; the cascade's signal handlers must not cost a query per row
+    Check("job-delete", 15, method="delete", user="recruiter", kwargs=lambda d: {"job_id": d["own_job"].job_id}),
+    Check("job-delete", 15, method="delete", user="recruiter", setup=lambda d: _more_applicants([d["own_job"]]),
+          kwargs=lambda d: {"job_id": d["own_job"].job_id}),
+    Check("bookmark-list-create", 2, user="applicant"),
+    Check("bookmark-list-create", 7, method="post", user="applicant", expect=201,
+          data=lambda d: {"job_id": d["unseen_job"].job_id}),
+    Check("bookmark-list", 5, user="applicant"),
+    Check("bookmark-list", 3, user="applicant", revalidate=True, expect=304),
+    Check("bookmark-detail", 4, method="delete", user="applicant",
+          kwargs=lambda d: {"bookmark_id": d["bookmark"].bookmark_id}),
+    Check("application-list-create", 2, user="applicant"),
+    Check("application-list-create", 11, method="post", user="applicant", expect=201,
+          data=lambda d: {"job_id": d["unseen_job"].job_id}),
+    Check("application-detail", 3, user="applicant",
+          kwargs=lambda d: {"application_id": d["own_application"].application_id}),
+    Check("user-applied-jobs", 3, user="applicant"),
+    Check("recruiter-applications-list", 4, user="recruiter"),
+    Check("recruiter-application-update", 10, method="patch", user="recruiter",
+          kwargs=lambda d: {"pk": d["application"].application_id},
+          data={"application_status": "APPROVED", "application_recruiter_comment": "Strong profile."}),
+    Check("job-applicants-list", 4, user="recruiter", kwargs=lambda d: {"job_id": d["job"].job_id}),
+    Check("job-applicants-list", 6, user="recruiter", kwargs=lambda d: {"job_id": d["job"].job_id},
+          params={"ordering": "match"}),
+    Check("job-application-stats", 5, user="recruiter", kwargs=lambda d: {"job_id": d["job"].job_id}),
+
+    # ---- Profile/urls.py ---- #
+    Check("applicant-profile", 6, user="recruiter", kwargs=lambda d: {"user_id": d["applicant"].user_id}),
+    Check("applicant-profile", 2, user="recruiter", kwargs=lambda d: {"user_id": d["applicant"].user_id},
+          revalidate=True, expect=304),
+    Check("create-work-experience", 5, method="post", user="applicant", expect=201, data=lambda d: {
+        "applicant_id": d["applicant"].user_id, "work_experience_job_title": "Data Engineer",
+        "work_experience_company": "Hooli", "work_experience_start_date": "2012-01-01",
+        "work_experience_end_date": "2013-12-31",
+    }),
+    Check("specific-user-work-experience", 5, user="applicant", kwargs=lambda d: {"user_id": d["applicant"].user_id}),
+    Check("specific-user-work-experience", 2, user="applicant", kwargs=lambda d: {"user_id": d["applicant"].user_id},
+          revalidate=True, expect=304),
+    Check("update-work-experience", 6, method="patch", user="applicant",
+          kwargs=lambda d: {"work_experience_id": d["work_experience"].work_experience_id},
+          data={"work_experience_summary": "Shipped the data platform.", "work_experience_start_date": "2014-01-01",
+                "work_experience_end_date": "2018-06-01"}),
+    Check("work-experience-delete", 6, method="delete", user="applicant",
+          kwargs=lambda d: {"work_experience_id": d["work_experience"].work_experience_id}),
+    Check("create-skill", 5, method="post", user="applicant", expect=201, data=lambda d: {
+        "applicant_id": d["applicant"].user_id, "skill_name": "Kubernetes", "skill_years_of_experience": 2,
+    }),
+    Check("applicant-skill-list", 5, user="applicant", kwargs=lambda d: {"applicant_id": d["applicant"].user_id}),
+    Check("applicant-skill-list", 2, user="applicant", kwargs=lambda d: {"applicant_id": d["applicant"].user_id},
+          revalidate=True, expect=304),
+    Check("applicant-skill-update", 6, method="patch", user="applicant",
+          kwargs=lambda d: {"skill_id": d["skill"].skill_id}, data={"skill_years_of_experience": 9}),
+    Check("applicant-skill-delete", 6, method="delete", user="applicant",
+          kwargs=lambda d: {"skill_id": d["skill"].skill_id}),
+    Check("applicant-education-create", 9, method="post", user="applicant", expect=201, data=lambda d: {
+        "applicant_id": d["applicant"].user_id, "education_school_name": "Night School",
+        "education_degree_type": "Certificate", "education_start_date": "2019-01-01",
+        "education_end_date": "2019-06-01",
+    }),
+    Check("applicant-education-list", 4, user="applicant", kwargs=lambda d: {"user_id": d["applicant"].user_id}),
+    Check("applicant-education-list", 2, user="applicant", kwargs=lambda d: {"user_id": d["applicant"].user_id},
+          revalidate=True, expect=304),
+    Check("education-update", 5, method="patch", user="applicant",
+          kwargs=lambda d: {"education_id": d["education"].education_id}, data={"education_gpa": "3.90"}),
+    Check("education-detail", 3, user="applicant", kwargs=lambda d: {"education_id": d["education"].education_id}),
+    Check("education-detail", 5, method="delete", user="applicant",
+          kwargs=lambda d: {"education_id": d["education"].education_id}),
+]
+
+
+# ---------------- Runner ---------------- #
+
+def url_names():
+    """
+    Every named URL in the checked URLconfs, in declaration order.
+    """
+    from importlib import import_module
+
+    names = []
+    for module in URLCONF_MODULES:
+        names.extend(pattern.name for pattern in import_module(module).urlpatterns if pattern.name)
+    return names
+
+
+def clear_caches():
+    from JobMatrix.media import _signed_url_cache
+    from JobMatrix.principal import _local_cache
+    from JobMatrix.recommendations import reset_index
+
+    for cache in caches.all():
+        cache.clear()
+    _local_cache.clear()
+    _signed_url_cache.clear()
+    reset_index()
+
+
+def client_for(user):
+    # A view that raises shows up as a 500 status instead of stopping the run
+    if user is None:
+        return Client(HTTP_HOST="localhost", raise_request_exception=False)
+    return Client(HTTP_AUTHORIZATION=f"Bearer {JWTAuthentication.generate_jwt(user)}", HTTP_HOST="localhost",
+                  raise_request_exception=False)
+
+
+def run_check(check, dataset):
+    """
+    Make the check's request (rolled back if it writes). Returns (response, captured queries).
+    """
+    client = client_for(dataset[check.user] if check.user else None)
+    # Resolved outside the capture, so the queries that build them (e.g. an ETag) do not count
+    headers = _resolve(check.headers, dataset)
+    if check.revalidate:
+        headers = {**(headers or {}), "If-None-Match": check.request(client, dataset, headers)["ETag"]}
+    clear_caches()
+    with transaction.atomic():
+        if check.setup:
+            check.setup(dataset)
+        with CaptureQueriesContext(connection) as queries:
+            response = check.request(client, dataset, headers)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        transaction.set_rollback(True)
+    return response, queries.captured_queries
+
+
+def run_checks(dataset, names=None):
+    """
+    Run the checks (all, or the given URL names). Yields (check, response, captured queries).
+    """
+    for check in QUERY_BUDGETS:
+        if names and check.name not in names:
+            continue
+        response, queries = run_check(check, dataset)
+        yield check, response, queries
+
+
+def missing_budgets():
+    """
+    URL names without a Check.
+    """
+    checked = {check.name for check in QUERY_BUDGETS}
+    return [name for name in url_names() if name not in checked]
@@ -0,0 +1,366 @@
+"""
+Skill-based job recommendations.
+
+Job descriptions are free text and applicant skills are free-text SKILL rows,
+so both sides are first reduced to normalized skill terms: lowercased tokens
+(the search tokenizer's, without stop-word removal), punctuation dropped and
+common aliases folded ("JS" -> "javascript", "k8s" -> "kubernetes"). A job's
+skills are the vocabulary terms (one to three words) found in its title and
+description. The vocabulary starts as KNOWN_SKILLS plus every skill name in
+SKILL; a skill that is not in it yet is added the first time an applicant
+with that skill asks for recommendations, by scanning only the jobs whose
+text contains it.
+
+Each process keeps a SkillIndex in memory: an inverted index from skill term
+to job slots, plus one NumPy row of per-job values. Scoring an applicant
+is one weighted bincount over the postings of their skills:
+
+    score(job) = sum over shared skills of experience_weight(years) * idf(skill)
+                 / sqrt(number of skills the job asks for)
+
+so rarer skills and longer experience count for more, and a job asking for
+few skills that the applicant has beats one listing everything.
+
+The index follows job writes through the signal handlers at the bottom
+(after commit, in the process that made them). Jobs added by other processes
+are picked up on the next request (one query for ids past the highest
+indexed); edits and deletes made elsewhere are picked up when the index is
+rebuilt, every RECOMMENDATION_INDEX_TTL seconds, in the background.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from JobMatrix.background import submit
+from JobMatrix.models import Job, Skill
+from JobMatrix.search import STOP_WORDS, TOKEN_RE
+from JobMatrix.signals import jobs_bulk_created
+
+RECOMMENDATION_INDEX_TTL = getattr(settings, "RECOMMENDATION_INDEX_TTL", 600)  # seconds
+RECOMMENDATIONS_MAX = 100
+MAX_SKILL_WORDS = 3
+BUILD_CHUNK_SIZE = 2000
+
+KNOWN_SKILLS = [
+    "python", "java", "javascript", "typescript", "go", "rust", "c", "c++", "c#", "ruby", "php", "swift",
+    "kotlin", "scala", "r", "sql", "mysql", "postgresql", "mongodb", "redis", "django", "flask", "fastapi",
+    "spring", "react", "angular", "vue", "nodejs", "html", "css", "aws", "azure", "gcp", "docker",
+    "kubernetes", "terraform", "linux", "git", "ci cd", "machine learning", "deep learning", "data analysis",
+    "tableau", "power bi", "excel", "salesforce", "sap", "figma", "agile", "scrum", "project management",
+    "product management", "accounting", "communication", "leadership", "negotiation", "patient care",
+]
+
+# Surface form -> canonical term, both already tokenized and joined with single spaces
+ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "postgres": "postgresql",
+    "node": "nodejs",
+    "node js": "nodejs",
+    "reactjs": "react",
+    "react js": "react",
+    "vuejs": "vue",
+    "vue js": "vue",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "microsoft excel": "excel",
+    "ms excel": "excel",
+    "powerbi": "power bi",
+    "cicd": "ci cd",
+}
+
+
+def skill_tokens(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def normalize_skill(name):
+    """
+    Canonical term for a skill name, or None if nothing usable is left.
+    """
+    tokens = skill_tokens(name)
+    if not tokens or len(tokens) > MAX_SKILL_WORDS or (len(tokens) == 1 and tokens[0] in STOP_WORDS):
+        return None
+    term = " ".join(tokens)
+    return ALIASES.get(term, term)
+
+
+def extract_skills(text, vocabulary):
+    """
+    The vocabulary terms (after alias folding) that appear in the text.
+    """
+    tokens = skill_tokens(text)
+    found = set()
+    for size in range(1, MAX_SKILL_WORDS + 1):
+        for start in range(len(tokens) - size + 1):
+            gram = " ".join(tokens[start:start + size])
+            term = ALIASES.get(gram, gram)
+            if term in vocabulary:
+                found.add(term)
+    return found
+
+
+def experience_weight(years):
+    return 1 + math.log1p(max(years or 0, 0))
+
+
+def _job_text(title, description):
+    return f"{title}\n{description}"
+
+
+class SkillIndex:
+    def __init__(self, vocabulary):
+        self.vocabulary = set(vocabulary)
+        self.postings = defaultdict(set)    # term -> slots
+        self.job_slots = {}                 # job_id -> slot
+        self.slot_jobs = []                 # slot -> job_id (None once deleted)
+        self.slot_terms = []                # slot -> frozenset of terms
+        self.max_job_id = 0
+        self.built_at = time.monotonic()
+        self.lock = threading.RLock()
+        self._arrays = None                 # (slot -> job_id, slot -> 1 / sqrt(term count))
+        self._posting_arrays = {}
+
+    # ---------------- Writes ---------------- #
+
+    def add_job(self, job_id, title, description):
+        with self.lock:
+            terms = frozenset(extract_skills(_job_text(title, description), self.vocabulary))
+            slot = self.job_slots.get(job_id)
+            if slot is None:
+                slot = len(self.slot_jobs)
+                self.job_slots[job_id] = slot
+                self.slot_jobs.append(job_id)
+                self.slot_terms.append(frozenset())
+            self._set_terms(slot, terms)
+            self.max_job_id = max(self.max_job_id, job_id)
+            self._arrays = None
+
+    def remove_job(self, job_id):
+        with self.lock:
+            slot = self.job_slots.pop(job_id, None)
+            if slot is None:
+                return
+            self._set_terms(slot, frozenset())
+            self.slot_jobs[slot] = None
+            self._arrays = None
+
+    def _set_terms(self, slot, terms):
+        old = self.slot_terms[slot]
+        for term in old - terms:
+            self.postings[term].discard(slot)
+            self._posting_arrays.pop(term, None)
+        for term in terms - old:
+            self.postings[term].add(slot)
+            self._posting_arrays.pop(term, None)
+        self.slot_terms[slot] = terms
+
+    def add_terms(self, terms):
+        """
+        Add skills to the vocabulary and index them in the jobs that mention them.
+        """
+        with self.lock:
+            terms = set(terms) - self.vocabulary
+            if not terms:
+                return
+            self.vocabulary |= terms
+            # Narrow the scan to jobs containing the first word of some surface form of each term
+            words = {term.split()[0] for term in terms}
+            words |= {alias.split()[0] for alias, term in ALIASES.items() if term in terms}
+            mentions = Q()
+            for word in words:
+                mentions |= Q(job_title__icontains=word) | Q(job_description__icontains=word)
+            rows = Job.objects.filter(mentions).values_list("job_id", "job_title", "job_description")
+            for job_id, title, description in rows.iterator(chunk_size=BUILD_CHUNK_SIZE):
+                slot = self.job_slots.get(job_id)
+                if slot is None:
+                    continue
+                found = extract_skills(_job_text(title, description), terms)
+                if found:
+                    self._set_terms(slot, self.slot_terms[slot] | found)
+            self._arrays = None
+
+    def catch_up(self):
+        """
+        Index jobs created by other processes since the last look.
+        """
+        with self.lock:
+            rows = Job.objects.filter(job_id__gt=self.max_job_id).values_list("job_id", "job_title", "job_description")
+            for job_id, title, description in rows.iterator(chunk_size=BUILD_CHUNK_SIZE):
+                self.add_job(job_id, title, description)
+
+    # ---------------- Reads ---------------- #
+
+    def arrays(self):
+        if self._arrays is None:
+            job_ids = np.array([job_id or 0 for job_id in self.slot_jobs], dtype=np.int64)
+            counts = np.array([len(terms) for terms in self.slot_terms], dtype=np.float64)
+            inverse_norm = np.divide(1.0, np.sqrt(counts), out=np.zeros_like(counts), where=counts > 0)
+            self._arrays = (job_ids, inverse_norm)
+        return self._arrays
+
+    def posting_array(self, term):
+        array = self._posting_arrays.get(term)
+        if array is None:
+            array = self._posting_arrays[term] = np.fromiter(self.postings.get(term, ()), dtype=np.int64)
+        return array
+
+    def recommend(self, skills, exclude_job_ids=(), limit=20):
+        """
+        Best jobs for the given {term: years}: [(job_id, score, matched terms)], best first.
+        """
+        with self.lock:
+            job_ids, inverse_norm = self.arrays()
+            live_jobs = len(self.job_slots)
+            postings, weights = [], []
+            for term, years in skills.items():
+                array = self.posting_array(term)
+                if not len(array):
+                    continue
+                idf = math.log(1 + live_jobs / len(array))
+                postings.append(array)
+                weights.append(np.full(len(array), experience_weight(years) * idf))
+            if not postings:
+                return []
+
+            scores = np.bincount(np.concatenate(postings), weights=np.concatenate(weights), minlength=len(job_ids))
+            scores *= inverse_norm
+            excluded = [self.job_slots[job_id] for job_id in exclude_job_ids if job_id in self.job_slots]
+            if excluded:
+                scores[excluded] = 0
+
+            matching = np.count_nonzero(scores)
+            if not matching:
+                return []
+            limit = min(limit, matching)
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            # Best score first, newest job first among equal scores
+            top = top[np.lexsort((-job_ids[top], -scores[top]))]
+            return [
+                (int(job_ids[slot]), round(float(scores[slot]), 4), sorted(self.slot_terms[slot] & skills.keys()))
+                for slot in top
+            ]
+
+
+def build_index():
+    vocabulary = set(KNOWN_SKILLS)
+    for name in Skill.objects.values_list("skill_name", flat=True).distinct():
+        term = normalize_skill(name)
+        if term:
+            vocabulary.add(term)
+
+    index = SkillIndex(vocabulary)
+    rows = Job.objects.order_by("job_id").values_list("job_id", "job_title", "job_description")
+    for job_id, title, description in rows.iterator(chunk_size=BUILD_CHUNK_SIZE):
+        index.add_job(job_id, title, description)
+    return index
+
+
+_index = None
+_index_lock = threading.Lock()
+_refreshing = False
+
+
+def get_index():
+    """
+    This process's index: built on first use, caught up with new jobs on every call and
+    rebuilt in the background once it is older than RECOMMENDATION_INDEX_TTL.
+    """
+    global _index, _refreshing
+    with _index_lock:
+        if _index is None:
+            _index = build_index()
+            return _index
+        index = _index
+        stale = time.monotonic() - index.built_at > RECOMMENDATION_INDEX_TTL and not _refreshing
+        if stale:
+            _refreshing = True
+    if stale:
+        submit(refresh_index)
+    index.catch_up()
+    return index
+
+
+def reset_index():
+    """
+    Drop this process's index; the next request rebuilds it.
+    """
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def refresh_index():
+    global _index, _refreshing
+    try:
+        index = build_index()
+        with _index_lock:
+            _index = index
+    finally:
+        _refreshing = False
+
+
+def applicant_skills(applicant_id):
+    """
+    {term: years} of an applicant's skills (the most years where two names fold to one term).
+    """
+    skills = {}
+    for name, years in Skill.objects.filter(applicant_id=applicant_id).values_list("skill_name", "skill_years_of_experience"):
+        term = normalize_skill(name)
+        if term:
+            skills[term] = max(skills.get(term, 0), years or 0)
+    return skills
+
+
+def recommend_jobs(applicant_id, exclude_job_ids=(), limit=20):
+    skills = applicant_skills(applicant_id)
+    if not skills:
+        return []
+    index = get_index()
+    index.add_terms(skills.keys())
+    return index.recommend(skills, exclude_job_ids, min(limit, RECOMMENDATIONS_MAX))
+
+
+# ---------------- Signal handlers ---------------- #
+
+def _index_jobs_on_commit(jobs):
+    def index_jobs():
+        if _index is not None:
+            for job_id, title, description in jobs:
+                _index.add_job(job_id, title, description)
+    transaction.on_commit(index_jobs)
+
+
+@receiver(post_save, sender=Job)
+def index_saved_job_skills(sender, instance, raw=False, **kwargs):
+    if not raw and _index is not None:
+        _index_jobs_on_commit([(instance.job_id, instance.job_title, instance.job_description)])
+
+
+@receiver(jobs_bulk_created)
+def index_bulk_created_job_skills(sender, jobs, **kwargs):
+    if _index is not None:
+        _index_jobs_on_commit([(job.job_id, job.job_title, job.job_description) for job in jobs])
+
+
+@receiver(post_delete, sender=Job)
+def unindex_deleted_job_skills(sender, instance, **kwargs):
+    if _index is None:
+        return
+    job_id = instance.job_id
+
+    def remove_job():
+        if _index is not None:
+            _index.remove_job(job_id)
+    transaction.on_commit(remove_job)
@@ -0,0 +1,217 @@
+"""
+Job search index.
+
+Every job gets a row in JOB_SEARCH_DOCUMENT holding its title, description,
+location and company name. On MySQL those columns carry FULLTEXT indexes and
+queries are ranked with MATCH ... AGAINST. On other databases (SQLite during
+development) a token -> job inverted index is kept in JOB_SEARCH_TERM and
+ranked with a weighted SUM over the matching terms.
+
+The index is kept in sync by the signal handlers at the bottom of this module
+(job saves and imports, company renames, recruiters moving to another company).
+Deleting a job or company needs no handler: the index rows cascade with the job.
+"""
+import logging
+import re
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from JobMatrix.models import Job, Company, Recruiter, JobSearchDocument, JobSearchTerm
+from JobMatrix.signals import jobs_bulk_created
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOP_WORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "we", "with", "you", "your",
+])
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 10
+MAX_TERM_FREQUENCY = 3  # Cap repeated words so long descriptions can't drown the title
+INDEX_BATCH_SIZE = 500
+
+# Relative importance of each indexed field when ranking results
+FIELD_WEIGHTS = {
+    "title": 5,
+    "company": 3,
+    "location": 3,
+    "description": 1,
+}
+
+
+def tokenize(text):
+    """
+    Split text into lower-cased search terms, dropping stop words and single characters.
+    """
+    if not text:
+        return []
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def query_terms(query):
+    """
+    Unique terms of a user query, in order, capped at MAX_QUERY_TERMS.
+    """
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+
+
+def uses_fulltext():
+    return connection.vendor == "mysql"
+
+
+def weighted_terms(title, description, location, company_name):
+    """
+    Returns {term: weight} for a job, combining the per-field weights.
+    """
+    weights = Counter()
+    for field, text in (("title", title), ("description", description),
+                        ("location", location), ("company", company_name)):
+        for term, frequency in Counter(tokenize(text)).items():
+            weights[term] += FIELD_WEIGHTS[field] * min(frequency, MAX_TERM_FREQUENCY)
+    return weights
+
+
+def index_jobs(job_ids):
+    """
+    (Re)build the index rows for the given job ids.
+    """
+    job_ids = list(job_ids)
+    for start in range(0, len(job_ids), INDEX_BATCH_SIZE):
+        _index_batch(job_ids[start:start + INDEX_BATCH_SIZE])
+
+
+def _index_batch(job_ids):
+    rows = Job.objects.filter(job_id__in=job_ids).values_list(
+        "job_id", "job_title", "job_description", "job_location",
+        "recruiter_id__company_id__company_name",
+    )
+
+    documents = []
+    terms = []
+    for job_id, title, description, location, company_name in rows:
+        documents.append(JobSearchDocument(
+            job_id_id=job_id,
+            document_title=title or "",
+            document_body=description or "",
+            document_location=location or "",
+            document_company=company_name or "",
+        ))
+        if not uses_fulltext():
+            for term, weight in weighted_terms(title, description, location, company_name).items():
+                terms.append(JobSearchTerm(job_id_id=job_id, search_term=term, search_term_weight=weight))
+
+    with transaction.atomic():
+        JobSearchDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=["job_id"],
+            update_fields=["document_title", "document_body", "document_location", "document_company"],
+        )
+        if not uses_fulltext():
+            JobSearchTerm.objects.filter(job_id__in=job_ids).delete()
+            JobSearchTerm.objects.bulk_create(terms, batch_size=INDEX_BATCH_SIZE)
+
+
+def reindex_all():
+    """
+    Rebuild the whole index. Returns the number of jobs indexed.
+    """
+    job_ids = list(Job.objects.values_list("job_id", flat=True).order_by("job_id"))
+    index_jobs(job_ids)
+    return len(job_ids)
+
+
+def search_jobs(queryset, query):
+    """
+    Restrict a Job queryset to jobs matching `query`, annotated with `search_rank`
+    and ordered by relevance (newest first among equal ranks).
+    """
+    terms = query_terms(query)
+    if not terms:
+        return queryset
+
+    if uses_fulltext():
+        against = " ".join(terms)
+        columns = ("JOB_SEARCH_DOCUMENT.document_title, JOB_SEARCH_DOCUMENT.document_body, "
+                   "JOB_SEARCH_DOCUMENT.document_location, JOB_SEARCH_DOCUMENT.document_company")
+        rank = RawSQL(
+            f"MATCH(JOB_SEARCH_DOCUMENT.document_title) AGAINST (%s IN NATURAL LANGUAGE MODE) * {FIELD_WEIGHTS['title']}"
+            f" + MATCH({columns}) AGAINST (%s IN NATURAL LANGUAGE MODE)",
+            [against, against],
+        )
+        match = RawSQL(f"MATCH({columns}) AGAINST (%s IN NATURAL LANGUAGE MODE)", [against])
+        queryset = (
+            queryset.filter(search_document__isnull=False)
+            .annotate(search_match=match, search_rank=rank)
+            .filter(search_match__gt=0)
+        )
+    else:
+        queryset = queryset.filter(search_terms__search_term__in=terms).annotate(
+            search_rank=Sum("search_terms__search_term_weight")
+        )
+
+    # job_id last, so pages split the same way when rank and posting date tie
+    return queryset.order_by("-search_rank", "-job_date_posted", "-job_id")
+
+
+@receiver(post_save, sender=Job)
+def index_saved_job(sender, instance, **kwargs):
+    try:
+        index_jobs([instance.job_id])
+    except Exception as e:
+        # Never fail a job write because of the search index; rebuild_search_index repairs it
+        logger.error(f"Error indexing job {instance.job_id}: {str(e)}")
+
+
+@receiver(jobs_bulk_created)
+def index_bulk_created_jobs(sender, jobs, **kwargs):
+    try:
+        # Runs inside the import's transaction: roll back only the index on a failure
+        with transaction.atomic():
+            index_jobs([job.job_id for job in jobs])
+    except Exception as e:
+        logger.error(f"Error indexing {len(jobs)} imported jobs: {str(e)}")
+
+
+@receiver(post_save, sender=Company)
+def reindex_company_jobs(sender, instance, created, **kwargs):
+    if created:
+        return
+    try:
+        stale_job_ids = list(
+            JobSearchDocument.objects.filter(job_id__recruiter_id__company_id=instance.company_id)
+            .exclude(document_company=instance.company_name)
+            .values_list("job_id", flat=True)
+        )
+        if stale_job_ids:
+            index_jobs(stale_job_ids)
+    except Exception as e:
+        logger.error(f"Error reindexing jobs for company {instance.company_id}: {str(e)}")
+
+
+@receiver(post_init, sender=Recruiter)
+def remember_recruiter_company(sender, instance, **kwargs):
+    # The company as loaded, so a move is noticed without a query (None if it was deferred)
+    instance._search_company_id = instance.__dict__.get("company_id_id")
+
+
+@receiver(post_save, sender=Recruiter)
+def reindex_moved_recruiter_jobs(sender, instance, created, raw=False, **kwargs):
+    # Their jobs are indexed with the company name
+    previous, instance._search_company_id = instance._search_company_id, instance.company_id_id
+    if created or raw or previous == instance.company_id_id:
+        return
+    try:
+        index_jobs(Job.objects.filter(recruiter_id=instance.pk).values_list("job_id", flat=True))
+    except Exception as e:
+        logger.error(f"Error reindexing jobs for recruiter {instance.pk}: {str(e)}")
@@ -0,0 +1,456 @@
+"""
+Synthetic data for load and scale testing.
+
+`python manage.py seed_jobmatrix` adds configurable volumes of companies,
+recruiters, applicants (with skills, education and work experience), jobs,
+applications and bookmarks, shaped roughly like production:
+
+  * applications per job follow a power law: a few jobs get most of the
+    applications and the long tail gets one or none;
+  * some applicants apply far more than others (a milder power law);
+  * job locations and applicant cities are skewed towards a few metros, and
+    bigger companies post more jobs;
+  * jobs, sign-ups, applications and bookmarks are spread over the past
+    SEED_HISTORY_DAYS days, weighted towards recent dates.
+
+Rows go in with bulk_create in batches of --batch-size, so signals do not fire
+and a million applications take minutes rather than hours. The derived tables
+those signals would have maintained (search index, per-job application
+counters, dashboard metrics, applicant feeds) are rebuilt at the end.
+
+Every run gets its own tag in e-mail addresses and company names, so runs can
+be stacked on top of each other and of real data. The same --seed produces the
+same shape of data.
+"""
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from JobMatrix.models import (
+    User, Admin, Applicant, Recruiter, Company, Job, Application, Bookmark,
+    Skill, Education, WorkExperience,
+)
+
+SEED_EMAIL_DOMAIN = "seed.jobmatrix.test"
+SEED_HISTORY_DAYS = 365
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Priya", "Wei",
+    "Carlos", "Fatima", "Hiroshi", "Olga", "Kwame", "Ana", "Mohammed", "Sofia", "Raj", "Mei",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Patel", "Nguyen",
+    "Kim", "Chen", "Singh", "Okafor", "Tanaka", "Ivanova", "Rossi", "Muller", "Silva", "Reddy",
+]
+# Most popular first: weights fall off with the position in the list
+METROS = [
+    ("New York", "NY"), ("San Francisco", "CA"), ("Seattle", "WA"), ("Austin", "TX"), ("Chicago", "IL"),
+    ("Boston", "MA"), ("Los Angeles", "CA"), ("Denver", "CO"), ("Atlanta", "GA"), ("Dallas", "TX"),
+    ("Detroit", "MI"), ("Minneapolis", "MN"), ("Phoenix", "AZ"), ("Portland", "OR"), ("Raleigh", "NC"),
+    ("Pittsburgh", "PA"), ("Columbus", "OH"), ("Salt Lake City", "UT"), ("Nashville", "TN"), ("Madison", "WI"),
+]
+REMOTE_SHARE = 0.15
+INDUSTRIES = ["Technology", "Healthcare", "Finance", "Retail", "Manufacturing", "Education", "Logistics", "Media"]
+COMPANY_WORDS = [
+    "Northwind", "Contoso", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Acme", "Hooli", "Vandelay",
+    "Cyberdyne", "Soylent", "Tyrell", "Wonka", "Aperture", "Massive", "Oscorp", "Pied Piper", "Dunder", "Prestige",
+]
+COMPANY_SUFFIXES = ["Labs", "Systems", "Health", "Capital", "Group", "Works", "Partners", "Analytics"]
+JOB_TITLES = [
+    "Software Engineer", "Data Analyst", "Registered Nurse", "Product Manager", "Backend Developer",
+    "Frontend Developer", "Data Scientist", "DevOps Engineer", "Accountant", "Sales Representative",
+    "Marketing Manager", "Business Analyst", "UX Designer", "QA Engineer", "Project Manager",
+    "Customer Success Manager", "Financial Analyst", "Mechanical Engineer", "Teacher", "Operations Manager",
+]
+SENIORITY = ["", "", "", "Junior ", "Senior ", "Lead ", "Principal "]
+SKILLS = [
+    "Python", "SQL", "Excel", "Communication", "JavaScript", "Java", "Project Management", "AWS", "React",
+    "Django", "Tableau", "Salesforce", "Kubernetes", "Patient Care", "Accounting", "Figma", "Go", "C++",
+    "Machine Learning", "Docker", "Agile", "Power BI", "TypeScript", "Leadership", "Negotiation",
+]
+SCHOOLS = [
+    "State University", "Central Michigan University", "Tech Institute", "City College", "Riverside University",
+    "Lakeside College", "Northern University", "Pacific University",
+]
+DEGREES = ["Bachelor", "Bachelor", "Bachelor", "Master", "Master", "Associate", "PhD"]
+MAJORS = ["Computer Science", "Nursing", "Business", "Economics", "Mechanical Engineering", "Mathematics", "Design"]
+STATUS_WEIGHTS = {"PENDING": 60, "REJECTED": 25, "APPROVED": 15}
+
+
+def zipf_cum_weights(count, exponent):
+    """
+    Cumulative weights for random.choices(): item i (0-based) has weight 1 / (i + 1) ** exponent.
+    """
+    total = 0.0
+    cumulative = []
+    for rank in range(1, count + 1):
+        total += 1 / rank ** exponent
+        cumulative.append(total)
+    return cumulative
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """
+    Let bulk_create keep the given auto_now_add fields as set on the instances.
+    """
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class SyntheticDataGenerator:
+    def __init__(self, companies=50, recruiters_per_company=3, applicants=2000, jobs=5000, applications=50000,
+                 bookmarks=10000, skills_per_applicant=5, educations_per_applicant=2, experiences_per_applicant=3,
+                 skew=1.1, batch_size=5000, seed=None, password="jobmatrix123", rebuild_feeds=True, log=None):
+        self.counts = {
+            "companies": companies,
+            "recruiters_per_company": recruiters_per_company,
+            "applicants": applicants,
+            "jobs": jobs,
+            "applications": applications,
+            "bookmarks": bookmarks,
+            "skills_per_applicant": skills_per_applicant,
+            "educations_per_applicant": educations_per_applicant,
+            "experiences_per_applicant": experiences_per_applicant,
+        }
+        self.skew = skew
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.tag = uuid.uuid4().hex[:8]
+        self.password = make_password(password)
+        self.rebuild_feeds = rebuild_feeds
+        self.log = log or (lambda message: None)
+        self.now = timezone.now()
+        self.metro_weights = zipf_cum_weights(len(METROS), 1.0)
+
+    # ---------------- Helpers ---------------- #
+
+    def _email(self, kind, number):
+        return f"{kind}{number}.{self.tag}@{SEED_EMAIL_DOMAIN}"
+
+    def _past(self, earliest=None):
+        """
+        A moment between `earliest` (default SEED_HISTORY_DAYS ago) and now, weighted towards now.
+        """
+        earliest = earliest or self.now - timedelta(days=SEED_HISTORY_DAYS)
+        span = (self.now - earliest).total_seconds()
+        return self.now - timedelta(seconds=self.rng.triangular(0, span, 0))
+
+    def _metro(self):
+        return self.rng.choices(METROS, cum_weights=self.metro_weights)[0]
+
+    def _user(self, kind, number, role):
+        city, state = self._metro()
+        return User(
+            user_first_name=self.rng.choice(FIRST_NAMES),
+            user_last_name=self.rng.choice(LAST_NAMES),
+            user_email=self._email(kind, number),
+            user_password=self.password,
+            user_phone=f"555{self.rng.randrange(10 ** 7):07d}",
+            user_city=city,
+            user_state=state,
+            user_zip_code=f"{self.rng.randrange(10000, 99999)}",
+            user_role=role,
+            user_created_date=self._past(),
+        )
+
+    def _create_users(self, users):
+        """
+        bulk_create the users and return their ids in the same order (not every backend returns primary keys).
+        """
+        with explicit_timestamps(User._meta.get_field("user_created_date")):
+            User.objects.bulk_create(users, batch_size=self.batch_size)
+        ids = dict(User.objects.filter(user_email__in=[user.user_email for user in users])
+                   .values_list("user_email", "user_id"))
+        return [ids[user.user_email] for user in users]
+
+    def _around(self, mean):
+        # 0 .. 2 * mean, averaging mean
+        return self.rng.randint(0, 2 * mean) if mean else 0
+
+    # ---------------- Steps ---------------- #
+
+    def run(self):
+        created = {}
+        created["admins"] = self.create_admin()
+        company_ids = self.create_companies()
+        created["companies"] = len(company_ids)
+        recruiters = self.create_recruiters(company_ids)
+        created["recruiters"] = sum(len(ids) for ids in recruiters.values())
+        applicant_ids = self.create_applicants()
+        created["applicants"] = len(applicant_ids)
+        jobs = self.create_jobs(company_ids, recruiters)
+        created["jobs"] = len(jobs)
+        seen = set()
+        created["applications"] = self.create_applications(applicant_ids, jobs, seen)
+        created["bookmarks"] = self.create_bookmarks(applicant_ids, jobs, seen)
+        self.rebuild_derived([job_id for job_id, _ in jobs], applicant_ids)
+        return created
+
+    def create_admin(self):
+        user_id = self._create_users([self._user("admin", 0, "ADMIN")])[0]
+        Admin.objects.create(admin_id_id=user_id, admin_ssn=f"seed-{self.tag}")
+        self.log(f"Admin: {self._email('admin', 0)}")
+        return 1
+
+    def create_companies(self):
+        companies = [
+            Company(
+                company_name=f"{self.rng.choice(COMPANY_WORDS)} {self.rng.choice(COMPANY_SUFFIXES)} {n} ({self.tag})",
+                company_industry=self.rng.choice(INDUSTRIES),
+                company_description="Synthetic company for load testing.",
+                company_secret_key=self.password,
+            )
+            for n in range(self.counts["companies"])
+        ]
+        Company.objects.bulk_create(companies, batch_size=self.batch_size)
+        ids = dict(Company.objects.filter(company_name__in=[company.company_name for company in companies])
+                   .values_list("company_name", "company_id"))
+        self.log(f"Companies: {len(ids)}")
+        return [ids[company.company_name] for company in companies]
+
+    def create_recruiters(self, company_ids):
+        """
+        Returns {company_id: [recruiter ids]}, the active recruiter first.
+        """
+        per_company = max(self.counts["recruiters_per_company"], 1)
+        users = [self._user("recruiter", n, "RECRUITER") for n in range(len(company_ids) * per_company)]
+        user_ids = self._create_users(users)
+
+        recruiters = []
+        by_company = {}
+        for index, user_id in enumerate(user_ids):
+            company_id = company_ids[index // per_company]
+            active = index % per_company == 0
+            start = (self.now - timedelta(days=self.rng.randint(30, 5 * 365))).date()
+            recruiters.append(Recruiter(
+                recruiter_id_id=user_id,
+                company_id_id=company_id,
+                recruiter_is_active=active,
+                recruiter_start_date=start,
+                recruiter_end_date=None if active else min(start + timedelta(days=self.rng.randint(90, 900)),
+                                                          date.today()),
+            ))
+            by_company.setdefault(company_id, []).append(user_id)
+        Recruiter.objects.bulk_create(recruiters, batch_size=self.batch_size)
+        self.log(f"Recruiters: {len(recruiters)}")
+        return by_company
+
+    def create_applicants(self):
+        applicant_ids = []
+        for numbers in _chunks(range(self.counts["applicants"]), self.batch_size):
+            with transaction.atomic():
+                user_ids = self._create_users([self._user("applicant", n, "APPLICANT") for n in numbers])
+                Applicant.objects.bulk_create([Applicant(applicant_id_id=user_id) for user_id in user_ids],
+                                              batch_size=self.batch_size)
+                self._create_profiles(user_ids)
+            applicant_ids.extend(user_ids)
+            self.log(f"Applicants: {len(applicant_ids)}/{self.counts['applicants']}")
+        return applicant_ids
+
+    def _create_profiles(self, applicant_ids):
+        skill_weights = zipf_cum_weights(len(SKILLS), 0.8)
+        skills, educations, experiences = [], [], []
+        for applicant_id in applicant_ids:
+            names = set(self.rng.choices(SKILLS, cum_weights=skill_weights, k=self._around(self.counts["skills_per_applicant"])))
+            skills.extend(
+                Skill(applicant_id_id=applicant_id, skill_name=name, skill_years_of_experience=self.rng.randint(0, 15))
+                for name in names
+            )
+
+            year = self.rng.randint(1995, 2020)
+            for _ in range(self._around(self.counts["educations_per_applicant"])):
+                educations.append(Education(
+                    applicant_id_id=applicant_id,
+                    education_school_name=self.rng.choice(SCHOOLS),
+                    education_degree_type=self.rng.choice(DEGREES),
+                    education_major=self.rng.choice(MAJORS),
+                    education_gpa=round(self.rng.uniform(2.5, 4.0), 2),
+                    education_start_date=date(year, 9, 1),
+                    education_end_date=date(year + 4, 5, 31),
+                ))
+                year += 4
+
+            start = date(self.rng.randint(2000, 2022), self.rng.randint(1, 12), 1)
+            experience_count = self._around(self.counts["experiences_per_applicant"])
+            for number in range(experience_count):
+                current = number == experience_count - 1 and self.rng.random() < 0.6
+                end = None if current else start + timedelta(days=self.rng.randint(180, 1500))
+                if end and end >= date.today():
+                    end, current = None, True
+                experiences.append(WorkExperience(
+                    applicant_id_id=applicant_id,
+                    work_experience_job_title=self.rng.choice(SENIORITY) + self.rng.choice(JOB_TITLES),
+                    work_experience_company=f"{self.rng.choice(COMPANY_WORDS)} {self.rng.choice(COMPANY_SUFFIXES)}",
+                    work_experience_summary="Synthetic work history.",
+                    work_experience_start_date=start,
+                    work_experience_end_date=end,
+                    work_experience_is_currently_working=current,
+                ))
+                if current:
+                    break
+                start = end + timedelta(days=self.rng.randint(1, 120))
+
+        Skill.objects.bulk_create(skills, batch_size=self.batch_size)
+        Education.objects.bulk_create(educations, batch_size=self.batch_size)
+        WorkExperience.objects.bulk_create(experiences, batch_size=self.batch_size)
+
+    def create_jobs(self, company_ids, recruiters):
+        """
+        Returns [(job_id, job_date_posted)].
+        """
+        # Bigger companies (earlier in the list) post more
+        company_weights = zipf_cum_weights(len(company_ids), 0.8)
+        title_weights = zipf_cum_weights(len(JOB_TITLES), 0.7)
+        posted_field = Job._meta.get_field("job_date_posted")
+
+        jobs = []
+        for numbers in _chunks(range(self.counts["jobs"]), self.batch_size):
+            batch = []
+            for _ in numbers:
+                company_id = self.rng.choices(company_ids, cum_weights=company_weights)[0]
+                title = self.rng.choices(JOB_TITLES, cum_weights=title_weights)[0]
+                if self.rng.random() < REMOTE_SHARE:
+                    location = "Remote"
+                else:
+                    city, state = self._metro()
+                    location = f"{city}, {state}"
+                skills = ", ".join(self.rng.sample(SKILLS, 3))
+                batch.append(Job(
+                    job_title=self.rng.choice(SENIORITY) + title,
+                    job_description=f"We are hiring a {title} experienced with {skills}.",
+                    job_location=location,
+                    job_salary=round(self.rng.lognormvariate(11.1, 0.4), -2),
+                    job_date_posted=self._past(),
+                    recruiter_id_id=self.rng.choice(recruiters[company_id]),
+                ))
+            with explicit_timestamps(posted_field):
+                Job.objects.bulk_create(batch, batch_size=self.batch_size)
+            jobs.extend(batch)
+            self.log(f"Jobs: {len(jobs)}/{self.counts['jobs']}")
+
+        recruiter_ids = [recruiter_id for ids in recruiters.values() for recruiter_id in ids]
+        return list(Job.objects.filter(recruiter_id__in=recruiter_ids).order_by("job_id")
+                    .values_list("job_id", "job_date_posted"))
+
+    def _pairs(self, applicant_ids, jobs, target, seen):
+        """
+        Yield batches of distinct (applicant id, (job id, posted)) pairs not already in `seen`.
+        Popular jobs and busy applicants come up far more often.
+        """
+        # Popularity is independent of job id order
+        jobs = list(jobs)
+        self.rng.shuffle(jobs)
+        applicants = list(applicant_ids)
+        self.rng.shuffle(applicants)
+        job_weights = zipf_cum_weights(len(jobs), self.skew)
+        applicant_weights = zipf_cum_weights(len(applicants), 0.5)
+
+        made = 0
+        batch = []
+        # Give up on near-saturated targets instead of spinning
+        attempts = 0
+        while made < target and attempts < 20 * target:
+            size = min(self.batch_size, target - made) - len(batch)
+            chosen_jobs = self.rng.choices(jobs, cum_weights=job_weights, k=size)
+            chosen_applicants = self.rng.choices(applicants, cum_weights=applicant_weights, k=size)
+            attempts += size
+            for applicant_id, job in zip(chosen_applicants, chosen_jobs):
+                key = (applicant_id, job[0])
+                if key in seen:
+                    continue
+                seen.add(key)
+                batch.append((applicant_id, job))
+            if len(batch) == min(self.batch_size, target - made):
+                made += len(batch)
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def create_applications(self, applicant_ids, jobs, seen):
+        if not applicant_ids or not jobs:
+            return 0
+        statuses = list(STATUS_WEIGHTS)
+        status_weights = list(STATUS_WEIGHTS.values())
+        applied_field = Application._meta.get_field("application_date_applied")
+
+        created = 0
+        for batch in self._pairs(applicant_ids, jobs, self.counts["applications"], seen):
+            applications = [
+                Application(
+                    applicant_id_id=applicant_id,
+                    job_id_id=job_id,
+                    application_status=self.rng.choices(statuses, weights=status_weights)[0],
+                    application_date_applied=self._past(posted),
+                )
+                for applicant_id, (job_id, posted) in batch
+            ]
+            with explicit_timestamps(applied_field):
+                Application.objects.bulk_create(applications, batch_size=self.batch_size)
+            created += len(applications)
+            self.log(f"Applications: {created}/{self.counts['applications']}")
+        return created
+
+    def create_bookmarks(self, applicant_ids, jobs, seen):
+        if not applicant_ids or not jobs:
+            return 0
+        saved_field = Bookmark._meta.get_field("bookmark_date_saved")
+
+        created = 0
+        # Applied-for jobs are in `seen`, so nothing is both applied for and bookmarked
+        for batch in self._pairs(applicant_ids, jobs, self.counts["bookmarks"], seen):
+            bookmarks = [
+                Bookmark(applicant_id_id=applicant_id, job_id_id=job_id, bookmark_date_saved=self._past(posted))
+                for applicant_id, (job_id, posted) in batch
+            ]
+            with explicit_timestamps(saved_field):
+                Bookmark.objects.bulk_create(bookmarks, batch_size=self.batch_size)
+            created += len(bookmarks)
+            self.log(f"Bookmarks: {created}/{self.counts['bookmarks']}")
+        return created
+
+    def rebuild_derived(self, job_ids, applicant_ids):
+        """
+        Fill in what the skipped signals would have maintained.
+        """
+        from JobMatrix.application_stats import rebuild_application_stats
+        from JobMatrix.dashboard_metrics import reconcile_dashboard_metrics
+        from JobMatrix.experience import refresh_experience_summaries
+        from JobMatrix.feed import FEED_BATCH_SIZE, rebuild_applicant_feeds, recent_jobs
+        from JobMatrix.search import index_jobs
+
+        index_jobs(job_ids)
+        self.log("Search index: rebuilt for the new jobs")
+        rebuild_application_stats()
+        self.log("Application counters: rebuilt")
+        reconcile_dashboard_metrics()
+        self.log("Dashboard metrics: rebuilt")
+        refresh_experience_summaries(applicant_ids)
+        self.log("Experience summaries: rebuilt for the new applicants")
+        if not self.rebuild_feeds:
+            self.log("Applicant feeds: skipped (run rebuild_applicant_feeds)")
+            return
+        recent = recent_jobs()
+        for done, batch in enumerate(_chunks(applicant_ids, FEED_BATCH_SIZE), 1):
+            rebuild_applicant_feeds(batch, jobs=recent)
+            if done % 25 == 0:
+                self.log(f"Applicant feeds: {done * FEED_BATCH_SIZE}/{len(applicant_ids)}")
+        self.log("Applicant feeds: rebuilt")
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from .models import *
 from django.contrib.auth.hashers import make_password, check_password
 from rest_framework import serializers
@@ -9,6 +10,7 @@ from Profile.serializers import (
 )
 import logging
 from .utils import get_full_url
+from .media import MediaPrefetchListSerializer
 
 logger = logging.getLogger(__name__) 
 
@@ -16,7 +18,7 @@ logger = logging.getLogger(__name__)
 class UserSerializer(serializers.ModelSerializer): 
     class Meta:
         model = User
-        fields = '__all__'
+        exclude = ['user_token_version']
 
     def create(self, validated_data): 
         validated_data['user_password'] = make_password(validated_data['user_password']) # Hash the password
@@ -27,6 +29,8 @@ class UserSerializerForResponse(serializers.ModelSerializer):
         model = User # User model
         fields = ["user_id", "user_first_name", "user_last_name", "user_email", "user_phone", "user_street_no",
                   "user_city", "user_state", "user_zip_code", "user_role", "user_profile_photo", "user_created_date"]
+        list_serializer_class = MediaPrefetchListSerializer
+        media_fields = ['user_profile_photo']
 
     def create(self, validated_data): 
         validated_data['user_password'] = make_password(validated_data['user_password']) # Hash the password
@@ -55,6 +59,8 @@ class ApplicantSerializer(serializers.ModelSerializer):
     class Meta:
         model = Applicant
         fields = ["applicant_id", "applicant_resume"]
+        list_serializer_class = MediaPrefetchListSerializer
+        media_fields = ["applicant_resume"]
         extra_kwargs = {
             'applicant_id': {'read_only': True}
         }
@@ -118,6 +124,8 @@ class CompanySerializer(serializers.ModelSerializer):
     class Meta:
         model = Company
         fields = "__all__"
+        list_serializer_class = MediaPrefetchListSerializer
+        media_fields = ["company_image"]
         extra_kwargs = {
             'company_id': {'read_only': True}
         }
@@ -150,6 +158,8 @@ class CompanySerializerForResponse(serializers.ModelSerializer):
     class Meta:
         model = Company
         fields = ['company_id', 'company_name', 'company_description', 'company_industry','company_image']
+        list_serializer_class = MediaPrefetchListSerializer
+        media_fields = ["company_image"]
         extra_kwargs = {
             'company_id': {'read_only': True}
         }
@@ -283,34 +293,44 @@ class AdminUserListSerializer(serializers.ModelSerializer):
             'user_created_date', 'skills', 'work_experience', 'education',
             'applicant_resume', 'recruiter', 'company', 'admin_ssn'
         ]
+        list_serializer_class = MediaPrefetchListSerializer
+        media_fields = ['user_profile_photo', 'applicant.applicant_resume', 'recruiter.company_id.company_image']
+
+    @staticmethod
+    def _role_profile(obj, related_name):
+        """
+        Returns the user's Applicant/Recruiter/Admin row, or None.
+        UserListView select_related()s these, so no query is issued here.
+        """
+        try:
+            return getattr(obj, related_name)
+        except ObjectDoesNotExist:
+            return None
 
     def get_skills(self, obj):
         if obj.user_role == 'APPLICANT':
-            applicant = Applicant.objects.filter(applicant_id=obj.user_id).first()
+            applicant = self._role_profile(obj, 'applicant')
             if applicant:
-                skills = Skill.objects.filter(applicant_id=applicant)
-                return SkillSerializer(skills, many=True).data
+                return SkillSerializer(applicant.skills.all(), many=True).data
         return None
 
     def get_work_experience(self, obj):
         if obj.user_role == 'APPLICANT':
-            applicant = Applicant.objects.filter(applicant_id=obj.user_id).first()
+            applicant = self._role_profile(obj, 'applicant')
             if applicant:
-                work_experience = WorkExperience.objects.filter(applicant_id=applicant)
-                return WorkExperienceSerializer(work_experience, many=True).data
+                return WorkExperienceSerializer(applicant.work_experience.all(), many=True).data
         return None
 
     def get_education(self, obj):
         if obj.user_role == 'APPLICANT':
-            applicant = Applicant.objects.filter(applicant_id=obj.user_id).first()
+            applicant = self._role_profile(obj, 'applicant')
             if applicant:
-                education = Education.objects.filter(applicant_id=applicant)
-                return EducationSerializer(education, many=True).data
+                return EducationSerializer(applicant.education.all(), many=True).data
         return None
 
     def get_applicant_resume(self, obj):
         if obj.user_role == 'APPLICANT':
-            applicant = Applicant.objects.filter(applicant_id=obj.user_id).first()
+            applicant = self._role_profile(obj, 'applicant')
             if applicant and applicant.applicant_resume:
                 try:
                     # Use the utility function to get the proper URL
@@ -325,21 +345,21 @@ class AdminUserListSerializer(serializers.ModelSerializer):
 
     def get_recruiter(self, obj):
         if obj.user_role == 'RECRUITER':
-            recruiter = Recruiter.objects.filter(recruiter_id=obj.user_id).first()
+            recruiter = self._role_profile(obj, 'recruiter')
             if recruiter:
                 return RecruiterSerializer(recruiter).data
         return None
 
     def get_company(self, obj):
         if obj.user_role == 'RECRUITER':
-            recruiter = Recruiter.objects.filter(recruiter_id=obj.user_id).first()
+            recruiter = self._role_profile(obj, 'recruiter')
             if recruiter and recruiter.company_id:
                 return CompanySerializerForResponse(recruiter.company_id).data
         return None
 
     def get_admin_ssn(self, obj):
         if obj.user_role == 'ADMIN':
-            admin = Admin.objects.filter(admin_id=obj.user_id).first()
+            admin = self._role_profile(obj, 'admin')
             if admin:
                 return admin.admin_ssn
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,13 @@
+"""
+Signals for writes that bypass the model signals.
+
+bulk_create sends no post_save, so code that inserts rows in bulk sends one
+of these instead, and the modules that keep derived data in sync (search
+index, feeds, dashboard metrics, company stats) listen for them next to their
+post_save handlers.
+"""
+from django.dispatch import Signal
+
+# Sent with sender=Job and jobs=[Job, ...] (primary keys set) after the jobs are
+# inserted, inside the inserting transaction
+jobs_bulk_created = Signal()
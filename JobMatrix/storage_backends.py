@@ -1,17 +1,167 @@
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.text import get_valid_filename
 from django.core.files.storage import FileSystemStorage
 import logging
 from urllib.parse import urljoin
+import threading
+
+from JobMatrix.caching import TTLCache
+from JobMatrix.perf import instrument_s3_client
 
 logger = logging.getLogger(__name__)
 
+# One boto3 client per process. Clients are thread-safe and keep a pool of
+# keep-alive connections, so sharing one avoids paying client construction and
+# a TLS handshake on every existence check.
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+# Results of HEAD requests keyed by object key: True, False, or the alternate
+# key the file was found under. Misses expire sooner than hits so files that
+# appear later are picked up quickly.
+_exists_cache = TTLCache(
+    maxsize=getattr(settings, 'S3_EXISTS_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'S3_EXISTS_CACHE_TTL', 300),
+)
+EXISTS_NEGATIVE_TTL = getattr(settings, 'S3_EXISTS_NEGATIVE_TTL', 60)
+BUCKET_PROBE_TIMEOUT = getattr(settings, 'S3_PROBE_TIMEOUT', 2)  # seconds, per connect and per read
+
+
+def get_s3_client():
+    """
+    Returns the process-wide S3 client, creating it on first use.
+    """
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                import boto3
+                from botocore.config import Config
+
+                _s3_client = boto3.client(
+                    's3',
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    region_name=settings.AWS_S3_REGION_NAME,
+                    endpoint_url=getattr(settings, 'AWS_S3_ENDPOINT_URL', None),
+                    config=Config(
+                        max_pool_connections=getattr(settings, 'S3_MAX_POOL_CONNECTIONS', 50),
+                        retries={'max_attempts': 3, 'mode': 'standard'},
+                    ),
+                )
+                instrument_s3_client(_s3_client)
+    return _s3_client
+
+
+# Result of the one-off bucket probe; None until it has run
+_bucket_status = None
+_bucket_probe_started = False
+_bucket_probe_lock = threading.Lock()
+
+
+def probe_bucket():
+    """
+    Check once that the bucket is usable and log a clear error if not.
+    Returns {"ok": bool, "reachable": bool, "error": str or None}; reachable is False
+    when S3 did not answer at all (network error or timeout).
+    """
+    global _bucket_status
+    import boto3
+    from botocore.config import Config
+    from botocore.exceptions import ClientError
+
+    # Own client with short timeouts and no retries, so a slow S3 cannot hold up startup
+    client = boto3.client(
+        's3',
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_S3_REGION_NAME,
+        endpoint_url=getattr(settings, 'AWS_S3_ENDPOINT_URL', None),
+        config=Config(connect_timeout=BUCKET_PROBE_TIMEOUT, read_timeout=BUCKET_PROBE_TIMEOUT,
+                      retries={'max_attempts': 1}),
+    )
+    try: # Try to access the bucket
+        client.head_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+        _bucket_status = {"ok": True, "reachable": True, "error": None}
+    except ClientError as e:
+        error_code = e.response['Error']['Code']
+        if error_code == '403':
+            message = f"Access denied to S3 bucket {settings.AWS_STORAGE_BUCKET_NAME}. Check permissions."
+        elif error_code == '404':
+            message = f"S3 bucket {settings.AWS_STORAGE_BUCKET_NAME} does not exist."
+        else:
+            message = f"Error accessing S3: {str(e)}"
+        logger.error(message)
+        _bucket_status = {"ok": False, "reachable": True, "error": message}
+    except Exception as e:
+        logger.error(f"Error reaching S3: {str(e)}")
+        _bucket_status = {"ok": False, "reachable": False, "error": str(e)}
+    return _bucket_status
+
+
+def bucket_rejected():
+    """
+    Whether the probe has run and S3 answered that the bucket cannot be used
+    (wrong credentials, missing bucket), as opposed to not answering at all.
+    """
+    status = _bucket_status
+    return status is not None and not status["ok"] and status["reachable"]
+
+
+def check_bucket():
+    """
+    Opt-in strict startup check (S3_STARTUP_CHECK, from AppConfig.ready): refuse to start
+    when S3 answers that the bucket cannot be used. An S3 that does not answer is only
+    logged, and delays the boot by up to twice BUCKET_PROBE_TIMEOUT (connect, then read).
+    """
+    global _bucket_probe_started
+    if not settings.USE_S3_STORAGE:
+        return
+    status = probe_bucket()
+    if status["reachable"]:
+        # Settled; otherwise start_bucket_probe() tries again on first media use
+        _bucket_probe_started = True
+    if bucket_rejected():
+        raise ImproperlyConfigured(
+            f"{status['error']} Fix the AWS settings, or set USE_S3_STORAGE=False to store media on the filesystem."
+        )
+
+
+def start_bucket_probe():
+    """
+    Run probe_bucket() once per process in the background. Cheap to call repeatedly.
+    """
+    global _bucket_probe_started
+    if _bucket_probe_started or not settings.USE_S3_STORAGE:
+        return
+    with _bucket_probe_lock:
+        if _bucket_probe_started:
+            return
+        _bucket_probe_started = True
+    # Daemon thread: never delays a request, worker boot or management command exit
+    threading.Thread(target=probe_bucket, name="s3-bucket-probe", daemon=True).start()
+
+
+def bucket_status():
+    return _bucket_status
+
+
+def reset_s3_client():
+    """
+    Drop the shared client and the existence cache (tests, or after forking a worker).
+    """
+    global _s3_client
+    with _s3_client_lock:
+        _s3_client = None
+    _exists_cache.clear()
+
+
 # Import S3 storage only if S3 settings are configured
 if settings.USE_S3_STORAGE:
     from storages.backends.s3boto3 import S3Boto3Storage
-    import boto3
     from botocore.exceptions import ClientError
-    
+
     class MediaStorage(S3Boto3Storage):
         location = ''  # Empty string to keep paths clean
         file_overwrite = False
@@ -20,32 +170,16 @@ if settings.USE_S3_STORAGE:
         querystring_auth = True  # Explicitly enable querystring auth
         querystring_expire = settings.AWS_QUERYSTRING_EXPIRE
         
-        def __init__(self, *args, **kwargs): # Initialize the storage class
-            super().__init__(*args, **kwargs)
-            # Verify S3 credentials and bucket access
-            try: # Try to access the bucket
-                s3 = boto3.client( # Create a client
-                    's3', # Use the S3 service
-                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID, # Access key ID
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY, # Secret access key
-                    region_name=settings.AWS_S3_REGION_NAME # Region name
-                )
-                s3.head_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
-                # Success, but don't log it
-            except ClientError as e:
-                error_code = int(e.response['Error']['Code'])
-                if error_code == 403:
-                    logger.error(f"Access denied to S3 bucket {settings.AWS_STORAGE_BUCKET_NAME}. Check permissions.")
-                elif error_code == 404:
-                    logger.error(f"S3 bucket {settings.AWS_STORAGE_BUCKET_NAME} does not exist.")
-                else:
-                    logger.error(f"Error accessing S3: {str(e)}")
-            except Exception as e:
-                logger.error(f"Error initializing S3 storage: {str(e)}")
-        
         def get_valid_name(self, name):
             # Preserve the original filename
             return get_valid_filename(name)
+
+        @property
+        def connection(self):
+            # Uploads and deletes go through this resource; count its calls per request too
+            connection = super().connection
+            instrument_s3_client(connection.meta.client)
+            return connection
         
         def url(self, name, *args, **kwargs):
             """
@@ -53,22 +187,22 @@ if settings.USE_S3_STORAGE:
             """
             if not name:
                 return ""
+
+            start_bucket_probe()
                 
             try:
-                # Check if the file exists first
+                # Check if the file exists first (cached, so usually no network round-trip)
                 exists_result = self.exists(name)
                 
                 if exists_result:
-                    # File exists, generate URL
+                    # File exists, generate (or reuse a cached) signed URL
+                    from JobMatrix.media import resolve_media_url
                     if isinstance(exists_result, str):
                         # exists() returned an alternate path, use that instead
-                        alt_path = exists_result
-                        # Create a temporary instance to generate URL for alternate path
-                        storage = S3Boto3Storage(location='')
-                        return storage.url(alt_path, *args, **kwargs)
+                        return resolve_media_url(exists_result)
                     else:
                         # File exists at original path, generate URL normally
-                        return super().url(name, *args, **kwargs)
+                        return resolve_media_url(name)
                 else:
                     # File doesn't exist in S3 - return placeholder silently
                     if hasattr(settings, 'DEFAULT_IMAGE_URL'):
@@ -84,17 +218,17 @@ if settings.USE_S3_STORAGE:
             """
             Check if a file exists in S3 storage
             """
+            cached = _exists_cache.get(name)
+            if cached is not None:
+                return cached
+
             try:
-                s3 = boto3.client(
-                    's3',
-                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                    region_name=settings.AWS_S3_REGION_NAME
-                )
+                s3 = get_s3_client()
                 
                 # Try to head the object to check if it exists at the original path
                 try:
                     s3.head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=name)
+                    _exists_cache.set(name, True)
                     return True
                 except ClientError as e:
                     if e.response['Error']['Code'] == '404':
@@ -112,19 +246,34 @@ if settings.USE_S3_STORAGE:
                                     s3.head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=new_path)
                                     # Found in new/ folder! Return it
                                     logger.debug(f"File found at alternate location: {new_path}")
+                                    _exists_cache.set(name, new_path)
                                     return new_path  # Return the alternate path instead of True
                                 except ClientError:
                                     # Not found in new/ folder either
                                     pass
                         
                         # File really doesn't exist
+                        _exists_cache.set(name, False, ttl=EXISTS_NEGATIVE_TTL)
                         return False
-                    # Some other error occurred
+                    # Some other error occurred (not cached, so the next call retries)
                     logger.debug(f"Error checking if file exists in S3 ({name}): {str(e)}")
                     return False
             except Exception as e:
                 logger.debug(f"Unexpected error checking if file exists in S3 ({name}): {str(e)}")
                 return False
+
+        def _save(self, name, content):
+            start_bucket_probe()
+            if bucket_rejected():
+                # Say why, rather than failing with whatever S3 answers to the upload
+                raise ImproperlyConfigured(f"Cannot store {name}: {_bucket_status['error']}")
+            name = super()._save(name, content)
+            _exists_cache.set(name, True)
+            return name
+
+        def delete(self, name):
+            super().delete(name)
+            _exists_cache.set(name, False, ttl=EXISTS_NEGATIVE_TTL)
 else:
     # Fallback to file system storage for development
     class MediaStorage(FileSystemStorage):
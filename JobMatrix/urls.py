@@ -6,6 +6,7 @@ from JobMatrix.views import check_broken_files
 from JobMatrix.views.test_s3 import TestS3View
 
 from JobMatrix.views.admin_dashboard import AdminDashboardCountsView
+from JobMatrix.views.admin_perf import AdminPerfView
 from JobMatrix.views.admin_actions import (
     AdminUserDeleteView,
     AdminCompanyListView,
@@ -32,6 +33,7 @@ urlpatterns = [
 
     # Admin Dashboard
     path('admin/dashboard-insights/', AdminDashboardCountsView.as_view(), name='admin-dashboard-insights'),
+    path('admin/perf/', AdminPerfView.as_view(), name='admin-perf'),
 
     # Admin User Management
     path("admin/users/all/", UserListView.as_view(), name="get-all-users-for-admin"),
@@ -8,7 +8,7 @@ from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from JobMatrix.models import User, Applicant, Company
 from JobMatrix.permissions import IsAdmin
-import boto3
+from JobMatrix.storage_backends import get_s3_client
 from botocore.exceptions import ClientError
 from django.conf import settings
 import logging
@@ -33,13 +33,8 @@ def check_broken_files(request):
         if not settings.USE_S3_STORAGE:
             return Response({"message": "S3 storage is not enabled. This check is only needed for S3."})
             
-        # Initialize S3 client
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME
-        )
+        # Shared S3 client (bypasses the existence cache on purpose: this check wants fresh answers)
+        s3 = get_s3_client()
         
         # Check User profile photos
         users = User.objects.exclude(user_profile_photo='').exclude(user_profile_photo__isnull=True)
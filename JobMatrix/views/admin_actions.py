@@ -1,11 +1,14 @@
+import logging
 from django.utils import timezone
 
 from rest_framework.views import APIView
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from JobMatrix.models import User, Applicant, Application, Bookmark, Skill, WorkExperience, Education
 from JobMatrix.auth_backend import JWTAuthentication
 from JobMatrix.permissions import IsAdmin
-from JobMatrix.utils import get_full_url
+
+logger = logging.getLogger(__name__)
 
 
 class AdminUserDeleteView(APIView):
@@ -18,18 +21,20 @@ class AdminUserDeleteView(APIView):
 
             # Only allow deletion of applicants (as per requirements)
             if user.user_role == 'APPLICANT':
-                applicant = Applicant.objects.filter(applicant_id=user.user_id).first()
-                if applicant:
-                    # Delete all related data
-                    Skill.objects.filter(applicant_id=applicant).delete()
-                    Education.objects.filter(applicant_id=applicant).delete()
-                    WorkExperience.objects.filter(applicant_id=applicant).delete()
-                    Bookmark.objects.filter(applicant_id=applicant).delete()
-                    Application.objects.filter(applicant_id=applicant).delete()
-                    applicant.delete()
-
-                # Delete user record
-                user.delete()
+                # One transaction, so the jobs' application counters drop with the applications
+                with transaction.atomic():
+                    applicant = Applicant.objects.filter(applicant_id=user.user_id).first()
+                    if applicant:
+                        # Delete all related data
+                        Skill.objects.filter(applicant_id=applicant).delete()
+                        Education.objects.filter(applicant_id=applicant).delete()
+                        WorkExperience.objects.filter(applicant_id=applicant).delete()
+                        Bookmark.objects.filter(applicant_id=applicant).delete()
+                        Application.objects.filter(applicant_id=applicant).delete()
+                        applicant.delete()
+
+                    # Delete user record
+                    user.delete()
 
                 return Response({
                     "message": "Applicant and all related data deleted successfully",
@@ -49,123 +54,71 @@ class AdminUserDeleteView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+from itertools import chain, islice
+
+from django.http import StreamingHttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from JobMatrix.models import Company, Recruiter, Job, User
+from rest_framework.utils.encoders import JSONEncoder
+from JobMatrix.company_stats import admin_company_entries, company_queryset, iter_admin_company_entries
 from JobMatrix.auth_backend import JWTAuthentication
+from JobMatrix.pagination import KeysetPagination
 from JobMatrix.permissions import IsAdmin
 
 
+class AdminCompanyPagination(KeysetPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
 class AdminCompanyListView(APIView):
+    """
+    Companies with their recruiters and job counts, for the admin companies screen.
+
+    - With `page`, `page_size`, `pagination=cursor` or `cursor`: one page of companies
+      plus the pagination fields (total_count, next, previous, current_page, total_pages).
+    - Otherwise: every company, streamed in batches of stream_batch_size so the
+      response starts immediately and memory stays flat. A failure before the first
+      batch is a regular 500. A failure in a later batch comes after the 200 status
+      has been sent: the body then stops short of valid JSON and the connection is
+      dropped, so a body that does not parse means the list is incomplete.
+
+    Either way each batch costs one query for the companies and one GROUP BY for
+    their recruiters and job counts (see JobMatrix/company_stats.py).
+    """
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAdmin]
+    pagination_class = AdminCompanyPagination
+    keyset_ordering = ('company_id',)
+    stream_batch_size = 200
+
+    success_message = "Companies with recruiters and job counts fetched successfully"
 
     def get(self, request):
         try:
-            # Get all companies
-            companies = Company.objects.all()
-
-            # Prepare the response data
-            response_data = []
-
-            for company in companies:
-                # Get all recruiters for this company with recruiter_is_active filter
-                recruiters = Recruiter.objects.filter(
-                    company_id=company.company_id
-                ).select_related('recruiter_id')
-
-                # Get the active and inactive recruiters
-                active_recruiters = [r for r in recruiters if r.recruiter_is_active]
-                inactive_recruiters = [r for r in recruiters if not r.recruiter_is_active]
-
-                # Get all recruiter IDs (both active and inactive)
-                all_recruiter_ids = [r.recruiter_id.user_id for r in recruiters]
-
-                # Count total jobs for this company from all its recruiters (active and inactive)
-                total_jobs = Job.objects.filter(recruiter_id__in=recruiters).count()
-
-                # Build recruiter data
-                active_recruiter_data = []
-                for recruiter in active_recruiters:
-                    # Get user details
-                    user = recruiter.recruiter_id
-
-                    # Count jobs by this specific recruiter
-                    recruiter_job_count = Job.objects.filter(recruiter_id=recruiter).count()
-
-                    # Use get_full_url for profile_photo
-                    profile_photo = None
-                    if user.user_profile_photo:
-                        if hasattr(user.user_profile_photo, 'name'):
-                            profile_photo = get_full_url(user.user_profile_photo.name)
-                        else:
-                            profile_photo = get_full_url(str(user.user_profile_photo))
-
-                    active_recruiter_data.append({
-                        'recruiter_id': user.user_id,
-                        'name': f"{user.user_first_name} {user.user_last_name}",
-                        'email': user.user_email,
-                        'phone': user.user_phone,
-                        'profile_photo': profile_photo,
-                        'start_date': recruiter.recruiter_start_date,
-                        'job_count': recruiter_job_count
-                    })
-
-                # Build inactive recruiter data
-                inactive_recruiter_data = []
-                for recruiter in inactive_recruiters:
-                    user = recruiter.recruiter_id
-                    # Count jobs by this inactive recruiter
-                    recruiter_job_count = Job.objects.filter(recruiter_id=recruiter).count()
-                    
-                    # Use get_full_url for profile_photo
-                    profile_photo = None
-                    if user.user_profile_photo:
-                        if hasattr(user.user_profile_photo, 'name'):
-                            profile_photo = get_full_url(user.user_profile_photo.name)
-                        else:
-                            profile_photo = get_full_url(str(user.user_profile_photo))
-                            
-                    inactive_recruiter_data.append({
-                        'recruiter_id': user.user_id,
-                        'name': f"{user.user_first_name} {user.user_last_name}",
-                        'email': user.user_email,
-                        'phone': user.user_phone,
-                        'profile_photo': profile_photo,
-                        'start_date': recruiter.recruiter_start_date,
-                        'end_date': recruiter.recruiter_end_date,
-                        'job_count': recruiter_job_count
-                    })
-
-                # Use get_full_url for company_image
-                company_image = None
-                if company.company_image:
-                    if hasattr(company.company_image, 'name'):
-                        company_image = get_full_url(company.company_image.name)
-                    else:
-                        company_image = get_full_url(str(company.company_image))
-
-                # Add company data to response
-                company_data = {
-                    'company_id': company.company_id,
-                    'company_name': company.company_name,
-                    'company_industry': company.company_industry,
-                    'company_description': company.company_description,
-                    'company_image': company_image,
-                    'active_recruiters_count': len(active_recruiters),
-                    'inactive_recruiters_count': len(inactive_recruiters),
-                    'total_jobs': total_jobs,
-                    'active_recruiters': active_recruiter_data,
-                    'inactive_recruiters': inactive_recruiter_data
-                }
-
-                response_data.append(company_data)
+            queryset = company_queryset().order_by('company_id')
+
+            paginator = self.pagination_class()
+            paginated_params = {
+                paginator.page_query_param,
+                paginator.page_size_query_param,
+                paginator.mode_query_param,
+                paginator.cursor_query_param,
+            }
+            if paginated_params.intersection(request.query_params):
+                companies = paginator.paginate_queryset(queryset, request, view=self)
+                return Response({
+                    "message": self.success_message,
+                    **paginator.get_page_metadata(),
+                    "data": admin_company_entries(companies)
+                }, status=status.HTTP_200_OK)
 
-            return Response({
-                "message": "Companies with recruiters and job counts fetched successfully",
-                "data": response_data
-            }, status=status.HTTP_200_OK)
+            # The first batch is read here, so a failing query still gets a 500 response
+            entries = iter_admin_company_entries(queryset, batch_size=self.stream_batch_size)
+            first_batch = list(islice(entries, self.stream_batch_size))
+            return StreamingHttpResponse(self.stream(chain(first_batch, entries)), content_type='application/json')
 
         except Exception as e:
             return Response({
@@ -174,6 +127,20 @@ class AdminCompanyListView(APIView):
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def stream(self, entries):
+        # Same body as a regular {"message": ..., "data": [...]} response, written one company at a time
+        encoder = JSONEncoder()
+        yield '{"message": %s, "data": [' % encoder.encode(self.success_message)
+        try:
+            for index, entry in enumerate(entries):
+                yield (',' if index else '') + encoder.encode(entry)
+        except Exception as e:
+            # The 200 status is sent by now. Leave the JSON unterminated and let the server abort the
+            # response, so no client can take the companies sent so far for the complete list
+            logger.error(f"Error streaming companies: {str(e)}")
+            raise
+        yield ']}'
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -256,9 +223,10 @@ class AdminJobDeleteView(APIView):
         try:
             job = get_object_or_404(Job, job_id=job_id)
 
-            Bookmark.objects.filter(job_id=job).delete()
-            Application.objects.filter(job_id=job).delete()
-            job.delete()
+            with transaction.atomic():
+                Bookmark.objects.filter(job_id=job).delete()
+                Application.objects.filter(job_id=job).delete()
+                job.delete()
 
             return Response({
                 "message": "Job and related data deleted successfully",
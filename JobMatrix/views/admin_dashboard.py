@@ -1,10 +1,7 @@
-from datetime import timedelta
-from django.utils.timezone import now
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Count, Q
-from JobMatrix.models import User, Company, Job, Admin, Applicant, Recruiter, Application, Bookmark
+from JobMatrix.dashboard_metrics import read_dashboard_metrics
 from JobMatrix.auth_backend import JWTAuthentication
 from JobMatrix.permissions import IsAdmin
 
@@ -14,24 +11,25 @@ class AdminDashboardCountsView(APIView):
 
     def get(self, request):
         try:
-            today = now()
-            last_week = today - timedelta(days=7)
+            # Single read of the precomputed rollup table (see JobMatrix/dashboard_metrics.py)
+            metrics = read_dashboard_metrics()
+            totals = metrics["totals"]
 
             # Base counts
-            total_users = User.objects.count()
-            total_applicants = Applicant.objects.count()
-            total_recruiters = Recruiter.objects.count()
-            total_admins = Admin.objects.count()
+            total_users = totals["users"]
+            total_applicants = totals["applicants"]
+            total_recruiters = totals["recruiters"]
+            total_admins = totals["admins"]
 
-            total_companies = Company.objects.count()
-            total_jobs = Job.objects.count()
-            total_bookmarks = Bookmark.objects.count()
-            total_applications = Application.objects.count()
+            total_companies = totals["companies"]
+            total_jobs = totals["jobs"]
+            total_bookmarks = totals["bookmarks"]
+            total_applications = totals["applications"]
 
-            # New this week
-            new_users = User.objects.filter(user_created_date__gte=last_week).count()
-            new_jobs = Job.objects.filter(job_date_posted__gte=last_week).count()
-            new_admins = User.objects.filter(user_created_date__gte=last_week, user_role='admin').count()
+            # New this week (today and the previous six days)
+            new_users = metrics["new_this_week"]["new_users"]
+            new_jobs = metrics["new_this_week"]["new_jobs"]
+            new_admins = metrics["new_this_week"]["new_admins"]
 
             # NOTE: Company created date is not available, so we skip trend for it
             new_companies = None
@@ -42,18 +40,12 @@ class AdminDashboardCountsView(APIView):
                 return round((new_count / total) * 100, 2)
 
             # Industry-wise job distribution
-            job_distribution_qs = (
-                Job.objects.values('recruiter_id__company_id__company_industry')
-                .annotate(count=Count('job_id'))
-                .order_by('-count')
-            )
-
             job_distribution = [
                 {
-                    "industry_type": entry["recruiter_id__company_id__company_industry"],
-                    "count": entry["count"]
+                    "industry_type": industry,
+                    "count": count
                 }
-                for entry in job_distribution_qs
+                for industry, count in sorted(metrics["industry_jobs"].items(), key=lambda item: -item[1])
             ]
 
             data = {
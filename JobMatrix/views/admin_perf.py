@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from JobMatrix.auth_backend import JWTAuthentication
+from JobMatrix.permissions import IsAdmin
+from JobMatrix.perf import PERF_INSTRUMENTATION, registry
+
+
+class AdminPerfView(APIView):
+    """
+    Per-endpoint request statistics of this server process (see JobMatrix/perf.py).
+    GET returns them; DELETE starts a new measurement window.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response({
+            "message": "Performance statistics fetched successfully",
+            "data": {
+                "enabled": PERF_INSTRUMENTATION,
+                "since": datetime.fromtimestamp(registry.since, tz=timezone.utc).isoformat(),
+                "endpoints": registry.snapshot()
+            }
+        }, status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        registry.reset()
+        return Response({
+            "message": "Performance statistics reset",
+            "data": {}
+        }, status=status.HTTP_200_OK)
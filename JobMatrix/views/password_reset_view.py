@@ -226,8 +226,10 @@ class ChangePasswordView(APIView):
             user.user_password = make_password(new_password)
             user.save()
 
+            # Changing the password revokes existing tokens, so hand back a fresh one
             return Response({
-                'message': 'Password changed successfully'
+                'message': 'Password changed successfully',
+                'token': JWTAuthentication.generate_jwt(user)
             }, status=status.HTTP_200_OK)
 
         except Exception as e:
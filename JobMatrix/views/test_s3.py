@@ -6,6 +6,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings
 from ..utils import get_full_url
+from ..storage_backends import bucket_status
 
 class TestS3View(APIView):
     """
@@ -21,7 +22,8 @@ class TestS3View(APIView):
             "formatted_url": get_full_url(test_url),
             "bucket_name": settings.AWS_STORAGE_BUCKET_NAME if settings.USE_S3_STORAGE else None,
             "region": settings.AWS_S3_REGION_NAME if settings.USE_S3_STORAGE else None,
-            "media_url_setting": settings.MEDIA_URL
+            "media_url_setting": settings.MEDIA_URL,
+            "bucket_probe": bucket_status() if settings.USE_S3_STORAGE else None
         }
         
         return Response(result, status=status.HTTP_200_OK) 
\ No newline at end of file
@@ -6,6 +6,11 @@ from django.shortcuts import get_object_or_404
 from pymysql import DatabaseError
 from rest_framework import generics, status
 from rest_framework.pagination import PageNumberPagination
+from JobMatrix.pagination import KeysetPagination
+from JobMatrix.application_stats import application_counts
+from JobMatrix.company_stats import company_recruiter_stats
+from JobMatrix.conditional import COMPANIES, ConditionalGetMixin
+from JobMatrix.media import resolve_media_urls
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -19,7 +24,7 @@ from Profile.serializers import *
 from Job.serializers import *
 import os
 
-class CustomPagination(PageNumberPagination):
+class CustomPagination(KeysetPagination):
     page_size = 9
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -421,9 +426,14 @@ class RecruiterDetailsUpdateView(generics.UpdateAPIView):
         self.perform_update(serializer)
         return Response(serializer.data)
 
-class CompanyListView(generics.ListAPIView):
+class CompanyListView(ConditionalGetMixin, generics.ListAPIView):
     queryset = Company.objects.all()
     serializer_class = CompanySerializerForResponse
+    # Applicants and recruiters browse companies but don't edit them, so they may reuse the list for a minute
+    cache_max_age = {"APPLICANT": 60, "RECRUITER": 60}
+
+    def get_version_keys(self):
+        return [COMPANIES]
 
 
 class CompanyJobsListView(generics.ListAPIView):
@@ -435,6 +445,7 @@ class CompanyJobsListView(generics.ListAPIView):
     serializer_class = JobListSerializer
     authentication_classes = [JWTAuthentication]
     pagination_class = CustomPagination
+    keyset_ordering = ('-job_date_posted', '-job_id')
 
     def get_queryset(self):
         user = self.request.user
@@ -454,8 +465,11 @@ class CompanyJobsListView(generics.ListAPIView):
                 company_id=company
             ).values_list('recruiter_id', flat=True)
 
-            # Get all jobs posted by any recruiter (active or inactive) from this company
-            queryset = Job.objects.filter(recruiter_id__in=recruiter_ids).order_by('-job_date_posted')
+            # Get all jobs posted by any recruiter (active or inactive) from this company,
+            # with the poster's USER row joined for recruiter_name
+            queryset = Job.objects.filter(recruiter_id__in=recruiter_ids).select_related(
+                'recruiter_id__recruiter_id'
+            ).order_by('-job_date_posted', '-job_id')
 
             # Apply filters from query parameters
             min_salary = self.request.query_params.get('min_salary')
@@ -536,58 +550,18 @@ class CompanyJobsListView(generics.ListAPIView):
             # Check if response contains paginated data
             if isinstance(response.data, dict) and 'results' in response.data:
                 # Get pagination info
-                count = response.data.get('count', 0)
-                next_link = response.data.get('next', None)
-                previous_link = response.data.get('previous', None)
-                page_size = self.paginator.page_size
-                current_page = request.query_params.get(self.paginator.page_query_param, 1)
-
-                try:
-                    current_page = int(current_page)
-                except (ValueError, TypeError):
-                    current_page = 1
-
-                total_pages = (count + page_size - 1) // page_size if page_size > 0 else 0
+                pagination = self.paginator.get_page_metadata()
 
                 # Get application stats for each job
                 job_results = response.data.get('results', [])
                 job_ids = [job['job_id'] for job in job_results]
 
-                # Get all applications for these jobs in a single query
-                applications = Application.objects.filter(job_id__in=job_ids)
-
-                # Create a dictionary to store stats for each job
-                job_stats = {}
-                for app in applications:
-                    job_id = app.job_id_id
-                    if job_id not in job_stats:
-                        job_stats[job_id] = {
-                            'total_applications': 0,
-                            'approved_applications': 0,
-                            'rejected_applications': 0,
-                            'pending_applications': 0
-                        }
-
-                    job_stats[job_id]['total_applications'] += 1
-                    if app.application_status == "APPROVED":
-                        job_stats[job_id]['approved_applications'] += 1
-                    elif app.application_status == "REJECTED":
-                        job_stats[job_id]['rejected_applications'] += 1
-                    elif app.application_status == "PENDING":
-                        job_stats[job_id]['pending_applications'] += 1
+                # Total and per-status application counts for the page's jobs in one query
+                job_stats = application_counts(job_ids)
 
                 # Add stats to each job in the results
                 for job in job_results:
-                    job_id = job['job_id']
-                    if job_id in job_stats:
-                        job.update(job_stats[job_id])
-                    else:
-                        job.update({
-                            'total_applications': 0,
-                            'approved_applications': 0,
-                            'rejected_applications': 0,
-                            'pending_applications': 0
-                        })
+                    job.update(job_stats[job['job_id']])
 
                 # Create a custom response with additional info
                 company = recruiter.company_id
@@ -596,11 +570,7 @@ class CompanyJobsListView(generics.ListAPIView):
                     'message': f"All jobs for {company.company_name} retrieved successfully, including those posted by inactive recruiters",
                     'company_name': company.company_name,
                     'company_id': company.company_id,
-                    'total_count': count,
-                    'next': next_link,
-                    'previous': previous_link,
-                    'current_page': current_page,
-                    'total_pages': total_pages,
+                    **pagination,
                     'results': job_results
                 }
 
@@ -813,7 +783,14 @@ class UserListView(generics.ListAPIView):
     - Supports filtering by user_role (APPLICANT, RECRUITER, ADMIN)
     - Supports search by name and email
     """
-    queryset = User.objects.all().order_by('-user_created_date')
+    # Load every role's profile rows in a fixed number of queries per page:
+    # one-to-one profiles (and the recruiter's company) are joined, and the
+    # applicant collections are prefetched for the applicants on the page only
+    queryset = User.objects.select_related(
+        'applicant', 'recruiter__company_id', 'admin'
+    ).prefetch_related(
+        'applicant__skills', 'applicant__work_experience', 'applicant__education'
+    ).order_by('-user_created_date', '-user_id')
     serializer_class = AdminUserListSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAdmin]
@@ -843,24 +820,25 @@ class RecruiterCompanyDetailView(APIView):
 
     def get(self, request):
         try:
-            # Get the currently authenticated recruiter - this was causing the error
-            # We need to query by the user's ID, not the user object itself
-            current_recruiter = Recruiter.objects.get(recruiter_id_id=request.user.user_id)
-
-            # Get the company details
+            # Get the currently authenticated recruiter together with their company
+            current_recruiter = Recruiter.objects.select_related('company_id').get(
+                recruiter_id_id=request.user.user_id
+            )
             company = current_recruiter.company_id
 
-            # Use get_full_url for company image
-            company_image_url = None
-            if company.company_image:
-                try:
-                    if hasattr(company.company_image, 'name'):
-                        company_image_url = get_full_url(company.company_image.name)
-                    else:
-                        company_image_url = get_full_url(str(company.company_image))
-                except Exception as e:
-                    logger.error(f"Error generating URL for company_image: {str(e)}")
-                    company_image_url = None
+            # Recruiters (joined to USER) with their job counts, ordered by activity status
+            # and then by jobs posted, plus the company totals: one GROUP BY, or a cached snapshot
+            company_stats = company_recruiter_stats(company.company_id)
+            recruiters = company_stats["recruiters"]
+
+            # Resolve the company image and every profile photo in one pass
+            media_urls = resolve_media_urls(
+                [company.company_image.name if company.company_image else None]
+                + [recruiter["recruiter_id__user_profile_photo"] for recruiter in recruiters]
+            )
+
+            def media_url(key):
+                return media_urls.get(key.lstrip('/')) if key else None
 
             # Prepare company data
             company_data = {
@@ -868,69 +846,32 @@ class RecruiterCompanyDetailView(APIView):
                 "company_name": company.company_name,
                 "company_industry": company.company_industry,
                 "company_description": company.company_description,
-                "company_image": company_image_url
+                "company_image": media_url(company.company_image.name) if company.company_image else None
             }
 
-            # Get all recruiters for this company
-            recruiters = Recruiter.objects.filter(company_id=company)
-
-            # Get total jobs count for the company
-            # Use recruiter_id_id field for job counting
-            total_jobs = Job.objects.filter(
-                recruiter_id__in=recruiters
-            ).count()
-
             # Prepare recruiter data with job counts
-            recruiter_data = []
-            for recruiter in recruiters:
-                # Get User model information
-                user = User.objects.get(user_id=recruiter.recruiter_id_id)
-
-                # Count jobs by this recruiter
-                recruiter_job_count = Job.objects.filter(recruiter_id=recruiter).count()
-
-                # Get profile photo URL using get_full_url
-                profile_photo_url = None
-                if user.user_profile_photo:
-                    try:
-                        if hasattr(user.user_profile_photo, 'name'):
-                            profile_photo_url = get_full_url(user.user_profile_photo.name)
-                        else:
-                            profile_photo_url = get_full_url(str(user.user_profile_photo))
-                    except Exception as e:
-                        logger.error(f"Error generating URL for profile_photo: {str(e)}")
-                        profile_photo_url = None
-
-                # Add recruiter info to the list
-                recruiter_data.append({
-                    "recruiter_id": recruiter.recruiter_id_id,
-                    "user_email": user.user_email,
-                    "user_first_name": user.user_first_name,
-                    "user_last_name": user.user_last_name,
-                    "profile_photo": profile_photo_url,
-                    "is_active": recruiter.recruiter_is_active,
-                    "start_date": recruiter.recruiter_start_date.strftime(
-                        '%Y-%m-%d') if recruiter.recruiter_start_date else None,
-                    "end_date": recruiter.recruiter_end_date.strftime(
-                        '%Y-%m-%d') if recruiter.recruiter_end_date else None,
-                    "jobs_posted": recruiter_job_count,
-                    "is_current_user": recruiter.recruiter_id_id == request.user.user_id
-                })
-
-            # Sort recruiters by activity status and then by jobs posted
-            recruiter_data = sorted(
-                recruiter_data,
-                key=lambda x: (-x["is_active"], -x["jobs_posted"])
-            )
+            recruiter_data = [
+                {
+                    "recruiter_id": recruiter["recruiter_id"],
+                    "user_email": recruiter["recruiter_id__user_email"],
+                    "user_first_name": recruiter["recruiter_id__user_first_name"],
+                    "user_last_name": recruiter["recruiter_id__user_last_name"],
+                    "profile_photo": media_url(recruiter["recruiter_id__user_profile_photo"]),
+                    "is_active": recruiter["recruiter_is_active"],
+                    "start_date": recruiter["recruiter_start_date"].strftime(
+                        '%Y-%m-%d') if recruiter["recruiter_start_date"] else None,
+                    "end_date": recruiter["recruiter_end_date"].strftime(
+                        '%Y-%m-%d') if recruiter["recruiter_end_date"] else None,
+                    "jobs_posted": recruiter["job_count"],
+                    "is_current_user": recruiter["recruiter_id"] == request.user.user_id
+                }
+                for recruiter in recruiters
+            ]
 
             # Prepare response data
             response_data = {
                 "company": company_data,
-                "stats": {
-                    "total_recruiters": len(recruiter_data),
-                    "active_recruiters": sum(1 for r in recruiter_data if r["is_active"]),
-                    "total_jobs": total_jobs
-                },
+                "stats": company_stats["stats"],
                 "recruiters": recruiter_data
             }
 
@@ -3,6 +3,10 @@ from Profile.views import *
 
 urlpatterns = [
 
+    # ------------------------- Applicant Profile ------------------------
+
+    path("applicant/<int:user_id>/", ApplicantProfileView.as_view(), name="applicant-profile"),
+
     # ------------------------- Work Experience ------------------------
 
     path("work-experience/create/", WorkExperienceCreateView.as_view(), name="create-work-experience"),
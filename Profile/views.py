@@ -1,21 +1,43 @@
 from django.shortcuts import render
 from rest_framework import generics, status, serializers
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, BasePermission
 from django.utils import timezone
 from .serializers import WorkExperienceSerializer, EducationSerializer, SkillSerializer
-from JobMatrix.models import Applicant, User, WorkExperience, Education, Skill
+from JobMatrix.models import Applicant, ApplicantExperienceSummary, User, WorkExperience, Education, Skill
 from collections import defaultdict
+from datetime import date
 from JobMatrix.auth_backend import JWTAuthentication
+from JobMatrix.conditional import (
+    APPLICANT_PROFILE, ConditionalGetMixin, applicant_profile_etag, etag_matches, not_modified, set_validators,
+    version_key,
+)
+from JobMatrix.experience import DAYS_PER_MONTH, experience_summary, format_duration, total_days, total_duration, up_to_date
+from JobMatrix.serializers import ApplicantSerializer, UserSerializerForResponse
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
-from datetime import datetime, timedelta
 from django.core.exceptions import FieldError
 
 
 
 User = get_user_model()
 
+
+class OwnProfileConditionalMixin(ConditionalGetMixin):
+    """
+    Conditional GET for the lists of a user's own profile rows; owner_kwarg names the URL kwarg
+    holding the user id. Requests for someone else's rows are refused by the view and left alone here.
+    """
+    owner_kwarg = 'user_id'
+
+    def get_version_keys(self):
+        owner_id = self.kwargs.get(self.owner_kwarg)
+        if str(owner_id) != str(self.request.user.user_id):
+            return None
+        return [version_key(APPLICANT_PROFILE, owner_id)]
+
 # ================================================
 # WORK EXPERIENCE VIEW
 # ================================================
@@ -44,89 +66,45 @@ class WorkExperienceCreateView(generics.CreateAPIView):
             headers=headers
         )
 
-class UserWorkExperienceListView(generics.ListAPIView):
+def with_experience_durations(items, summary):
+    """
+    Serialized work experience items with their experience_duration, and the total experience
+    fields, from the applicant's experience summary (None if they have no work experience).
+    """
+    role_durations = summary.summary_roles if summary else {}
+    processed_data = []
+    for item in items:
+        duration = role_durations.get(str(item['work_experience_id']), (0, 0, 0))
+        item['experience_duration'] = format_duration(*duration)
+        processed_data.append(item)
+
+    if summary:
+        total = total_duration(summary)
+        days = total_days(summary.summary_closed_days, summary.summary_ongoing_since)
+    else:
+        total, days = (0, 0, 0), 0
+    return processed_data, {
+        "total_experience": format_duration(*total),
+        "total_experience_months": int(days / DAYS_PER_MONTH),
+    }
+
+
+class UserWorkExperienceListView(OwnProfileConditionalMixin, generics.ListAPIView):
     serializer_class = WorkExperienceSerializer
     permission_classes = [IsAuthenticated]
     authentication_classes = [JWTAuthentication]
 
+    def get_validator_extras(self):
+        # Durations of ongoing roles grow daily
+        return [date.today().isoformat()]
+
     def get_queryset(self):
         user_id = self.kwargs.get('user_id')
         if not user_id:
             return WorkExperience.objects.none()
 
-        try:
-            applicant = Applicant.objects.get(applicant_id=user_id)
-            return WorkExperience.objects.filter(applicant_id=applicant)
-        except Applicant.DoesNotExist:
-            return WorkExperience.objects.none()
-
-    def parse_date(self, date_string):
-        if not date_string or date_string == 'Present':
-            return None
-
-        formats_to_try = [
-            '%Y-%m-%d',
-            '%Y-%m-%dT%H:%M:%S.%fZ',
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%d/%m/%Y',
-            '%m/%d/%Y'
-        ]
-
-        for date_format in formats_to_try:
-            try:
-                return datetime.strptime(date_string, date_format)
-            except ValueError:
-                continue
-
-        return None
-
-    def calculate_experience_duration(self, start_date_str, end_date_str=None):
-
-        start_date = self.parse_date(start_date_str)
-        if not start_date:
-            return {"years": 0, "months": 0, "days": 0}
-
-        if not end_date_str or end_date_str == 'Present':
-            end_date = datetime.now()
-        else:
-            end_date = self.parse_date(end_date_str)
-            if not end_date:
-                end_date = datetime.now()
-
-        if hasattr(start_date, 'date'):
-            start_date = start_date.date()
-        if hasattr(end_date, 'date'):
-            end_date = end_date.date()
-
-        if start_date > end_date:
-            return {"years": 0, "months": 0, "days": 0}
-
-        years = end_date.year - start_date.year
-
-        if (end_date.month, end_date.day) < (start_date.month, start_date.day):
-            years -= 1
-
-        months = end_date.month - start_date.month
-        if months < 0:
-            months += 12
-
-        if end_date.day < start_date.day:
-            months = (months - 1) % 12
-
-        comparison_day = min(start_date.day, [31, 29 if end_date.year % 4 == 0 and (
-                    end_date.year % 100 != 0 or end_date.year % 400 == 0) else 28, 31, 30, 31, 30, 31, 31, 30, 31, 30,
-                                              31][end_date.month - 1])
-
-        if end_date.day >= start_date.day:
-            days = end_date.day - start_date.day
-        else:
-            days = end_date.day + (comparison_day - start_date.day)
-
-        return {
-            "years": years,
-            "months": months,
-            "days": days
-        }
+        # A user without an applicant profile has no rows, so no separate lookup of the applicant
+        return WorkExperience.objects.filter(applicant_id=user_id)
 
     def list(self, request, *args, **kwargs):
         user_id = self.kwargs.get('user_id')
@@ -155,54 +133,14 @@ class UserWorkExperienceListView(generics.ListAPIView):
         queryset = self.get_queryset()
         serializer = self.get_serializer(queryset, many=True)
 
-        processed_data = []
-
-        total_years = 0
-        total_months = 0
-        total_days = 0
-
-        for item in serializer.data:
-            start_date = item.get('work_experience_start_date')
-            end_date = item.get('work_experience_end_date')
-
-            duration = self.calculate_experience_duration(start_date, end_date)
-
-            total_years += duration['years']
-            total_months += duration['months']
-            total_days += duration['days']
-
-            experience_parts = []
-            if duration['years'] > 0:
-                experience_parts.append(f"{duration['years']} years")
-            if duration['months'] > 0:
-                experience_parts.append(f"{duration['months']} months")
-            if duration['days'] > 0:
-                experience_parts.append(f"{duration['days']} days")
-
-            experience_str = ", ".join(experience_parts) if experience_parts else "0 days"
-            item['experience_duration'] = experience_str
-            processed_data.append(item)
-
-        total_months += total_days // 30
-        total_days = total_days % 30
-        total_years += total_months // 12
-        total_months = total_months % 12
-
-        total_parts = []
-        if total_years > 0:
-            total_parts.append(f"{total_years} years")
-        if total_months > 0:
-            total_parts.append(f"{total_months} months")
-        if total_days > 0:
-            total_parts.append(f"{total_days} days")
-
-        total_exp_str = ", ".join(total_parts) if total_parts else "0 days"
+        # Role durations and the total (overlapping roles counted once) come from the precomputed summary
+        processed_data, totals = with_experience_durations(serializer.data, experience_summary(user_id))
 
         return Response({
             "status": "success",
             "message": "Work experience records retrieved successfully",
             "data": processed_data,
-            "total_experience": total_exp_str
+            **totals,
         })
 
 class WorkExperienceUpdateView(generics.UpdateAPIView):
@@ -368,7 +306,7 @@ class ApplicantSkillCreateView(generics.CreateAPIView):
                 "errors": serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
 
-class ApplicantSkillListView(generics.ListAPIView):
+class ApplicantSkillListView(OwnProfileConditionalMixin, generics.ListAPIView):
     """
     API view for listing skills of an applicant
     Only the applicant can view their own skills
@@ -376,6 +314,7 @@ class ApplicantSkillListView(generics.ListAPIView):
     serializer_class = SkillSerializer
     permission_classes = [IsAuthenticated]
     authentication_classes = [JWTAuthentication]
+    owner_kwarg = 'applicant_id'
 
     def get_queryset(self):
         # By default, empty queryset
@@ -621,7 +560,7 @@ class ApplicantEducationCreateView(generics.CreateAPIView):
                 "errors": serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
 
-class UserEducationListView(generics.ListAPIView):
+class UserEducationListView(OwnProfileConditionalMixin, generics.ListAPIView):
     """
     API view for retrieving the current user's education details.
     Users can only access their own education details.
@@ -781,3 +720,67 @@ class UserEducationDetailView(generics.RetrieveUpdateDestroyAPIView):
                 "status": "error",
                 "message": f"Failed to delete education record: {str(e)}"
             }, status=status.HTTP_400_BAD_REQUEST)
+
+
+# ================================================
+# APPLICANT PROFILE VIEW
+# ================================================
+
+class ApplicantProfileView(APIView):
+    """
+    An applicant's whole profile (user, resume, skills, education and work experience) in one
+    response, for the applicant, recruiters and admins. Built with four queries; a request whose
+    If-None-Match holds the current ETag gets 304 without the profile being loaded.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request, user_id):
+        if request.user.user_role not in ('ADMIN', 'RECRUITER') and request.user.user_id != user_id:
+            return Response({
+                "status": "error",
+                "message": "You can only view your own profile"
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        etag = applicant_profile_etag(user_id)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        applicant = (
+            Applicant.objects.filter(applicant_id=user_id)
+            .select_related('applicant_id', 'experience_summary')
+            .prefetch_related(
+                Prefetch('skills', queryset=Skill.objects.order_by('skill_id')),
+                Prefetch('education', queryset=Education.objects.order_by('-education_start_date', '-education_id')),
+                Prefetch('work_experience', queryset=WorkExperience.objects.order_by(
+                    '-work_experience_start_date', '-work_experience_id'
+                )),
+            )
+            .first()
+        )
+        if applicant is None:
+            return Response({
+                "status": "error",
+                "message": "Applicant not found"
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            summary = up_to_date(applicant.experience_summary)
+        except ApplicantExperienceSummary.DoesNotExist:
+            summary = None
+        work_experience, totals = with_experience_durations(
+            WorkExperienceSerializer(applicant.work_experience.all(), many=True).data, summary
+        )
+
+        return set_validators(Response({
+            "status": "success",
+            "message": "Applicant profile retrieved successfully",
+            "data": {
+                "user": UserSerializerForResponse(applicant.applicant_id).data,
+                "applicant_resume": ApplicantSerializer(applicant).data["applicant_resume"],
+                "skills": SkillSerializer(applicant.skills.all(), many=True).data,
+                "education": EducationSerializer(applicant.education.all(), many=True).data,
+                "work_experience": work_experience,
+                **totals,
+            }
+        }), etag)
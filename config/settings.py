@@ -34,6 +34,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "JobMatrix.perf.PerformanceMiddleware",  # First, so its timings cover the whole stack
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -161,6 +162,40 @@ JWT_SECRET= config("JWT_SECRET")
 JWT_ALGORITHM= config("JWT_ALGORITHM")
 JWT_EXPIRATION_DAYS= config("JWT_EXPIRATION_DAYS")
 
+# Authenticated-user (principal) cache, see JobMatrix/principal.py. Invalidation
+# only reaches the shared cache and the writing process's own copy, so other
+# workers may accept a revoked token, an old role or a deactivated recruiter for
+# up to PRINCIPAL_LOCAL_CACHE_TTL seconds; keep it short.
+PRINCIPAL_LOCAL_CACHE_TTL = config("PRINCIPAL_LOCAL_CACHE_TTL", default=5, cast=int)  # seconds, per process
+PRINCIPAL_CACHE_TTL = config("PRINCIPAL_CACHE_TTL", default=60, cast=int)  # seconds, shared cache
+PRINCIPAL_CACHE_SIZE = config("PRINCIPAL_CACHE_SIZE", default=10000, cast=int)
+PRINCIPAL_CACHE_ALIAS = config("PRINCIPAL_CACHE_ALIAS", default=None)  # optional shared CACHES alias
+
+# Cached recruiter/job stats per company, see JobMatrix/company_stats.py; off unless a
+# shared CACHES alias is given (invalidation must reach every worker)
+COMPANY_STATS_CACHE_TIMEOUT = config("COMPANY_STATS_CACHE_TIMEOUT", default=300, cast=int)  # seconds
+COMPANY_STATS_CACHE_ALIAS = config("COMPANY_STATS_CACHE_ALIAS", default=None)
+
+# In-process background worker, see JobMatrix/background.py (False runs tasks inline)
+BACKGROUND_TASKS_ASYNC = config("BACKGROUND_TASKS_ASYNC", default=True, cast=bool)
+
+# Per-request query/S3/latency instrumentation, see JobMatrix/perf.py
+PERF_INSTRUMENTATION = config("PERF_INSTRUMENTATION", default=True, cast=bool)
+PERF_SERVER_TIMING = config("PERF_SERVER_TIMING", default=DEBUG, cast=bool)  # Server-Timing response header, exposes timings to clients
+
+# Applicant home feeds, see JobMatrix/feed.py
+FEED_SIZE = config("FEED_SIZE", default=200, cast=int)  # jobs kept per applicant
+FEED_MIN_SCORE = config("FEED_MIN_SCORE", default=3, cast=int)
+FEED_BACKFILL_JOBS = config("FEED_BACKFILL_JOBS", default=1000, cast=int)  # recent jobs considered on a feed rebuild
+
+# Bulk job import (CSV / NDJSON uploads), see JobMatrix/job_import.py
+JOB_IMPORT_CHUNK_SIZE = config("JOB_IMPORT_CHUNK_SIZE", default=1000, cast=int)  # rows per INSERT and transaction
+JOB_IMPORT_MAX_ROWS = config("JOB_IMPORT_MAX_ROWS", default=50000, cast=int)
+JOB_IMPORT_MAX_ERRORS = config("JOB_IMPORT_MAX_ERRORS", default=1000, cast=int)  # row errors listed in the response
+
+# In-memory skill index behind jobs/recommended/, see JobMatrix/recommendations.py
+RECOMMENDATION_INDEX_TTL = config("RECOMMENDATION_INDEX_TTL", default=600, cast=int)  # seconds between full rebuilds
+
 AUTH_USER_MODEL = "JobMatrix.User"
 
 MIGRATION_MODULES = {
@@ -193,34 +228,27 @@ AWS_ACCESS_KEY_ID = config('AWS_ACCESS_KEY_ID', default=None)
 AWS_SECRET_ACCESS_KEY = config('AWS_SECRET_ACCESS_KEY', default=None)
 AWS_STORAGE_BUCKET_NAME = config('AWS_STORAGE_BUCKET_NAME', default=None)
 AWS_S3_REGION_NAME = config('AWS_S3_REGION_NAME', default=None)
-
-# Verify if S3 credentials are valid
-USE_S3_STORAGE = False
+AWS_S3_ENDPOINT_URL = config('AWS_S3_ENDPOINT_URL', default=None)  # e.g. a local MinIO/moto server
+
+# Shared S3 client and object existence cache, see JobMatrix/storage_backends.py
+S3_MAX_POOL_CONNECTIONS = config('S3_MAX_POOL_CONNECTIONS', default=50, cast=int)
+S3_EXISTS_CACHE_TTL = config('S3_EXISTS_CACHE_TTL', default=300, cast=int)  # seconds
+S3_EXISTS_NEGATIVE_TTL = config('S3_EXISTS_NEGATIVE_TTL', default=60, cast=int)  # seconds, for missing objects
+
+# Use S3 whenever credentials are configured. Bucket access is verified by a
+# background probe after startup (JobMatrix.storage_backends.probe_bucket), not
+# here: a network call at import time slowed every worker boot and every
+# manage.py command, and took the app down whenever S3 was slow or unreachable.
+# A bucket that S3 rejects (credentials, missing bucket) shows up in the log and
+# in bucket_status(), and uploads then fail with that reason. S3_STARTUP_CHECK
+# makes the probe synchronous and refuses to start on a rejected bucket; an S3
+# that does not answer then delays the boot by up to twice S3_PROBE_TIMEOUT.
+# Set USE_S3_STORAGE=False to keep media on the filesystem.
 S3_CREDENTIALS_PRESENT = all([AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_STORAGE_BUCKET_NAME])
-
-if S3_CREDENTIALS_PRESENT:
-    try:
-        import boto3
-        from botocore.exceptions import ClientError, NoCredentialsError
-
-        try:
-            s3 = boto3.client(
-                's3',
-                aws_access_key_id=AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-                region_name=AWS_S3_REGION_NAME
-            )
-
-            s3.list_buckets()
-
-            USE_S3_STORAGE = True
-            
-        except (ClientError, NoCredentialsError):
-            pass
-    except ImportError:
-        pass
-else:
-    USE_S3_STORAGE = False
+USE_S3_STORAGE = S3_CREDENTIALS_PRESENT and config('USE_S3_STORAGE', default=True, cast=bool)
+S3_STARTUP_PROBE = config('S3_STARTUP_PROBE', default=True, cast=bool)
+S3_STARTUP_CHECK = config('S3_STARTUP_CHECK', default=False, cast=bool)
+S3_PROBE_TIMEOUT = config('S3_PROBE_TIMEOUT', default=2, cast=int)  # seconds, per connect and per read
 
 if USE_S3_STORAGE:
     AWS_S3_OBJECT_PARAMETERS = {
@@ -0,0 +1,62 @@
+"""
+Settings for local checks that must run without MySQL, S3 or SendGrid:
+
+    python manage.py check_query_budgets --settings=config.test_settings
+
+SQLite instead of MySQL, media on the local filesystem instead of S3 (media
+URLs are still built, just never signed or probed), background tasks inline
+and emails kept in memory. Real environment variables still win for anything
+not forced below.
+"""
+import os
+import tempfile
+
+# Required by config/settings.py, which has no defaults for them
+for name, value in {
+    "DB_NAME": "jobmatrix",
+    "DB_USER": "jobmatrix",
+    "DB_PASSWORD": "jobmatrix",
+    "DB_HOST": "localhost",
+    "JWT_SECRET": "jobmatrix-test-secret",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_EXPIRATION_DAYS": "1",
+    "SENDGRID_API_KEY": "unused",
+    "ADMIN_SECRET_KEY": "jobmatrix-test-admin",
+}.items():
+    os.environ.setdefault(name, value)
+
+# Read by config/settings.py at import time, so they are forced before it runs
+os.environ["USE_S3_STORAGE"] = "False"
+os.environ["S3_STARTUP_PROBE"] = "False"
+os.environ["S3_STARTUP_CHECK"] = "False"
+os.environ["BACKGROUND_TASKS_ASYNC"] = "False"
+
+from config.settings import *  # noqa: E402,F401,F403
+
+DEBUG = False
+SECRET_KEY = "jobmatrix-test-secret-key"
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(tempfile.gettempdir(), "jobmatrix-test.sqlite3"),
+    }
+}
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+MEDIA_ROOT = os.path.join(tempfile.gettempdir(), "jobmatrix-test-media")
+
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+# No collected static files here
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if not middleware.startswith("whitenoise.")]
+
+# Keep request logging (4xx warnings, view info lines) out of the check output; errors still show
+LOGGING["loggers"]["django"]["level"] = "ERROR"
+LOGGING["root"]["level"] = "WARNING"
+
+# Hashing cost is not what these checks measure
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]